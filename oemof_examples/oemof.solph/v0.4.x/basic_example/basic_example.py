@@ -65,6 +65,8 @@ import os
 import pandas as pd
 import pprint as pp
 
+from solver_monitor import SolverMonitor
+
 try:
     import matplotlib.pyplot as plt
 except ImportError:
@@ -75,6 +77,7 @@ solver = "cbc"  # 'glpk', 'gurobi',....
 debug = False  # Set number_of_timesteps to 3 to get a readable lp-file.
 number_of_time_steps = 24 * 7 * 8
 solver_verbose = False  # show/hide solver output
+solver_log = None  # path of a JSON lines log of the solver progress
 
 # initiate the logger (see the API docs for more information)
 logger.define_logging(
@@ -180,7 +183,8 @@ energysystem.add(storage)
 logging.info("Optimise the energy system")
 
 # initialise the operational model
-model = solph.Model(energysystem)
+monitor = SolverMonitor(log=solver_log, run="basic_example")
+model = monitor.build(energysystem)
 
 # This is for debugging only. It is not(!) necessary to solve the problem and
 # should be set to False to save time and disc space in normal use. For
@@ -193,9 +197,10 @@ if debug:
     logging.info("Store lp-file in {0}.".format(filename))
     model.write(filename, io_options={"symbolic_solver_labels": True})
 
-# if tee_switch is true solver messages will be displayed
+# if tee_switch is true solver messages will be displayed, the progress of
+# the solver is collected as events (see solver_monitor.py)
 logging.info("Solve the optimization problem")
-model.solve(solver=solver, solve_kwargs={"tee": solver_verbose})
+monitor.solve(model, solver=solver, echo=solver_verbose)
 
 logging.info("Store the energy system with the results.")
 
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Structured progress events of the model build, the LP file and the solver.
+
+`solph.Model.solve(solve_kwargs={"tee": True})` only prints the raw solver
+log. A `SolverMonitor` reads this log while the solver runs and turns it into
+events (dictionaries) that are passed to registered callbacks and optionally
+appended to a JSON lines file:
+
+* `build`: time to build the model, number of variables and constraints
+* `timing`: pyomo timings, e.g. to write the LP file or read the solution
+* `presolve`: rows, columns and elements after the presolve and the removed
+  ones
+* `lp`: LP iterations with the objective value
+* `incumbent`: new integer solutions with their objective value
+* `mip`: branch and bound progress with nodes, incumbent, bound and gap
+* `result`: final status, objective, bound, gap and iteration counts of the
+  solver and the wall time of the solve
+
+Every event has the keys `run` (name of the run, to tell apart several runs
+in one log), `event` and `time` (seconds since the monitor was created).
+The log of cbc and glpk is parsed; for other solvers only the `build`,
+`timing` and `result` events are created. Further patterns can be added to
+`PATTERNS`.
+
+    monitor = SolverMonitor(log="solver_log.jsonl", run="basic_example")
+    monitor.add_callback(lambda event: print(event))
+    model = monitor.build(energysystem)
+    monitor.solve(model, solver="cbc")
+
+Installation requirements
+-------------------------
+This example requires the version v0.4.x of oemof. Install by:
+
+    pip install 'oemof.solph>=0.4,<0.5'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import contextlib
+import json
+import math
+import re
+import sys
+import time
+
+from oemof import solph
+
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+
+# (regular expression, event) per solver, the named groups become the values
+PATTERNS = {
+    "all": [
+        (
+            r"^\s*(?P<seconds>{0}) seconds required (?:to|for) "
+            r"(?P<stage>.+?)\s*$".format(_NUMBER),
+            "timing",
+        ),
+    ],
+    "cbc": [
+        (
+            r"Presolve (?P<rows>\d+) \((?P<removed_rows>-?\d+)\) rows, "
+            r"(?P<columns>\d+) \((?P<removed_columns>-?\d+)\) columns and "
+            r"(?P<elements>\d+) \((?P<removed_elements>-?\d+)\) elements",
+            "presolve",
+        ),
+        (
+            r"Clp\d+I\s+(?P<iterations>\d+)\s+Obj\s+(?P<objective>{0})".format(
+                _NUMBER
+            ),
+            "lp",
+        ),
+        (
+            r"Optimal objective\s+(?P<objective>{0}) - (?P<iterations>\d+) "
+            r"iterations".format(_NUMBER),
+            "lp",
+        ),
+        (
+            r"Integer solution of (?P<incumbent>{0}) found".format(_NUMBER),
+            "incumbent",
+        ),
+        (
+            r"After (?P<nodes>\d+) nodes, (?P<open_nodes>\d+) on tree, "
+            r"(?P<incumbent>{0}) best solution, best possible "
+            r"(?P<bound>{0})".format(_NUMBER),
+            "mip",
+        ),
+        (r"^Objective value:\s+(?P<objective>{0})".format(_NUMBER), "result"),
+        (r"^Lower bound:\s+(?P<bound>{0})".format(_NUMBER), "result"),
+        (r"^Enumerated nodes:\s+(?P<nodes>\d+)", "result"),
+        (r"^Total iterations:\s+(?P<iterations>\d+)", "result"),
+    ],
+    "glpk": [
+        (
+            r"^[*\s]\s*(?P<iterations>\d+): obj =\s+(?P<objective>{0})".format(
+                _NUMBER
+            ),
+            "lp",
+        ),
+        (
+            r"^[+*]\s*(?P<iterations>\d+): mip =\s+(?P<incumbent>{0}|not "
+            r"found yet) [<>]=\s+(?P<bound>{0}|-?inf)".format(_NUMBER),
+            "mip",
+        ),
+    ],
+}
+
+
+def _value(text):
+    """Converts numbers in the log, other text is kept."""
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _gap(incumbent, bound):
+    """Relative gap, None if one of the values is missing or infinite."""
+    try:
+        gap = abs(incumbent - bound) / max(abs(incumbent), 1e-10)
+    except TypeError:
+        return None
+    return gap if math.isfinite(gap) else None
+
+
+class _LogStream(object):
+    """File-like object that passes complete lines to the monitor."""
+
+    def __init__(self, monitor, patterns, echo):
+        self.monitor = monitor
+        self.patterns = patterns
+        self.echo = echo
+        self.buffer = ""
+
+    def write(self, text):
+        if self.echo is not None:
+            self.echo.write(text)
+        self.buffer += text
+        while "\n" in self.buffer:
+            line, self.buffer = self.buffer.split("\n", 1)
+            self.monitor._parse(line, self.patterns)
+        return len(text)
+
+    def flush(self):
+        if self.echo is not None:
+            self.echo.flush()
+
+
+class SolverMonitor(object):
+    """Creates structured events of model builds and solver runs.
+
+    Parameters
+    ----------
+    log : str, optional
+        Path of a JSON lines file the events are appended to.
+    run : str
+        Name of the run, added to every event. Default: 'run'.
+    callbacks : iterable of callables
+        Called with every event (a dict).
+
+    Attributes
+    ----------
+    events : list of dict
+        All events of this monitor.
+    """
+
+    def __init__(self, log=None, run="run", callbacks=()):
+        self.log = log
+        self.run = run
+        self.callbacks = list(callbacks)
+        self.events = []
+        self.start = time.time()
+        self._result = {}
+        # stdout outside of the redirection of the solver log
+        self._stdout = None
+
+    def add_callback(self, callback):
+        """Registers a callable that is called with every event."""
+        self.callbacks.append(callback)
+
+    def emit(self, event, **values):
+        """Creates an event, passes it to the callbacks and the log."""
+        record = {
+            "run": self.run,
+            "event": event,
+            "time": round(time.time() - self.start, 6),
+        }
+        record.update(values)
+        self.events.append(record)
+        # callbacks must not write into the parsed solver log
+        with contextlib.redirect_stdout(self._stdout or sys.stdout):
+            for callback in self.callbacks:
+                callback(record)
+        if self.log is not None:
+            with open(self.log, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+        return record
+
+    def _parse(self, line, patterns):
+        for pattern, event in patterns:
+            match = pattern.search(line)
+            if match is None:
+                continue
+            values = {
+                key: _value(text) for key, text in match.groupdict().items()
+            }
+            if event == "result":
+                # the summary of cbc is spread over several lines
+                self._result.update(values)
+            else:
+                if event == "mip":
+                    values["gap"] = _gap(values["incumbent"], values["bound"])
+                self.emit(event, **values)
+            return
+
+    def build(self, energysystem, **kwargs):
+        """Builds a `solph.Model` and emits a `build` event.
+
+        Keyword arguments are passed to `solph.Model`.
+        """
+        start = time.time()
+        model = solph.Model(energysystem, **kwargs)
+        self.emit(
+            "build",
+            seconds=time.time() - start,
+            variables=model.nvariables(),
+            constraints=model.nconstraints(),
+        )
+        return model
+
+    def solve(
+        self,
+        model,
+        solver="cbc",
+        solve_kwargs=None,
+        cmdline_options=None,
+        echo=False,
+    ):
+        """Solves a model and emits the events of the solver log.
+
+        Parameters
+        ----------
+        model : solph.Model
+        solver : str
+        solve_kwargs, cmdline_options : dict, optional
+            Passed to `Model.solve()`. `tee` and `report_timing` are set.
+        echo : bool
+            Print the raw solver log as well. Default: False.
+
+        Returns
+        -------
+        Solver results (see `Model.solve()`).
+        """
+        solve_kwargs = dict(solve_kwargs or {})
+        solve_kwargs.update(tee=True, report_timing=True)
+        patterns = [
+            (re.compile(pattern), event)
+            for pattern, event in PATTERNS["all"] + PATTERNS.get(solver, [])
+        ]
+        self._stdout = sys.stdout
+        stream = _LogStream(self, patterns, self._stdout if echo else None)
+
+        self._result = {}
+        start = time.time()
+        try:
+            with contextlib.redirect_stdout(stream):
+                results = model.solve(
+                    solver=solver,
+                    solve_kwargs=solve_kwargs,
+                    cmdline_options=cmdline_options or {},
+                )
+        finally:
+            self._stdout = None
+        if stream.buffer:
+            self._parse(stream.buffer, patterns)
+
+        solver_info = results["Solver"][0]
+        values = {
+            "solver": solver,
+            "status": str(solver_info["Status"]),
+            "termination": str(solver_info["Termination condition"]),
+            "seconds": time.time() - start,
+        }
+        values.update(self._result)
+        if "objective" in values and "bound" in values:
+            values["gap"] = _gap(values["objective"], values["bound"])
+        self.emit("result", **values)
+        return results
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Compares the pyomo based `solph.Model` with the matrix based `CompactModel`
+(see compact_model.py) on a scaled up version of the basic example.
+
+The energy system of the basic example is copied `regions` times (every copy
+with its own buses, scaled input data and labels with the region number) and
+the time series of the basic example are repeated to the given number of
+time steps. For both models the build time and the peak memory of the build
+(traced by tracemalloc) are measured. The problem size of the compact model
+is reported with and without the presolve that eliminates the fixed flows.
+With `--solve` both models are solved as well and the objective values are
+compared.
+
+Usage:
+
+    python benchmark_compact_model.py --regions 1 10 50 --steps 8760
+    python benchmark_compact_model.py --regions 10 --steps 168 --solve
+
+Data
+----
+basic_example.csv of the basic example
+
+
+Installation requirements
+-------------------------
+This example requires the version v0.4.x of oemof and scipy >= 1.6. Install
+by:
+
+    pip install 'oemof.solph>=0.4,<0.5' 'scipy>=1.6'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+
+from compact_model import CompactModel
+
+
+def scaled_basic_example(regions, number_of_time_steps):
+    """Creates `regions` copies of the basic example energy system."""
+    filename = os.path.join(
+        os.path.dirname(__file__), "..", "basic_example", "basic_example.csv"
+    )
+    data = pd.read_csv(filename)
+    repeats = -(-number_of_time_steps // len(data))
+    data = pd.concat([data] * repeats, ignore_index=True)[
+        :number_of_time_steps
+    ]
+
+    date_time_index = pd.date_range(
+        "1/1/2012", periods=number_of_time_steps, freq="H"
+    )
+    energysystem = solph.EnergySystem(timeindex=date_time_index)
+    rng = np.random.RandomState(0)
+
+    for r in range(regions):
+        scale = rng.uniform(0.8, 1.2)
+
+        bgas = solph.Bus(label="natural_gas_{0}".format(r))
+        bel = solph.Bus(label="electricity_{0}".format(r))
+        energysystem.add(bgas, bel)
+
+        energysystem.add(
+            solph.Sink(
+                label="excess_bel_{0}".format(r), inputs={bel: solph.Flow()}
+            ),
+            solph.Source(
+                label="rgas_{0}".format(r),
+                outputs={
+                    bgas: solph.Flow(
+                        nominal_value=29825293
+                        * scale
+                        * number_of_time_steps
+                        / 1344,
+                        summed_max=1,
+                    )
+                },
+            ),
+            solph.Source(
+                label="wind_{0}".format(r),
+                outputs={
+                    bel: solph.Flow(
+                        fix=data["wind"].values, nominal_value=1000000 * scale
+                    )
+                },
+            ),
+            solph.Source(
+                label="pv_{0}".format(r),
+                outputs={
+                    bel: solph.Flow(
+                        fix=data["pv"].values, nominal_value=582000 * scale
+                    )
+                },
+            ),
+            solph.Sink(
+                label="demand_{0}".format(r),
+                inputs={
+                    bel: solph.Flow(
+                        fix=data["demand_el"].values, nominal_value=scale
+                    )
+                },
+            ),
+            solph.Transformer(
+                label="pp_gas_{0}".format(r),
+                inputs={bgas: solph.Flow()},
+                outputs={
+                    bel: solph.Flow(nominal_value=10e10, variable_costs=50)
+                },
+                conversion_factors={bel: 0.58},
+            ),
+            solph.components.GenericStorage(
+                nominal_storage_capacity=10077997 * scale,
+                label="storage_{0}".format(r),
+                inputs={bel: solph.Flow(nominal_value=10077997 * scale / 6)},
+                outputs={
+                    bel: solph.Flow(
+                        nominal_value=10077997 * scale / 6,
+                        variable_costs=0.001,
+                    )
+                },
+                loss_rate=0.00,
+                initial_storage_level=None,
+                inflow_conversion_factor=1,
+                outflow_conversion_factor=0.8,
+            ),
+        )
+    return energysystem
+
+
+def measure(build):
+    """Returns the result, the duration and the peak memory of `build()`."""
+    tracemalloc.start()
+    start = time.time()
+    result = build()
+    duration = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, duration, peak
+
+
+def compare(regions, number_of_time_steps, solve=False, solver="cbc"):
+    """Builds (and solves) both models for one size of the energy system."""
+    es = scaled_basic_example(regions, number_of_time_steps)
+
+    om, pyomo_time, pyomo_memory = measure(lambda: solph.Model(es))
+    cm, compact_time, compact_memory = measure(lambda: CompactModel(es))
+    full = CompactModel(es, presolve=False).meta_results()["problem"]
+    presolved = cm.meta_results()["problem"]
+
+    row = {
+        "regions": regions,
+        "time steps": number_of_time_steps,
+        "variables": full["Number of variables"],
+        "presolved variables": presolved["Number of variables"],
+        "nonzeros": full["Number of nonzeros"],
+        "presolved nonzeros": presolved["Number of nonzeros"],
+        "pyomo build [s]": pyomo_time,
+        "compact build [s]": compact_time,
+        "pyomo memory [MB]": pyomo_memory / 1e6,
+        "compact memory [MB]": compact_memory / 1e6,
+    }
+
+    if solve:
+        start = time.time()
+        om.solve(solver=solver)
+        row["pyomo solve [s]"] = time.time() - start
+        cm.solve()
+        row["compact solve [s]"] = cm.solve_time
+        pyomo_objective = solph.processing.meta_results(om)["objective"]
+        row["objective deviation"] = abs(cm.objective - pyomo_objective) / abs(
+            pyomo_objective
+        )
+
+        # the results have the same structure as the results of solph
+        compact_flows = solph.views.node(cm.results(), "electricity_0")
+        pyomo_flows = solph.views.node(
+            solph.processing.results(om), "electricity_0"
+        )
+        assert sorted(compact_flows["sequences"].columns) == sorted(
+            pyomo_flows["sequences"].columns
+        )
+
+    return row
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--regions", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--steps", type=int, default=24 * 7 * 8)
+    parser.add_argument("--solve", action="store_true")
+    parser.add_argument("--solver", default="cbc")
+    args = parser.parse_args()
+
+    table = pd.DataFrame(
+        [
+            compare(regions, args.steps, args.solve, args.solver)
+            for regions in args.regions
+        ]
+    ).set_index("regions")
+    pd.set_option("display.width", 200)
+    print(table)
@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+A matrix based model of the core components of oemof.solph.
+
+`solph.Model` creates one pyomo object per flow variable and time step and
+one per constraint row. For large energy systems building these objects
+takes longer than solving the problem. The `CompactModel` assembles the same
+linear problem directly as sparse matrices: every flow, storage and bus is
+processed once with vectorized parameter data (one numpy array per sequence)
+and the coefficients are collected in COO format. The problem is solved with
+the HiGHS solver of scipy and the results are returned in the structure of
+`solph.processing.results()`, so `solph.views` can be used as usual.
+
+The following equations of solph v0.4.x are covered:
+
+* Flow: bounds (`nominal_value`, `min`, `max`, `fix`), `summed_max`,
+  `summed_min` and `variable_costs`
+* Bus: balance (only balanced buses)
+* Transformer: relation of every input to every output
+* Source, Sink: no equations besides their flows
+* GenericStorage: storage balance with losses, conversion factors, storage
+  level bounds, initial storage level and balanced storages
+
+Investment, NonConvex, integer, bidirectional flows, gradients and all other
+components are not supported and raise a ValueError.
+
+Presolve: flows with `fix` and `nominal_value` (e.g. demands and fixed
+renewable feed-in) are fully determined before the optimisation. With
+`presolve=True` (default) they do not become variables: their values are
+moved to the right hand side of the bus balances, transformer relations and
+storage balances and their costs to a constant objective offset. Rows
+without any variable left are dropped. The eliminated flows are still
+reported in the results.
+
+Installation requirements
+-------------------------
+This example requires the version v0.4.x of oemof and scipy >= 1.6 (HiGHS).
+Install by:
+
+    pip install 'oemof.solph>=0.4,<0.5' 'scipy>=1.6'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+from oemof.solph.plumbing import _Sequence
+from scipy import optimize
+from scipy import sparse
+
+SUPPORTED_NODES = (
+    solph.Bus,
+    solph.Source,
+    solph.Sink,
+    solph.Transformer,
+    solph.components.GenericStorage,
+)
+
+
+def _values(sequence, length):
+    """Returns the first `length` values of a solph sequence as an array."""
+    if isinstance(sequence, _Sequence):
+        return np.full(length, sequence.default, dtype=float)
+    if isinstance(sequence, pd.Series):
+        sequence = sequence.values
+    values = np.asarray(sequence, dtype=float)
+    if values.ndim == 0:
+        return np.full(length, float(values))
+    if len(values) < length:
+        raise ValueError(
+            "Sequence of length {0} is shorter than the {1} time steps of "
+            "the model.".format(len(values), length)
+        )
+    return values[:length]
+
+
+class _Rows(object):
+    """Collects the coefficients of a set of constraint rows in COO format."""
+
+    def __init__(self):
+        self.rows, self.cols, self.data, self.rhs = [], [], [], []
+        self.shift_rows, self.shift_values = [], []
+        self.size = 0
+
+    def new(self, rhs):
+        rhs = np.atleast_1d(np.asarray(rhs, dtype=float))
+        rows = np.arange(self.size, self.size + len(rhs))
+        self.rhs.append(rhs)
+        self.size += len(rhs)
+        return rows
+
+    def add(self, rows, cols, data):
+        rows, cols, data = np.broadcast_arrays(rows, cols, data)
+        self.rows.append(rows.ravel())
+        self.cols.append(cols.ravel())
+        self.data.append(data.ravel().astype(float))
+
+    def shift(self, rows, values):
+        """Moves constant terms of the left hand side to the right."""
+        rows, values = np.broadcast_arrays(rows, values)
+        self.shift_rows.append(rows.ravel())
+        self.shift_values.append(values.ravel().astype(float))
+
+    def matrix(self, columns, equality):
+        """Returns the matrix, the right hand side and the new row numbers.
+
+        Rows without coefficients are dropped (new row number -1). A
+        ValueError is raised if such a row is violated by its constants.
+        """
+        if self.size == 0:
+            return None, np.zeros(0), np.zeros(0, dtype=int)
+        empty = [np.zeros(0, dtype=int)]
+        rows = np.concatenate(self.rows + empty)
+        cols = np.concatenate(self.cols + empty)
+        data = np.concatenate(self.data + empty).astype(float)
+        rhs = np.concatenate(self.rhs)
+        if self.shift_rows:
+            np.subtract.at(
+                rhs,
+                np.concatenate(self.shift_rows),
+                np.concatenate(self.shift_values),
+            )
+
+        used = np.zeros(self.size, dtype=bool)
+        used[rows] = True
+        tolerance = 1e-9 * max(1, np.abs(rhs).max())
+        violated = np.abs(rhs) > tolerance if equality else rhs < -tolerance
+        if (violated & ~used).any():
+            raise ValueError(
+                "The fixed flows violate {0} constraint(s), the problem is "
+                "infeasible.".format((violated & ~used).sum())
+            )
+        index = np.full(self.size, -1)
+        index[used] = np.arange(used.sum())
+
+        coo = sparse.coo_matrix(
+            (data, (index[rows], cols)), shape=(used.sum(), columns)
+        )
+        return coo.tocsr(), rhs[used], index
+
+
+class CompactModel(object):
+    """Linear problem of an energy system assembled as sparse matrices.
+
+    Parameters
+    ----------
+    energysystem : solph.EnergySystem
+    timeincrement : sequence, optional
+        Length of the time steps in hours. Default: the `timeincrement` of
+        the energy system or the frequency of its time index.
+    objective_weighting : sequence, optional
+        Weighting of the variable costs. Default: `timeincrement`.
+    presolve : bool
+        Eliminate fixed flows before the matrices are built. Default: True.
+
+    Attributes
+    ----------
+    A_eq, b_eq, A_ub, b_ub : scipy.sparse.csr_matrix, numpy.ndarray
+        Equality and inequality constraints.
+    c : numpy.ndarray
+        Objective coefficients.
+    objective_offset : float
+        Costs of the eliminated flows.
+    fixed_flows : dict
+        Values of the eliminated flows keyed by (input, output).
+    bounds : numpy.ndarray
+        Lower and upper bound of every variable, shape (variables, 2).
+    """
+
+    def __init__(self, energysystem, **kwargs):
+        self.es = energysystem
+        self.timeindex = energysystem.timeindex
+        self.T = len(self.timeindex)
+
+        timeincrement = kwargs.get(
+            "timeincrement", getattr(energysystem, "timeincrement", None)
+        )
+        if timeincrement is None:
+            timeincrement = self.timeindex.freq.nanos / 3.6e12
+        self.timeincrement = _values(timeincrement, self.T)
+        self.objective_weighting = _values(
+            kwargs.get("objective_weighting", self.timeincrement), self.T
+        )
+        self.presolve = kwargs.get("presolve", True)
+
+        start = time.time()
+        self._check()
+        self._build()
+        self.build_time = time.time() - start
+        self.solver_results = None
+        self.x = None
+        logging.info(
+            "Compact model with {0} variables and {1} constraints built in "
+            "{2:.2f} s.".format(
+                len(self.c), len(self.b_eq) + len(self.b_ub), self.build_time
+            )
+        )
+
+    def _check(self):
+        for node in self.es.nodes:
+            if type(node) not in SUPPORTED_NODES:
+                raise ValueError(
+                    "Node {0} of type {1} is not supported by the compact "
+                    "model.".format(node.label, type(node).__name__)
+                )
+            if getattr(node, "investment", None):
+                raise ValueError(
+                    "Investment of {0} is not supported by the compact "
+                    "model.".format(node.label)
+                )
+        for (i, o), flow in self.es.flows().items():
+            for attribute in ("investment", "nonconvex", "integer"):
+                if getattr(flow, attribute, None):
+                    raise ValueError(
+                        "Flow {0}-{1}: {2} is not supported by the compact "
+                        "model.".format(i.label, o.label, attribute)
+                    )
+            if getattr(flow, "bidirectional", None):
+                raise ValueError(
+                    "Flow {0}-{1}: bidirectional flows are not supported by "
+                    "the compact model.".format(i.label, o.label)
+                )
+            for gradient in ("positive_gradient", "negative_gradient"):
+                if getattr(flow, gradient)["ub"][0] is not None:
+                    raise ValueError(
+                        "Flow {0}-{1}: gradients are not supported by the "
+                        "compact model.".format(i.label, o.label)
+                    )
+
+    def _flow_columns(self, i, o):
+        start = self.flow_index[i, o] * self.T
+        return np.arange(start, start + self.T)
+
+    def _add_flow(self, block, rows, key, coefficient):
+        """Adds a flow to constraint rows, as constant if it is fixed."""
+        if key in self.fixed_flows:
+            block.shift(rows, coefficient * self.fixed_flows[key])
+        else:
+            block.add(rows, self._flow_columns(*key), coefficient)
+
+    def _build(self):
+        T = self.T
+        tau = self.timeincrement
+        flows = self.es.flows()
+        self.fixed_flows = {}
+        if self.presolve:
+            for key, flow in flows.items():
+                if flow.nominal_value is not None and flow.fix[0] is not None:
+                    self.fixed_flows[key] = (
+                        _values(flow.fix, T) * flow.nominal_value
+                    )
+        self.flow_keys = [key for key in flows if key not in self.fixed_flows]
+        self.flow_index = {key: n for n, key in enumerate(self.flow_keys)}
+        self.objective_offset = 0
+        self.storages = [
+            n
+            for n in self.es.nodes
+            if isinstance(n, solph.components.GenericStorage)
+        ]
+
+        # variables: flows, storage content, initial storage content
+        n_flows = len(self.flow_keys)
+        self._content_start = n_flows * T
+        self._init_start = self._content_start + len(self.storages) * T
+        n_vars = self._init_start + len(self.storages)
+
+        lb = np.zeros(n_vars)
+        ub = np.full(n_vars, np.inf)
+        c = np.zeros(n_vars)
+        eq, ineq = _Rows(), _Rows()
+
+        # flows
+        for key, flow in flows.items():
+            nominal_value = flow.nominal_value
+            costs = None
+            if flow.variable_costs[0] is not None:
+                costs = (
+                    _values(flow.variable_costs, T) * self.objective_weighting
+                )
+            if key in self.fixed_flows:
+                if costs is not None:
+                    self.objective_offset += costs @ self.fixed_flows[key]
+            else:
+                cols = self._flow_columns(*key)
+                if nominal_value is not None:
+                    if flow.fix[0] is not None:
+                        lb[cols] = ub[cols] = (
+                            _values(flow.fix, T) * nominal_value
+                        )
+                    else:
+                        lb[cols] = _values(flow.min, T) * nominal_value
+                        ub[cols] = _values(flow.max, T) * nominal_value
+                if costs is not None:
+                    c[cols] = costs
+            if nominal_value is not None:
+                if flow.summed_max is not None:
+                    rows = ineq.new(flow.summed_max * nominal_value)
+                    self._add_flow(ineq, rows, key, tau)
+                if flow.summed_min is not None:
+                    rows = ineq.new(-flow.summed_min * nominal_value)
+                    self._add_flow(ineq, rows, key, -tau)
+
+        # buses
+        self._bus_rows = {}
+        for node in self.es.nodes:
+            if isinstance(node, solph.Bus) and node.balanced:
+                if not node.inputs and not node.outputs:
+                    continue
+                rows = eq.new(np.zeros(T))
+                for i in node.inputs:
+                    self._add_flow(eq, rows, (i, node), 1)
+                for o in node.outputs:
+                    self._add_flow(eq, rows, (node, o), -1)
+                self._bus_rows[node] = rows
+
+        # transformers
+        for node in self.es.nodes:
+            if type(node) is solph.Transformer:
+                factors = {
+                    n: _values(node.conversion_factors[n], T)
+                    for n in list(node.inputs) + list(node.outputs)
+                }
+                for o in node.outputs:
+                    for i in node.inputs:
+                        rows = eq.new(np.zeros(T))
+                        self._add_flow(eq, rows, (i, node), factors[o])
+                        self._add_flow(eq, rows, (node, o), -factors[i])
+
+        # storages
+        for s, n in enumerate(self.storages):
+            capacity = n.nominal_storage_capacity
+            if capacity is None:
+                raise ValueError(
+                    "Storage {0} needs a nominal_storage_capacity.".format(
+                        n.label
+                    )
+                )
+            content = np.arange(
+                self._content_start + s * T, self._content_start + (s + 1) * T
+            )
+            init = self._init_start + s
+            lb[content] = capacity * _values(n.min_storage_level, T)
+            ub[content] = capacity * _values(n.max_storage_level, T)
+            lb[init], ub[init] = 0, capacity
+            if n.initial_storage_level is not None:
+                lb[init] = ub[init] = n.initial_storage_level * capacity
+
+            rhs = (
+                -(
+                    _values(n.fixed_losses_relative, T) * capacity
+                    + _values(n.fixed_losses_absolute, T)
+                )
+                * tau
+            )
+            rows = eq.new(rhs)
+            eq.add(rows, content, 1)
+            retention = -((1 - _values(n.loss_rate, T)) ** tau)
+            eq.add(rows[1:], content[:-1], retention[1:])
+            eq.add(rows[:1], init, retention[:1])
+            (i,) = n.inputs
+            (o,) = n.outputs
+            self._add_flow(
+                eq,
+                rows,
+                (i, n),
+                -_values(n.inflow_conversion_factor, T) * tau,
+            )
+            self._add_flow(
+                eq,
+                rows,
+                (n, o),
+                tau / _values(n.outflow_conversion_factor, T),
+            )
+            if n.balanced:
+                rows = eq.new(0)
+                eq.add(rows, [content[-1], init], [1, -1])
+
+        self.c = c
+        self.bounds = np.column_stack([lb, ub])
+        self.A_eq, self.b_eq, self._eq_index = eq.matrix(n_vars, True)
+        self.A_ub, self.b_ub, _ = ineq.matrix(n_vars, False)
+        logging.info(
+            "Presolve eliminated {0} fixed flows and {1} rows.".format(
+                len(self.fixed_flows), eq.size - len(self.b_eq)
+            )
+        )
+
+    def solve(self, **options):
+        """Solves the problem with the HiGHS solver of scipy.
+
+        Keyword arguments are passed as `options` to
+        `scipy.optimize.linprog`, e.g. `time_limit` or `disp`.
+
+        Returns
+        -------
+        scipy.optimize.OptimizeResult
+        """
+        start = time.time()
+        res = optimize.linprog(
+            self.c,
+            A_ub=self.A_ub if len(self.b_ub) else None,
+            b_ub=self.b_ub if len(self.b_ub) else None,
+            A_eq=self.A_eq if len(self.b_eq) else None,
+            b_eq=self.b_eq if len(self.b_eq) else None,
+            bounds=self.bounds,
+            method="highs",
+            options=options,
+        )
+        self.solve_time = time.time() - start
+        self.solver_results = res
+        if res.status == 0:
+            self.x = res.x
+            self.objective = res.fun + self.objective_offset
+        else:
+            logging.warning(
+                "Optimization failed with status {0}: {1}".format(
+                    res.status, res.message
+                )
+            )
+        return res
+
+    def results(self, duals=False):
+        """Returns the results in the structure of `processing.results()`.
+
+        Parameters
+        ----------
+        duals : bool
+            If True the dual values of the bus balances are added as column
+            'duals' to the results of the buses. Default: False.
+        """
+        if self.x is None:
+            raise ValueError(
+                "No results available. Did the optimization terminate "
+                "without errors?"
+            )
+        T = self.T
+        result = {}
+        flows = {
+            key: self.x[n * T : (n + 1) * T]
+            for key, n in self.flow_index.items()
+        }
+        flows.update(self.fixed_flows)
+        for key in self.es.flows():
+            result[key] = {
+                "scalars": pd.Series(dtype=float),
+                "sequences": pd.DataFrame(
+                    {"flow": flows[key]}, index=self.timeindex
+                ),
+            }
+        for s, n in enumerate(self.storages):
+            start = self._content_start + s * T
+            result[(n, None)] = {
+                "scalars": pd.Series(
+                    {"init_content": self.x[self._init_start + s]}
+                ),
+                "sequences": pd.DataFrame(
+                    {"storage_content": self.x[start : start + T]},
+                    index=self.timeindex,
+                ),
+            }
+        if duals:
+            marginals = self.solver_results.eqlin.marginals
+            for bus, rows in self._bus_rows.items():
+                # rows dropped by the presolve have no dual value
+                index = self._eq_index[rows]
+                values = np.where(index >= 0, marginals[index], np.nan)
+                result[(bus, None)] = {
+                    "scalars": pd.Series(dtype=float),
+                    "sequences": pd.DataFrame(
+                        {"duals": values}, index=self.timeindex
+                    ),
+                }
+        return result
+
+    def meta_results(self):
+        """Returns problem size, objective and timings."""
+        res = self.solver_results
+        return {
+            "objective": getattr(self, "objective", None),
+            "problem": {
+                "Number of variables": len(self.c),
+                "Number of constraints": len(self.b_eq) + len(self.b_ub),
+                "Number of nonzeros": (
+                    (self.A_eq.nnz if self.A_eq is not None else 0)
+                    + (self.A_ub.nnz if self.A_ub is not None else 0)
+                ),
+                "Number of eliminated flows": len(self.fixed_flows),
+            },
+            "solver": {
+                "Status": None if res is None else res.status,
+                "Message": None if res is None else res.message,
+                "Build time": self.build_time,
+                "Solve time": getattr(self, "solve_time", None),
+            },
+        }
@@ -22,6 +22,9 @@ import pandas as pd
 from oemof import solph
 from oemof.network.network import Node
 
+from compact_sequence import compact
+from compact_sequence import constant
+
 try:
     import matplotlib.pyplot as plt
 except ImportError:
@@ -55,7 +58,9 @@ source_th = solph.Source(
 
 demand_th = solph.Sink(
     label="demand_th",
-    inputs={bth: solph.Flow(fix=data["demand_th"], nominal_value=200)},
+    inputs={
+        bth: solph.Flow(fix=compact(data["demand_th"]), nominal_value=200)
+    },
 )
 
 # power
@@ -63,26 +68,24 @@ bel = solph.Bus(label="bel")
 
 demand_el = solph.Sink(
     label="demand_el",
-    inputs={bel: solph.Flow(variable_costs=data["price_el"])},
+    inputs={bel: solph.Flow(variable_costs=compact(data["price_el"]))},
 )
 
 # back pressure turbine with same parameters as btp
 # (for back pressure characteristics Q_CW_min=0 and back_pressure=True)
 bpt = solph.components.GenericCHP(
     label="back_pressure_turbine",
-    fuel_input={
-        bgas: solph.Flow(H_L_FG_share_max=[0.19 for p in range(0, periods)])
-    },
+    fuel_input={bgas: solph.Flow(H_L_FG_share_max=constant(0.19, periods))},
     electrical_output={
         bel: solph.Flow(
-            P_max_woDH=[200 for p in range(0, periods)],
-            P_min_woDH=[80 for p in range(0, periods)],
-            Eta_el_max_woDH=[0.53 for p in range(0, periods)],
-            Eta_el_min_woDH=[0.43 for p in range(0, periods)],
+            P_max_woDH=constant(200, periods),
+            P_min_woDH=constant(80, periods),
+            Eta_el_max_woDH=constant(0.53, periods),
+            Eta_el_min_woDH=constant(0.43, periods),
         )
     },
-    heat_output={bth: solph.Flow(Q_CW_min=[0 for p in range(0, periods)])},
-    Beta=[0.0 for p in range(0, periods)],
+    heat_output={bth: solph.Flow(Q_CW_min=constant(0, periods))},
+    Beta=constant(0.0, periods),
     back_pressure=True,
 )
 # create an optimization problem and solve it
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Compact sequences for time dependent parameters of flows and components.
+
+Constant parameters are often passed as full lists, e.g.
+`Beta=[0.19 for p in range(0, periods)]`, and time series as pandas Series,
+e.g. `fix=data["demand_th"]`. A `ConstantSequence` stores the value only
+once, but behaves like a list of the given length. Time series are converted
+to a contiguous, read-only numpy array, so indexing them while the model is
+built does not go through the pandas index.
+
+Both can be passed wherever solph expects a sequence (flow parameters like
+`fix` or `variable_costs`, custom flow attributes like `P_max_woDH`, and
+component parameters like `Beta`). Custom constraints can use `is_constant()`
+to write a single coefficient instead of one per time step.
+
+Installation requirements
+-------------------------
+This example requires the version v0.4.x of oemof. Install by:
+
+    pip install 'oemof.solph>=0.4,<0.5'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+from collections import abc
+from itertools import repeat
+
+import numpy as np
+from oemof.solph.plumbing import _Sequence
+
+
+class ConstantSequence(abc.Sequence):
+    """A sequence of a fixed length holding one value.
+
+    Parameters
+    ----------
+    value : numeric
+    length : int
+
+    Examples
+    --------
+    >>> beta = ConstantSequence(0.19, 8760)
+    >>> len(beta), beta[0], beta[8759]
+    (8760, 0.19, 0.19)
+    >>> beta[8760]
+    Traceback (most recent call last):
+     ...
+    IndexError: sequence index out of range
+    """
+
+    __slots__ = ("value", "length")
+
+    def __init__(self, value, length):
+        self.value = value
+        self.length = length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return ConstantSequence(
+                self.value, len(range(*key.indices(self.length)))
+            )
+        if not -self.length <= key < self.length:
+            raise IndexError("sequence index out of range")
+        return self.value
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return repeat(self.value, self.length)
+
+    def __array__(self, dtype=None):
+        return np.full(self.length, self.value, dtype=dtype)
+
+    def __repr__(self):
+        return "ConstantSequence({!r}, {})".format(self.value, self.length)
+
+
+def compact(values):
+    """Returns the most compact sequence for the given values.
+
+    Parameters
+    ----------
+    values : iterable or pandas.Series
+
+    Returns
+    -------
+    ConstantSequence or numpy.ndarray
+        A `ConstantSequence` if all values are equal, otherwise a read-only
+        float array.
+
+    Examples
+    --------
+    >>> compact([200 for p in range(0, 3)])
+    ConstantSequence(200.0, 3)
+    >>> compact([1, 2, 3])
+    array([1., 2., 3.])
+    """
+    if isinstance(values, ConstantSequence):
+        return values
+    array = np.ascontiguousarray(values, dtype=float)
+    if len(array) > 0 and (array == array[0]).all():
+        return ConstantSequence(float(array[0]), len(array))
+    array.setflags(write=False)
+    return array
+
+
+def constant(value, length):
+    """Returns a sequence of `length` times `value`.
+
+    Shortcut for `ConstantSequence(value, length)`.
+    """
+    return ConstantSequence(value, length)
+
+
+def is_constant(sequence):
+    """Tests if a sequence has the same value at every index.
+
+    Besides `ConstantSequence` this is true for the sequences solph creates
+    from scalars.
+    """
+    return isinstance(sequence, (ConstantSequence, _Sequence))
@@ -22,6 +22,9 @@ import pandas as pd
 from oemof import solph
 from oemof.network.network import Node
 
+from compact_sequence import compact
+from compact_sequence import constant
+
 try:
     import matplotlib.pyplot as plt
 except ImportError:
@@ -55,7 +58,9 @@ source_th = solph.Source(
 
 demand_th = solph.Sink(
     label="demand_th",
-    inputs={bth: solph.Flow(fix=data["demand_th"], nominal_value=200)},
+    inputs={
+        bth: solph.Flow(fix=compact(data["demand_th"]), nominal_value=200)
+    },
 )
 
 # power
@@ -63,7 +68,7 @@ bel = solph.Bus(label="bel")
 
 demand_el = solph.Sink(
     label="demand_el",
-    inputs={bel: solph.Flow(variable_costs=data["price_el"])},
+    inputs={bel: solph.Flow(variable_costs=compact(data["price_el"]))},
 )
 
 # motoric chp
@@ -71,20 +76,20 @@ mchp = solph.components.GenericCHP(
     label="motoric_chp",
     fuel_input={
         bgas: solph.Flow(
-            H_L_FG_share_max=[0.18 for p in range(0, periods)],
-            H_L_FG_share_min=[0.41 for p in range(0, periods)],
+            H_L_FG_share_max=constant(0.18, periods),
+            H_L_FG_share_min=constant(0.41, periods),
         )
     },
     electrical_output={
         bel: solph.Flow(
-            P_max_woDH=[200 for p in range(0, periods)],
-            P_min_woDH=[100 for p in range(0, periods)],
-            Eta_el_max_woDH=[0.44 for p in range(0, periods)],
-            Eta_el_min_woDH=[0.40 for p in range(0, periods)],
+            P_max_woDH=constant(200, periods),
+            P_min_woDH=constant(100, periods),
+            Eta_el_max_woDH=constant(0.44, periods),
+            Eta_el_min_woDH=constant(0.40, periods),
         )
     },
-    heat_output={bth: solph.Flow(Q_CW_min=[0 for p in range(0, periods)])},
-    Beta=[0 for p in range(0, periods)],
+    heat_output={bth: solph.Flow(Q_CW_min=constant(0, periods))},
+    Beta=constant(0, periods),
     fixed_costs=0,
     back_pressure=False,
 )
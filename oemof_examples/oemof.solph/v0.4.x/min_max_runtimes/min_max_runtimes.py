@@ -5,6 +5,9 @@ General description
 -------------------
 Example that illustrates how to model min and max runtimes.
 
+Set `mip_start` to True to start the MIP from the rounded LP relaxation (see
+mip_start.py). This pays off for long unit commitment models.
+
 Installation requirements
 -------------------------
 This example requires the version v0.4.x of oemof. Install by:
@@ -21,6 +24,8 @@ import pandas as pd
 from oemof import solph
 from oemof.network.network import Node
 
+from mip_start import solve_with_mip_start
+
 try:
     import matplotlib.pyplot as plt
 except ImportError:
@@ -84,7 +89,11 @@ om = solph.Model(es)
 # om.write('problem.lp', io_options={'symbolic_solver_labels': True})
 
 # solve model
-om.solve(solver="cbc", solve_kwargs={"tee": True})
+mip_start = False
+if mip_start:
+    solve_with_mip_start(om, solver="cbc", solve_kwargs={"tee": True})
+else:
+    om.solve(solver="cbc", solve_kwargs={"tee": True})
 
 # create result object
 results = solph.processing.results(om)
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Starts the MIP of a unit commitment model from a rounded LP relaxation.
+
+Models with `NonConvex` flows have a binary status variable per flow and time
+step. Without a start solution the solver has to find the first feasible
+solution by branching, which takes most of the solution time of long unit
+commitment models. `solve_with_mip_start` therefore
+
+1. solves the LP relaxation of the model (the binaries are relaxed to [0, 1]
+   and restored afterwards),
+2. rounds the relaxed status of every nonconvex flow and repairs it with
+   `repair_status`, so the `minimum_uptime`, `minimum_downtime`,
+   `initial_status`, `maximum_startups` and `maximum_shutdowns` constraints
+   hold,
+3. sets the repaired status, startup and shutdown variables as start values
+   and solves the MIP with the `warmstart` option of pyomo.
+
+The continuous variables are left without a start value, so the solver
+completes the start by fixing the binaries and solving the remaining LP. If
+the start turns out to be infeasible (e.g. because a plant switched on by the
+repair cannot get rid of its minimum load) the solver discards it and
+continues as without a start. Solvers without warm start support (e.g. glpk)
+solve the MIP without a start.
+
+Installation requirements
+-------------------------
+This example requires the version v0.4.x of oemof. Install by:
+
+    pip install 'oemof.solph>=0.4,<0.5'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import logging
+
+import numpy as np
+from pyomo.environ import Reals
+from pyomo.environ import Var
+from pyomo.opt import SolverFactory
+from pyomo.opt import TerminationCondition
+
+
+def _runs(on):
+    """Returns the (start, stop) pairs of the on-periods of a status array."""
+    edges = np.diff(np.concatenate([[0], on.astype(int), [0]]))
+    return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+
+def _switches(on, initial_status):
+    """Returns the number of startups and shutdowns of a status array."""
+    changes = np.diff(np.concatenate([[initial_status], on.astype(int)]))
+    return (changes == 1).sum(), (changes == -1).sum()
+
+
+def repair_status(
+    status,
+    minimum_uptime=None,
+    minimum_downtime=None,
+    initial_status=0,
+    maximum_startups=None,
+    maximum_shutdowns=None,
+    fixed_steps=0,
+):
+    """Rounds a relaxed status sequence to a feasible binary sequence.
+
+    The status is rounded at 0.5. Then, until nothing changes,
+
+    * the first and last `fixed_steps` are set to `initial_status`,
+    * the shortest off-periods between two on-periods are filled while there
+      are more startups or shutdowns than allowed; if there is no such
+      off-period left, the whole sequence is set to `initial_status`,
+    * off-periods shorter than `minimum_downtime` between two on-periods are
+      filled,
+    * on-periods shorter than `minimum_uptime` are extended, or removed if
+      they would reach into the fixed steps at the end.
+
+    Parameters
+    ----------
+    status : array-like
+        Relaxed status (between 0 and 1) of one flow.
+    minimum_uptime, minimum_downtime, initial_status, maximum_startups,
+    maximum_shutdowns
+        Parameters of the `NonConvex` object of the flow.
+    fixed_steps : int
+        Number of time steps at the start and the end that are fixed to the
+        initial status (`NonConvex.max_up_down` if minimum up or down times
+        are given).
+
+    Returns
+    -------
+    numpy.ndarray
+        Binary status (int).
+
+    Examples
+    --------
+    >>> repair_status([0, 0.6, 0, 0, 0.1, 0.9, 0.8, 0], minimum_uptime=2)
+    array([0, 1, 1, 0, 0, 1, 1, 0])
+    >>> repair_status([1, 0.2, 1, 1, 0, 0, 1, 0], minimum_downtime=3)
+    array([1, 1, 1, 1, 1, 1, 1, 0])
+    """
+    on = np.asarray(status, dtype=float) >= 0.5
+    steps = len(on)
+    uptime = minimum_uptime or 1
+    downtime = minimum_downtime or 1
+
+    for _ in range(steps + 1):
+        before = on.copy()
+        if fixed_steps:
+            on[:fixed_steps] = initial_status
+            on[steps - fixed_steps :] = initial_status
+
+        startups, shutdowns = _switches(on, initial_status)
+        while (
+            maximum_startups is not None and startups > maximum_startups
+        ) or (maximum_shutdowns is not None and shutdowns > maximum_shutdowns):
+            runs = _runs(on)
+            if len(runs) > 1:
+                gaps = [
+                    (runs[n + 1][0] - runs[n][1], runs[n][1], runs[n + 1][0])
+                    for n in range(len(runs) - 1)
+                ]
+                _, start, stop = min(gaps)
+                on[start:stop] = True
+            else:
+                on[:] = initial_status
+            startups, shutdowns = _switches(on, initial_status)
+
+        runs = _runs(on)
+        for (_, stop), (start, _) in zip(runs[:-1], runs[1:]):
+            if start - stop < downtime:
+                on[stop:start] = True
+        for start, stop in _runs(on):
+            if start > 0 and stop - start < uptime:
+                if start + uptime > steps - fixed_steps and not initial_status:
+                    on[start:stop] = False
+                else:
+                    on[start : start + uptime] = True
+
+        if (on == before).all():
+            break
+    else:
+        logging.warning(
+            "The status repair did not converge, the start may be infeasible."
+        )
+    return on.astype(int)
+
+
+def _relax(model):
+    """Relaxes the integer variables of a model and returns their settings."""
+    relaxed = []
+    for var in model.component_data_objects(Var, descend_into=True):
+        if not var.is_continuous():
+            relaxed.append((var, var.domain, var.lb, var.ub))
+            lb, ub = var.bounds
+            var.domain = Reals
+            var.setlb(lb)
+            var.setub(ub)
+    return relaxed
+
+
+def _restore(relaxed):
+    """Restores the domains and bounds saved by `_relax()`."""
+    for var, domain, lb, ub in relaxed:
+        var.domain = domain
+        var.setlb(lb)
+        var.setub(ub)
+
+
+def set_status_start(model):
+    """Sets repaired start values from the relaxed nonconvex flow status.
+
+    The model must hold the solution of its LP relaxation. The values of all
+    other variables that are not fixed (e.g. by `fix` of a flow) are reset,
+    so the solver completes the start.
+
+    Returns
+    -------
+    int
+        Number of nonconvex flows with a start value.
+    """
+    block = getattr(model, "NonConvexFlow", None)
+    if block is None:
+        return 0
+    timesteps = list(model.TIMESTEPS)
+
+    for i, o in block.NONCONVEX_FLOWS:
+        nonconvex = model.flows[i, o].nonconvex
+        fixed_steps = 0
+        if (
+            nonconvex.minimum_uptime is not None
+            or nonconvex.minimum_downtime is not None
+        ):
+            fixed_steps = nonconvex.max_up_down
+        status = repair_status(
+            [block.status[i, o, t].value or 0 for t in timesteps],
+            minimum_uptime=nonconvex.minimum_uptime,
+            minimum_downtime=nonconvex.minimum_downtime,
+            initial_status=nonconvex.initial_status,
+            maximum_startups=nonconvex.maximum_startups,
+            maximum_shutdowns=nonconvex.maximum_shutdowns,
+            fixed_steps=fixed_steps,
+        )
+        changes = np.diff(np.concatenate([[nonconvex.initial_status], status]))
+        for t, value, change in zip(timesteps, status, changes):
+            block.status[i, o, t].set_value(int(value))
+            if (i, o) in block.STARTUPFLOWS:
+                block.startup[i, o, t].set_value(int(change == 1))
+            if (i, o) in block.SHUTDOWNFLOWS:
+                block.shutdown[i, o, t].set_value(int(change == -1))
+
+    started = [
+        getattr(block, name, None)
+        for name in ("status", "startup", "shutdown")
+    ]
+    for var in model.component_data_objects(Var, descend_into=True):
+        # fixed variables are written as constants and need their value
+        if var.fixed:
+            continue
+        if not any(var.parent_component() is c for c in started):
+            var.set_value(None)
+    return len(block.NONCONVEX_FLOWS)
+
+
+def solve_with_mip_start(
+    model, solver="cbc", solve_kwargs=None, cmdline_options=None
+):
+    """Solves a model with a MIP start from its rounded LP relaxation.
+
+    Parameters
+    ----------
+    model : solph.Model
+    solver : str
+        Default: 'cbc'.
+    solve_kwargs, cmdline_options : dict, optional
+        Passed to `Model.solve()` for both, the relaxation and the MIP.
+
+    Returns
+    -------
+    Solver results of the MIP (see `Model.solve()`).
+    """
+    solve_kwargs = dict(solve_kwargs or {})
+    cmdline_options = cmdline_options or {}
+
+    if not SolverFactory(solver, solver_io="lp").warm_start_capable():
+        logging.warning(
+            "Solver {0} does not accept a MIP start.".format(solver)
+        )
+        return model.solve(
+            solver=solver,
+            solve_kwargs=solve_kwargs,
+            cmdline_options=cmdline_options,
+        )
+
+    relaxed = _relax(model)
+    lp_results = model.solve(
+        solver=solver,
+        solve_kwargs=solve_kwargs,
+        cmdline_options=cmdline_options,
+    )
+    _restore(relaxed)
+
+    termination = lp_results.solver.termination_condition
+    if termination == TerminationCondition.optimal:
+        flows = set_status_start(model)
+        logging.info("MIP start set for {0} nonconvex flows.".format(flows))
+        solve_kwargs["warmstart"] = True
+    else:
+        logging.warning(
+            "LP relaxation ended with {0}, solving without a MIP "
+            "start.".format(termination)
+        )
+
+    return model.solve(
+        solver=solver,
+        solve_kwargs=solve_kwargs,
+        cmdline_options=cmdline_options,
+    )
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Selects the piecewise representation (`pw_repn`) of the
+`PiecewiseLinearTransformer` by benchmarking.
+
+The formulation of the piecewise linear conversion function (e.g. 'CC',
+'DCC', 'INC' or 'MC', see `pyomo.environ.Piecewise`) changes the solution
+time of a model considerably, and which one is fastest depends on the
+breakpoints and the conversion function. `select_pw_repn` builds and solves
+a model for a short sample horizon in every representation and returns the
+fastest one. All transformers of a model share one representation, so the
+choice is cached per signature of all transformers in the model (breakpoints,
+values of the conversion function and nominal values), in memory and
+optionally in a JSON file.
+
+`reduce_breakpoints` removes breakpoints as long as the linear interpolation
+deviates less than a tolerance from the conversion function, which makes
+every representation smaller.
+
+If run as a script, the piecewise example is solved for a sample horizon in
+all representations and the full horizon is solved with the fastest one:
+
+    python pw_repn_selection.py --sample 48 --periods 8760 --tolerance 1
+
+Installation requirements
+-------------------------
+This example requires the version v0.4.x of oemof. Install by:
+
+    pip install 'oemof.solph>=0.4,<0.5'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+from pyomo.opt import TerminationCondition
+
+REPRESENTATIONS = ("CC", "DCC", "INC", "MC")
+
+_CACHE = {}
+
+
+def _interpolation_error(function, x, y, start, stop, samples):
+    """Maximal deviation of the line from `start` to `stop` from `function`."""
+    grid = np.union1d(
+        np.linspace(x[start], x[stop], samples), x[start : stop + 1]
+    )
+    line = np.interp(grid, [x[start], x[stop]], [y[start], y[stop]])
+    return np.abs(np.array([function(g) for g in grid]) - line).max()
+
+
+def reduce_breakpoints(function, breakpoints, tolerance, samples=20):
+    """Removes breakpoints that are not needed to meet a tolerance.
+
+    The breakpoint whose removal causes the smallest deviation between the
+    linear interpolation and `function` is removed as long as the deviation
+    stays below `tolerance`. The first and the last breakpoint are kept.
+
+    Parameters
+    ----------
+    function : callable
+        Conversion function.
+    breakpoints : array-like
+        Input breakpoints in increasing order.
+    tolerance : float
+        Maximal absolute deviation of the output.
+    samples : int
+        Number of points per segment where the deviation is evaluated.
+
+    Returns
+    -------
+    numpy.ndarray
+
+    Examples
+    --------
+    >>> reduce_breakpoints(lambda x: 2 * x, [0, 25, 50, 75, 100], 1e-9)
+    array([  0, 100])
+    """
+    x = np.asarray(breakpoints)
+    y = np.array([function(b) for b in x])
+    kept = list(range(len(x)))
+    while len(kept) > 2:
+        errors = [
+            _interpolation_error(
+                function, x, y, kept[n - 1], kept[n + 1], samples
+            )
+            for n in range(1, len(kept) - 1)
+        ]
+        best = int(np.argmin(errors))
+        if errors[best] > tolerance:
+            break
+        del kept[best + 1]
+    if len(kept) < len(x):
+        logging.info(
+            "Reduced breakpoints from {0} to {1}.".format(len(x), len(kept))
+        )
+    return x[kept]
+
+
+def signature(energysystem):
+    """Returns a hash of all piecewise linear transformers of a system.
+
+    The representation is not part of the signature, so the same signature
+    is returned for all representations.
+    """
+    transformers = []
+    for node in energysystem.nodes:
+        if isinstance(node, solph.custom.PiecewiseLinearTransformer):
+            flow = list(node.inputs.values())[0]
+            transformers.append(
+                [
+                    [float(b) for b in node.in_breakpoints],
+                    [
+                        float(node.conversion_function(b))
+                        for b in node.in_breakpoints
+                    ],
+                    flow.nominal_value,
+                ]
+            )
+    content = json.dumps(sorted(transformers), sort_keys=True)
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+def benchmark_pw_repn(
+    build, representations=REPRESENTATIONS, solver="cbc", solve_kwargs=None
+):
+    """Builds and solves a model in every representation.
+
+    Parameters
+    ----------
+    build : callable
+        `build(pw_repn)` returns the energy system of the sample horizon with
+        all piecewise linear transformers in the given representation.
+    representations : iterable of str
+    solver : str
+    solve_kwargs : dict, optional
+
+    Returns
+    -------
+    pandas.DataFrame
+        Build and solve time per representation. Representations that fail
+        or do not solve to optimality get NaN.
+    """
+    times = {}
+    for pw_repn in representations:
+        energysystem = build(pw_repn)
+        try:
+            start = time.time()
+            om = solph.Model(energysystem)
+            build_time = time.time() - start
+            start = time.time()
+            results = om.solve(solver=solver, solve_kwargs=solve_kwargs or {})
+            solve_time = time.time() - start
+        except Exception as e:
+            logging.warning(
+                "Representation {0} failed: {1}".format(pw_repn, e)
+            )
+            build_time = solve_time = np.nan
+        else:
+            termination = results.solver.termination_condition
+            if termination != TerminationCondition.optimal:
+                solve_time = np.nan
+        times[pw_repn] = {"build [s]": build_time, "solve [s]": solve_time}
+    return pd.DataFrame(times).T
+
+
+def select_pw_repn(
+    build,
+    representations=REPRESENTATIONS,
+    solver="cbc",
+    solve_kwargs=None,
+    cache=None,
+):
+    """Returns the fastest representation for a sample horizon.
+
+    Parameters
+    ----------
+    build, representations, solver, solve_kwargs
+        See `benchmark_pw_repn()`.
+    cache : str, optional
+        Path of a JSON file that keeps the choices between runs.
+
+    Returns
+    -------
+    str
+    """
+    key = "{0}-{1}".format(solver, signature(build(representations[0])))
+    if key in _CACHE:
+        return _CACHE[key]
+    stored = {}
+    if cache is not None and os.path.isfile(cache):
+        with open(cache) as f:
+            stored = json.load(f)
+    if key in stored:
+        _CACHE[key] = stored[key]["pw_repn"]
+        return _CACHE[key]
+
+    times = benchmark_pw_repn(build, representations, solver, solve_kwargs)
+    total = times.sum(axis=1, skipna=False).dropna()
+    if total.empty:
+        raise ValueError(
+            "No representation could be solved for the sample horizon."
+        )
+    pw_repn = total.idxmin()
+    logging.info("Selected representation {0}:\n{1}".format(pw_repn, times))
+
+    _CACHE[key] = pw_repn
+    if cache is not None:
+        stored[key] = {"pw_repn": pw_repn, "times": total.to_dict()}
+        with open(cache, "w") as f:
+            json.dump(stored, f, indent=2)
+    return pw_repn
+
+
+def piecewise_example(periods, pw_repn, in_breakpoints):
+    """Energy system of the piecewise example for `periods` hours."""
+    datetimeindex = pd.date_range("1/1/2019", periods=periods, freq="H")
+    demand = 50 + 45 * np.sin(np.arange(periods) * 2 * np.pi / 24)
+
+    energysystem = solph.EnergySystem(timeindex=datetimeindex)
+    b_gas = solph.Bus(label="gas", balanced=False)
+    b_el = solph.Bus(label="electricity")
+    energysystem.add(
+        b_gas,
+        b_el,
+        solph.Source(
+            label="shortage", outputs={b_el: solph.Flow(variable_costs=1e6)}
+        ),
+        solph.Sink(
+            label="demand",
+            inputs={b_el: solph.Flow(nominal_value=1, fix=demand)},
+        ),
+        solph.custom.PiecewiseLinearTransformer(
+            label="pwltf",
+            inputs={b_gas: solph.Flow(nominal_value=100, variable_costs=1)},
+            outputs={b_el: solph.Flow()},
+            in_breakpoints=in_breakpoints,
+            conversion_function=lambda x: 0.01 * x**2,
+            pw_repn=pw_repn,
+        ),
+    )
+    return energysystem
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sample", type=int, default=48)
+    parser.add_argument("--periods", type=int, default=8760)
+    parser.add_argument("--breakpoints", type=int, default=41)
+    parser.add_argument("--tolerance", type=float, default=None)
+    parser.add_argument("--solver", default="cbc")
+    parser.add_argument("--cache", default="pw_repn_cache.json")
+    args = parser.parse_args()
+
+    in_breakpoints = np.linspace(0, 100, args.breakpoints)
+    if args.tolerance is not None:
+        in_breakpoints = reduce_breakpoints(
+            lambda x: 0.01 * x**2, in_breakpoints, args.tolerance
+        )
+
+    pw_repn = select_pw_repn(
+        lambda repn: piecewise_example(args.sample, repn, in_breakpoints),
+        solver=args.solver,
+        cache=args.cache,
+    )
+    print("Selected representation: {0}".format(pw_repn))
+
+    om = solph.Model(piecewise_example(args.periods, pw_repn, in_breakpoints))
+    start = time.time()
+    om.solve(solver=args.solver)
+    print(
+        "Full horizon with {0} breakpoints solved in {1:.1f} s.".format(
+            len(in_breakpoints), time.time() - start
+        )
+    )
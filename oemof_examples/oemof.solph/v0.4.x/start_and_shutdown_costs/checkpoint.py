@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Checkpoints of long MILP solves that allow to resume an interrupted job.
+
+`solve_with_checkpoints` does not pass the whole time budget to the solver at
+once but solves in intervals of a few minutes (with the time limit option of
+the solver). After every interval the best integer solution found so far, its
+objective value and the used time are written to a checkpoint file. A run
+that ends with a worse solution does not replace the stored one. The next
+interval starts from the stored solution (MIP start) if the solver supports
+warm starts (e.g. cbc, gurobi, cplex); glpk starts from scratch in every
+interval.
+
+Every run discards the search tree and the bound of the solver. A run can
+therefore only finish the solve if it proves optimality within its own time
+limit, so `interval` has to be large enough for that. To guarantee this
+eventually, the interval is doubled after every run that does not prove
+optimality, until one run gets the whole remaining budget.
+
+If the job is interrupted (e.g. preempted on a batch cluster), the restarted
+job builds the same model again and calls `solve_with_checkpoints` with the
+same file. The variable values are loaded from the checkpoint, the solver
+starts from them and only the remaining time budget is used. The search tree
+of the solver is not stored, so the bound has to be improved again after a
+restart, but the incumbent is never lost.
+
+A checkpoint only fits a model with the same variables; otherwise it is
+ignored with a warning.
+
+Installation requirements
+-------------------------
+This example requires the version v0.4.x of oemof. Install by:
+
+    pip install 'oemof.solph>=0.4,<0.5'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import hashlib
+import json
+import logging
+import os
+import time
+
+from pyomo.environ import Var
+from pyomo.environ import value
+from pyomo.opt import SolverFactory
+from pyomo.opt import TerminationCondition
+
+# command line option of the time limit in seconds per solver
+TIME_LIMIT_OPTIONS = {
+    "cbc": "sec",
+    "glpk": "tmlim",
+    "gurobi": "TimeLimit",
+    "cplex": "timelimit",
+}
+
+# terminations that leave an integer solution in the model
+INTEGER_SOLUTION = (
+    TerminationCondition.optimal,
+    TerminationCondition.feasible,
+    TerminationCondition.maxTimeLimit,
+)
+
+
+def _variables(model):
+    return {
+        var.name: var
+        for var in model.component_data_objects(Var, descend_into=True)
+    }
+
+
+def _signature(variables):
+    """Hash of the variable names, to detect checkpoints of other models."""
+    return hashlib.sha1("\n".join(sorted(variables)).encode()).hexdigest()
+
+
+def _objective(model):
+    """Objective value of the variable values, None if a value is missing."""
+    try:
+        return float(value(model.objective))
+    except ValueError:
+        return None
+
+
+def save_checkpoint(model, path, **info):
+    """Writes the variable values of a model to a checkpoint file.
+
+    Keyword arguments (e.g. the used time) are stored as well. The file is
+    replaced atomically, so an interruption while writing keeps the previous
+    checkpoint.
+    """
+    variables = _variables(model)
+    checkpoint = dict(info)
+    checkpoint["signature"] = _signature(variables)
+    # fixed flows hold numpy values, which json cannot write
+    checkpoint["values"] = {
+        name: float(var.value)
+        for name, var in variables.items()
+        if var.value is not None
+    }
+    temporary = path + ".tmp"
+    with open(temporary, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(temporary, path)
+
+
+def load_checkpoint(model, path):
+    """Sets the variable values of a model from a checkpoint file.
+
+    Returns
+    -------
+    dict or None
+        The stored information without the values, None if there is no
+        checkpoint for this model.
+    """
+    if not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        checkpoint = json.load(f)
+    variables = _variables(model)
+    if checkpoint.get("signature") != _signature(variables):
+        logging.warning(
+            "Checkpoint {0} belongs to another model and is ignored.".format(
+                path
+            )
+        )
+        return None
+    for name, var_value in checkpoint.pop("values").items():
+        variables[name].set_value(var_value)
+    return checkpoint
+
+
+def solve_with_checkpoints(
+    model,
+    path,
+    time_limit,
+    interval=600,
+    solver="cbc",
+    solve_kwargs=None,
+    cmdline_options=None,
+):
+    """Solves a model in intervals and stores the incumbent in between.
+
+    Parameters
+    ----------
+    model : solph.Model
+    path : str
+        Checkpoint file. If it exists, the solve is resumed from it.
+    time_limit : float
+        Total time budget in seconds, including the time before a restart.
+    interval : float
+        Time limit of the first solver run in seconds, doubled after every
+        run without proof of optimality. Default: 600.
+    solver : str
+        Default: 'cbc'. See `TIME_LIMIT_OPTIONS` for supported solvers.
+    solve_kwargs, cmdline_options : dict, optional
+        Passed to `Model.solve()`.
+
+    Returns
+    -------
+    Solver results of the last run (see `Model.solve()`), None if the
+    checkpoint was already finished or the time budget was used up.
+    """
+    if solver not in TIME_LIMIT_OPTIONS:
+        raise ValueError(
+            "Unknown time limit option for solver {0}.".format(solver)
+        )
+    solve_kwargs = dict(solve_kwargs or {})
+    cmdline_options = dict(cmdline_options or {})
+    warm_start = SolverFactory(solver, solver_io="lp").warm_start_capable()
+    if not warm_start:
+        logging.warning(
+            "Solver {0} does not support warm starts, every interval starts "
+            "from scratch.".format(solver)
+        )
+
+    checkpoint = load_checkpoint(model, path) or {
+        "elapsed": 0,
+        "objective": None,
+        "runs": 0,
+        "finished": False,
+    }
+    checkpoint.setdefault("interval", interval)
+    if checkpoint["objective"] is not None:
+        logging.info(
+            "Resuming from checkpoint with objective {0} after {1:.0f} "
+            "seconds.".format(checkpoint["objective"], checkpoint["elapsed"])
+        )
+
+    results = None
+    while not checkpoint["finished"]:
+        remaining = time_limit - checkpoint["elapsed"]
+        if remaining <= 0:
+            logging.warning("The time budget is used up.")
+            break
+        cmdline_options[TIME_LIMIT_OPTIONS[solver]] = int(
+            max(1, min(checkpoint["interval"], remaining))
+        )
+        solve_kwargs["warmstart"] = (
+            warm_start and checkpoint["objective"] is not None
+        )
+
+        start = time.time()
+        results = model.solve(
+            solver=solver,
+            solve_kwargs=solve_kwargs,
+            cmdline_options=cmdline_options,
+        )
+        checkpoint["elapsed"] += time.time() - start
+        checkpoint["runs"] += 1
+
+        termination = results.solver.termination_condition
+        if termination in (
+            TerminationCondition.infeasible,
+            TerminationCondition.unbounded,
+            TerminationCondition.infeasibleOrUnbounded,
+        ):
+            logging.warning("The solve ended with {0}.".format(termination))
+            break
+        checkpoint["finished"] = termination == TerminationCondition.optimal
+        if not checkpoint["finished"]:
+            checkpoint["interval"] *= 2
+        # pyomo loads the solution into the model and clears
+        # results.solution, so the objective is taken from the model; other
+        # terminations (e.g. intermediateNonInteger) may load LP values
+        objective = None
+        if termination in INTEGER_SOLUTION:
+            objective = _objective(model)
+        if objective is not None and (
+            checkpoint["objective"] is None
+            or objective < checkpoint["objective"]
+            or checkpoint["finished"]
+        ):
+            checkpoint["objective"] = objective
+        elif os.path.isfile(path):
+            # keep the stored incumbent, it is also the next MIP start
+            load_checkpoint(model, path)
+        save_checkpoint(model, path, **checkpoint)
+        logging.info(
+            "Checkpoint after {0:.0f} seconds, objective {1}.".format(
+                checkpoint["elapsed"], checkpoint["objective"]
+            )
+        )
+    return results
@@ -6,6 +6,10 @@ General description
 Example that illustrates how to model startup and shutdown costs attributed
 to a binary flow.
 
+Set `checkpoint` to a file name to solve in intervals and store the best
+solution in between, so an interrupted run can be resumed (see
+checkpoint.py). This pays off for long unit commitment models.
+
 Installation requirements
 -------------------------
 This example requires the version v0.4.x of oemof. Install by:
@@ -22,6 +26,8 @@ import pandas as pd
 from oemof import solph
 from oemof.network.network import Node
 
+from checkpoint import solve_with_checkpoints
+
 try:
     import matplotlib.pyplot as plt
 except ImportError:
@@ -82,7 +88,13 @@ om = solph.Model(es)
 # om.write('problem.lp', io_options={'symbolic_solver_labels': True})
 
 # solve model
-om.solve(solver="cbc", solve_kwargs={"tee": True})
+checkpoint = None  # e.g. "startup_shutdown_checkpoint.json"
+if checkpoint is None:
+    om.solve(solver="cbc", solve_kwargs={"tee": True})
+else:
+    solve_with_checkpoints(
+        om, checkpoint, time_limit=3600, interval=600, solver="cbc"
+    )
 
 # create result object
 results = solph.processing.results(om)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Solves the independent parts of an energy system as separate problems.
+
+If an energy system consists of sub-systems that are not connected by any
+flow (e.g. regions or sites), they can be optimised independently. The
+function `solve_decomposed` finds the connected components of the graph of
+the energy system, builds one `solph.Model` per component, solves them on a
+process pool and merges the results into one dictionary in the structure of
+`solph.processing.results()`. The objective of the complete system is the sum
+of the objectives of the parts.
+
+Nodes of oemof.network are hashed by their label, which is not restored yet
+when a node graph with cycles is unpickled, so nodes cannot be sent to the
+worker processes. Instead, every worker calls a module level function `build`
+that creates the energy system and keeps the nodes with the labels of its
+part.
+
+Constraints that span several components couple them. Such couplings have to
+be given explicitly, so the coupled components are solved together:
+
+* `couplings`: groups of nodes that are coupled, e.g. the components of a
+  `shared_limit` constraint
+* `limit_keywords`: flow attributes used by keyword limits like
+  `emission_limit` or `generic_integral_limit`; all flows with one of these
+  attributes end up in the same part
+
+Additional constraints are added with `model_hook(model, nodes)`, which is
+called for every part after the model is built. It must be a module level
+function so it can be sent to the worker processes.
+
+If run as a script, the storage example (storage.py) is solved with and
+without decomposition and the objectives are compared:
+
+    python decomposition.py
+
+Installation requirements
+-------------------------
+This example requires the version v0.4.x of oemof. Install by:
+
+    pip install 'oemof.solph>=0.4,<0.5'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import logging
+import multiprocessing
+
+from oemof import solph
+
+
+def connected_components(energysystem, couplings=(), limit_keywords=()):
+    """Returns the node sets that can be optimised independently.
+
+    Parameters
+    ----------
+    energysystem : solph.EnergySystem
+    couplings : iterable of iterables of nodes
+        Groups of nodes that are coupled by additional constraints.
+    limit_keywords : iterable of str
+        Flow attributes of keyword limits (e.g. 'emission_factor').
+
+    Returns
+    -------
+    list of lists of nodes
+        One list per part, in the order of the nodes in the energy system.
+    """
+    parent = {node: node for node in energysystem.nodes}
+
+    def find(node):
+        while parent[node] is not node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(nodes):
+        nodes = list(nodes)
+        for node in nodes[1:]:
+            parent[find(node)] = find(nodes[0])
+
+    flows = energysystem.flows()
+    for i, o in flows:
+        union((i, o))
+    for group in couplings:
+        union(group)
+    for keyword in limit_keywords:
+        coupled = [
+            i
+            for (i, o), flow in flows.items()
+            if getattr(flow, keyword, None) is not None
+        ]
+        union(coupled)
+
+    parts = {}
+    for node in energysystem.nodes:
+        parts.setdefault(find(node), []).append(node)
+    return list(parts.values())
+
+
+def _solve_part(task):
+    build, labels, solver, solve_kwargs, model_hook = task
+
+    # the energy system is built again in the worker, only the labels of the
+    # nodes of the part are sent
+    complete = build()
+    nodes = [node for node in complete.nodes if node.label in labels]
+    es = solph.EnergySystem(
+        timeindex=complete.timeindex,
+        timeincrement=getattr(complete, "timeincrement", None),
+    )
+    es.add(*nodes)
+    om = solph.Model(es)
+    if model_hook is not None:
+        model_hook(om, nodes)
+    om.solve(solver=solver, solve_kwargs=solve_kwargs)
+
+    # the nodes belong to the worker process, so use labels as keys
+    results = {
+        tuple(getattr(n, "label", n) for n in key): value
+        for key, value in solph.processing.results(om).items()
+    }
+    return results, solph.processing.meta_results(om)
+
+
+def solve_decomposed(
+    build,
+    solver="cbc",
+    solve_kwargs=None,
+    couplings=(),
+    limit_keywords=(),
+    model_hook=None,
+    processes=None,
+):
+    """Optimises the independent parts of an energy system in parallel.
+
+    Parameters
+    ----------
+    build : callable
+        Module level function without arguments (or a `functools.partial`
+        of one) that returns the energy system. Node labels must be unique
+        and the same in every call.
+    solver : str
+        Default: 'cbc'.
+    solve_kwargs : dict, optional
+        Passed to `Model.solve()`.
+    couplings, limit_keywords
+        See `connected_components()`.
+    model_hook : callable, optional
+        Called as `model_hook(model, nodes)` for every part before it is
+        solved, e.g. to add constraints.
+    processes : int, optional
+        Number of worker processes. Default: number of CPUs.
+
+    Returns
+    -------
+    tuple (dict, dict)
+        Results in the structure of `solph.processing.results()`, with the
+        nodes of an energy system built in this process as keys, and meta
+        results with the summed objective and the meta results of all parts.
+    """
+    energysystem = build()
+    parts = connected_components(energysystem, couplings, limit_keywords)
+    logging.info(
+        "Energy system decomposed into {0} independent parts.".format(
+            len(parts)
+        )
+    )
+    tasks = [
+        (
+            build,
+            {node.label for node in nodes},
+            solver,
+            solve_kwargs or {},
+            model_hook,
+        )
+        for nodes in parts
+    ]
+
+    if len(tasks) == 1:
+        solved = [_solve_part(tasks[0])]
+    else:
+        processes = min(processes or multiprocessing.cpu_count(), len(tasks))
+        with multiprocessing.Pool(processes) as pool:
+            solved = pool.map(_solve_part, tasks)
+
+    nodes = {node.label: node for node in energysystem.nodes}
+    results = {}
+    for part_results, _ in solved:
+        for key, value in part_results.items():
+            results[tuple(nodes.get(n, n) for n in key)] = value
+
+    meta = {
+        "objective": sum(m["objective"] for _, m in solved),
+        "parts": [m for _, m in solved],
+    }
+    return results, meta
+
+
+if __name__ == "__main__":
+    from storage import create_energysystem
+
+    decomposed = solve_decomposed(create_energysystem)[1]["objective"]
+    om = solph.Model(create_energysystem())
+    om.solve(solver="cbc")
+    combined = solph.processing.meta_results(om)["objective"]
+    print("objective decomposed: {0}".format(decomposed))
+    print("objective combined: {0}".format(combined))
+    assert abs(decomposed - combined) <= 1e-6 * max(abs(combined), 1)
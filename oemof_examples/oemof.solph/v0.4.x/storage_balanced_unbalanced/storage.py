@@ -5,6 +5,10 @@ General description
 -------------------
 Example that shows the parameter `balanced` of `GenericStorage`.
 
+The four storages are not connected to each other, so with `decompose=True`
+the four sub-systems are solved as independent problems in parallel (see
+decomposition.py).
+
 Installation requirements
 -------------------------
 This example requires the version v0.4.x of oemof. Install by:
@@ -33,6 +37,8 @@ import os
 import pandas as pd
 from oemof import solph
 
+from decomposition import solve_decomposed
+
 try:
     from matplotlib import pyplot as plt
 except ImportError:
@@ -54,9 +60,11 @@ DATA = [
 PARAMETER = {"el_price": 10, "sh_price": 5, "nominal_storage_capacity": 7}
 
 
-def storage_example():
+def create_energysystem():
     # read time series
-    timeseries = pd.read_csv(os.path.join(os.getcwd(), "storage_data.csv"))
+    timeseries = pd.read_csv(
+        os.path.join(os.path.dirname(__file__), "storage_data.csv")
+    )
     # create an energy system
     idx = pd.date_range("1/1/2017", periods=len(timeseries), freq="H")
     es = solph.EnergySystem(timeindex=idx)
@@ -115,15 +123,23 @@ def storage_example():
                 balanced=data_set["balanced"],
             )
         )
+    return es
+
 
-    # create an optimization problem and solve it
-    om = solph.Model(es)
+def storage_example(decompose=False):
+    if decompose:
+        # solve the independent sub-systems in parallel, the workers build
+        # the energy system themselves
+        results, meta = solve_decomposed(create_energysystem, solver="cbc")
+    else:
+        # create an optimization problem and solve it
+        om = solph.Model(create_energysystem())
 
-    # solve model
-    om.solve(solver="cbc")
+        # solve model
+        om.solve(solver="cbc")
 
-    # create result object
-    results = solph.processing.results(om)
+        # create result object
+        results = solph.processing.results(om)
 
     flows = [x for x in results if x[1] is not None]
     components = [x for x in results if x[1] is None]
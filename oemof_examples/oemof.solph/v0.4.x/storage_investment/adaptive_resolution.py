@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Reduces the number of time steps of a model by merging similar hours.
+
+Consecutive time steps whose input series (e.g. demand, wind and pv) vary
+less than a tolerance are merged into one longer time step. The input series
+are averaged over the merged steps and the length of every step is passed to
+solph as `timeincrement`, so energy sums, storage balances and variable costs
+stay correct. Steps marked with `keep` (e.g. the peak demand hours) and steps
+with fast changes keep their full resolution.
+
+After the optimisation `AdaptiveResolution.results()` maps the results back to
+the original index: flows are constant within a merged step and the storage
+content is interpolated linearly. `resolution_error()` compares these results
+with the results of the model in full resolution.
+
+If run as a script, the storage investment example (variation 1) is solved in
+full and in reduced resolution and the errors are printed:
+
+    python adaptive_resolution.py --tolerance 0.05 --max-length 24
+
+Data
+----
+storage_investment.csv
+
+Installation requirements
+-------------------------
+This example requires the version v0.4.x of oemof. Install by:
+
+    pip install 'oemof.solph>=0.4,<0.5'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import argparse
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+from oemof.tools import economics
+
+
+class AdaptiveResolution(object):
+    """Merges consecutive time steps with similar input data.
+
+    A step is added to the current merged step as long as every column
+    varies by at most `tolerance` times its total range within the merged
+    step.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Input series with a regular DatetimeIndex.
+    tolerance : float
+        Allowed variation relative to the range of each column, e.g. 0.05.
+    columns : list, optional
+        Columns that determine the merging. Default: all columns.
+    keep : array-like of bool, optional
+        Steps that are not merged with any other step.
+    max_length : int, optional
+        Maximal number of original steps in a merged step.
+
+    Attributes
+    ----------
+    starts, lengths : numpy.ndarray
+        First original step and number of original steps of every step.
+    timeindex : pandas.DatetimeIndex
+        Start of every step.
+    timeincrement : list
+        Length of every step in hours.
+    """
+
+    def __init__(
+        self, data, tolerance, columns=None, keep=None, max_length=None
+    ):
+        self.index = data.index
+        values = data[columns or list(data.columns)].to_numpy(dtype=float)
+        keep = (
+            np.zeros(len(data), dtype=bool)
+            if keep is None
+            else np.asarray(keep, dtype=bool)
+        )
+
+        span = values.max(axis=0) - values.min(axis=0)
+        limit = tolerance * np.where(span > 0, span, 1)
+
+        starts = [0]
+        low = high = values[0]
+        for t in range(1, len(values)):
+            new_low = np.minimum(low, values[t])
+            new_high = np.maximum(high, values[t])
+            if (
+                keep[t]
+                or keep[t - 1]
+                or (new_high - new_low > limit).any()
+                or t - starts[-1] == max_length
+            ):
+                starts.append(t)
+                low = high = values[t]
+            else:
+                low, high = new_low, new_high
+
+        self.starts = np.array(starts)
+        self.lengths = np.diff(np.append(self.starts, len(values)))
+        step = (self.index[1] - self.index[0]).total_seconds() / 3600
+        self.timeindex = self.index[self.starts]
+        self.timeincrement = list(self.lengths * step)
+        logging.info(
+            "Merged {0} time steps into {1}.".format(
+                len(self.index), len(self.starts)
+            )
+        )
+
+    def energysystem(self):
+        """Returns an empty energy system in the reduced resolution."""
+        return solph.EnergySystem(
+            timeindex=self.timeindex, timeincrement=self.timeincrement
+        )
+
+    def aggregate(self, data):
+        """Averages series in the original resolution over the merged steps.
+
+        Parameters
+        ----------
+        data : pandas.Series or pandas.DataFrame
+
+        Returns
+        -------
+        pandas.Series or pandas.DataFrame
+            Indexed by `timeindex`.
+        """
+        sums = np.add.reduceat(np.asarray(data, dtype=float), self.starts)
+        means = (sums.T / self.lengths).T
+        if isinstance(data, pd.DataFrame):
+            return pd.DataFrame(
+                means, index=self.timeindex, columns=data.columns
+            )
+        return pd.Series(means, index=self.timeindex, name=data.name)
+
+    def disaggregate(self, data):
+        """Repeats values of the merged steps in the original resolution."""
+        values = np.repeat(np.asarray(data), self.lengths, axis=0)
+        if isinstance(data, pd.DataFrame):
+            return pd.DataFrame(values, index=self.index, columns=data.columns)
+        return pd.Series(values, index=self.index, name=data.name)
+
+    def _interpolate(self, end, start):
+        """Linear interpolation of states given at the end of every step."""
+        begin = np.append(start, end[:-1])
+        position = np.arange(len(self.index)) - np.repeat(
+            self.starts, self.lengths
+        )
+        share = (position + 1) / np.repeat(self.lengths, self.lengths)
+        return np.repeat(begin, self.lengths) + share * np.repeat(
+            end - begin, self.lengths
+        )
+
+    def results(self, results):
+        """Maps results of the reduced model to the original index.
+
+        Parameters
+        ----------
+        results : dict
+            Results of the reduced model (`solph.processing.results()`).
+
+        Returns
+        -------
+        dict
+            Results with the same keys and sequences in full resolution.
+        """
+        mapped = {}
+        for key, value in results.items():
+            sequences = self.disaggregate(value["sequences"])
+            if "storage_content" in sequences:
+                end = value["sequences"]["storage_content"].to_numpy()
+                start = value["scalars"].get("init_content", end[0])
+                sequences["storage_content"] = self._interpolate(end, start)
+            mapped[key] = {
+                "scalars": value["scalars"],
+                "sequences": sequences,
+            }
+        return mapped
+
+
+def resolution_error(reference, approximation, flows):
+    """Compares results in full resolution for the given flows.
+
+    Parameters
+    ----------
+    reference, approximation : dict
+        Results of the full and of the reduced model (mapped back with
+        `AdaptiveResolution.results()`).
+    flows : list of tuples
+        Flows as tuples of labels, e.g. [("pp_gas", "electricity")].
+
+    Returns
+    -------
+    pandas.DataFrame
+        Per flow the energy of the reference, the relative energy error, the
+        maximal hourly deviation relative to the peak of the reference and
+        the relative error of the investment (if any).
+    """
+    reference = solph.processing.convert_keys_to_strings(reference)
+    approximation = solph.processing.convert_keys_to_strings(approximation)
+    rows = {}
+    for key in flows:
+        ref = reference[key]["sequences"]["flow"]
+        appr = approximation[key]["sequences"]["flow"]
+        peak = ref.abs().max()
+        row = {
+            "energy": ref.sum(),
+            "energy error": (
+                (appr.sum() - ref.sum()) / ref.sum() if ref.sum() else np.nan
+            ),
+            "max deviation": (
+                (appr - ref).abs().max() / peak if peak else np.nan
+            ),
+        }
+        if "invest" in reference[key]["scalars"]:
+            invest = reference[key]["scalars"]["invest"]
+            row["invest error"] = (
+                (approximation[key]["scalars"]["invest"] - invest) / invest
+                if invest
+                else np.nan
+            )
+        rows[key] = row
+    return pd.DataFrame(rows).T
+
+
+def storage_investment_system(energysystem, data):
+    """Adds the nodes of variation 1 of the storage investment example."""
+    epc = economics.annuity(capex=1000, n=20, wacc=0.05)
+
+    bgas = solph.Bus(label="natural_gas")
+    bel = solph.Bus(label="electricity")
+    energysystem.add(
+        bgas,
+        bel,
+        solph.Sink(label="excess_bel", inputs={bel: solph.Flow()}),
+        solph.Source(
+            label="rgas", outputs={bgas: solph.Flow(variable_costs=0.04)}
+        ),
+        solph.Source(
+            label="wind",
+            outputs={
+                bel: solph.Flow(
+                    fix=data["wind"].values,
+                    investment=solph.Investment(ep_costs=epc),
+                )
+            },
+        ),
+        solph.Source(
+            label="pv",
+            outputs={
+                bel: solph.Flow(
+                    fix=data["pv"].values,
+                    investment=solph.Investment(ep_costs=epc),
+                )
+            },
+        ),
+        solph.Sink(
+            label="demand",
+            inputs={
+                bel: solph.Flow(fix=data["demand_el"].values, nominal_value=1)
+            },
+        ),
+        solph.Transformer(
+            label="pp_gas",
+            inputs={bgas: solph.Flow()},
+            outputs={bel: solph.Flow(nominal_value=10e10, variable_costs=0)},
+            conversion_factors={bel: 0.58},
+        ),
+        solph.components.GenericStorage(
+            label="storage",
+            inputs={bel: solph.Flow(variable_costs=0.0001)},
+            outputs={bel: solph.Flow()},
+            loss_rate=0.00,
+            initial_storage_level=0,
+            invest_relation_input_capacity=1 / 6,
+            invest_relation_output_capacity=1 / 6,
+            inflow_conversion_factor=1,
+            outflow_conversion_factor=0.8,
+            investment=solph.Investment(ep_costs=epc),
+        ),
+    )
+    return energysystem
+
+
+def optimise(energysystem, solver):
+    """Returns the results and the meta results of an energy system."""
+    om = solph.Model(energysystem)
+    om.solve(solver=solver)
+    return (
+        solph.processing.results(om),
+        solph.processing.meta_results(om),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tolerance", type=float, default=0.05)
+    parser.add_argument("--max-length", type=int, default=24)
+    parser.add_argument("--solver", default="cbc")
+    args = parser.parse_args()
+
+    filename = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "storage_investment.csv"
+    )
+    data = pd.read_csv(filename, sep=",")[["demand_el", "pv", "wind"]]
+    data.index = pd.date_range("1/1/2012", periods=len(data), freq="H")
+
+    # keep the hours with the highest demand at full resolution
+    peak = data["demand_el"] >= data["demand_el"].quantile(0.99)
+    resolution = AdaptiveResolution(
+        data, args.tolerance, keep=peak, max_length=args.max_length
+    )
+
+    full_es = solph.EnergySystem(timeindex=data.index)
+    full_results, full_meta = optimise(
+        storage_investment_system(full_es, data), args.solver
+    )
+    reduced_es = storage_investment_system(
+        resolution.energysystem(), resolution.aggregate(data)
+    )
+    reduced_results, reduced_meta = optimise(reduced_es, args.solver)
+
+    print(
+        "Time steps: {0} -> {1}".format(len(data), len(resolution.timeindex))
+    )
+    print(
+        "Objective error: {0:.2%}".format(
+            reduced_meta["objective"] / full_meta["objective"] - 1
+        )
+    )
+    print(
+        resolution_error(
+            full_results,
+            resolution.results(reduced_results),
+            [
+                ("wind", "electricity"),
+                ("pv", "electricity"),
+                ("pp_gas", "electricity"),
+                ("electricity", "storage"),
+                ("storage", "electricity"),
+                ("electricity", "excess_bel"),
+            ],
+        )
+    )
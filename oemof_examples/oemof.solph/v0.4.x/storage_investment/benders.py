@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+
+"""
+General description
+-------------------
+Benders decomposition for investment models.
+
+In an investment model the investment variables couple all time steps. With
+a Benders decomposition the problem is split into
+
+* a master problem that holds the investment variables (`invest` and
+  `invest_status` of investment flows and investment storages), their costs
+  and all constraints that contain only investment variables, e.g. the
+  invest relations of storages or the limits of
+  `solph.constraints.additional_investment_flow_limit`, and
+* one dispatch subproblem per time block or scenario. The investment
+  variables of a subproblem are linked to the values of the master by an
+  equality constraint, and the duals of these constraints give the
+  sensitivity of the dispatch costs to the capacities.
+
+In every iteration the master proposes capacities, the subproblems are solved
+in parallel worker processes and every subproblem returns an optimality cut
+for its dispatch costs. The master objective is a lower bound and the costs
+of the proposed capacities an upper bound of the optimum; the iteration stops
+if the gap between them is small enough.
+
+Requirements for the subproblems:
+
+* The energy systems of all blocks contain the same investment objects. The
+  investment costs are taken from the first block, so every block may use
+  the full (annual) investment costs.
+* The subproblems are solved as LPs: `NonConvex` flows are relaxed in the
+  subproblems, fix the capacities and solve the blocks as MIP afterwards for
+  the exact dispatch (see `BendersDecomposition.fix`).
+* Every subproblem has to be feasible for all capacities, e.g. by excess and
+  shortage sources. Storage contents are not linked between time blocks.
+
+If run as a script, variation 1 of the storage investment example is solved
+with one subproblem per time block:
+
+    python benders.py --blocks 12
+
+Data
+----
+storage_investment.csv
+
+Installation requirements
+-------------------------
+This example requires the version v0.4.x of oemof. Install by:
+
+    pip install 'oemof.solph>=0.4,<0.5'
+
+"""
+
+__copyright__ = "oemof developer group"
+__license__ = "GPLv3"
+
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from oemof import solph
+from pyomo.core.expr.current import identify_variables
+from pyomo.environ import Binary
+from pyomo.environ import ConcreteModel
+from pyomo.environ import Constraint
+from pyomo.environ import ConstraintList
+from pyomo.environ import NonNegativeReals
+from pyomo.environ import Objective
+from pyomo.environ import Param
+from pyomo.environ import Reals
+from pyomo.environ import Var
+from pyomo.environ import value
+from pyomo.opt import SolverFactory
+from pyomo.opt import TerminationCondition
+from pyomo.repn import generate_standard_repn
+
+from adaptive_resolution import storage_investment_system
+
+INVESTMENT_VARIABLES = (
+    ("InvestmentFlow", "invest"),
+    ("InvestmentFlow", "invest_status"),
+    ("GenericInvestmentStorageBlock", "invest"),
+    ("GenericInvestmentStorageBlock", "invest_status"),
+)
+
+
+def investment_variables(model):
+    """Returns the investment variables of a model keyed by their names.
+
+    The names are the same in all models of an energy system, e.g.
+    'InvestmentFlow.invest(wind_electricity)'.
+    """
+    variables = {}
+    for block_name, var_name in INVESTMENT_VARIABLES:
+        var = getattr(getattr(model, block_name, None), var_name, None)
+        if var is not None:
+            for index in var:
+                variables[var[index].name] = var[index]
+    return variables
+
+
+def _investment_constraints(model, variables):
+    """Deactivates and returns the constraints of investment variables only.
+
+    Returns
+    -------
+    list of tuples
+        (lower, coefficients, upper) per constraint, with the coefficients
+        keyed by variable names and the constants moved to the bounds.
+    """
+    names = {id(var): name for name, var in variables.items()}
+    constraints = []
+    for constraint in model.component_data_objects(
+        Constraint, active=True, descend_into=True
+    ):
+        found = False
+        for var in identify_variables(constraint.body):
+            if id(var) not in names:
+                break
+            found = True
+        else:
+            if not found:
+                continue
+            repn = generate_standard_repn(constraint.body)
+            constant = value(repn.constant)
+            constraints.append(
+                (
+                    (
+                        value(constraint.lower) - constant
+                        if constraint.has_lb()
+                        else None
+                    ),
+                    {
+                        names[id(var)]: value(coefficient)
+                        for var, coefficient in zip(
+                            repn.linear_vars, repn.linear_coefs
+                        )
+                    },
+                    (
+                        value(constraint.upper) - constant
+                        if constraint.has_ub()
+                        else None
+                    ),
+                )
+            )
+            constraint.deactivate()
+    return constraints
+
+
+class _Subproblem(object):
+    """Dispatch model of one block with investments linked to parameters."""
+
+    def __init__(self, build, block, solver, solve_kwargs, limits):
+        self.solver = solver
+        self.solve_kwargs = solve_kwargs
+        self.model = om = solph.Model(build(block))
+        for keyword, limit in limits.items():
+            solph.constraints.additional_investment_flow_limit(
+                om, keyword, limit=limit
+            )
+
+        variables = investment_variables(om)
+        self.names = sorted(variables)
+        repn = generate_standard_repn(om.objective.expr)
+        coefficients = {
+            id(var): value(coefficient)
+            for var, coefficient in zip(repn.linear_vars, repn.linear_coefs)
+        }
+        self.costs = {
+            name: coefficients.get(id(var), 0)
+            for name, var in variables.items()
+        }
+        self.info = {
+            "variables": {
+                name: (var.bounds, var.is_binary())
+                for name, var in variables.items()
+            },
+            "costs": self.costs,
+            "constraints": _investment_constraints(om, variables),
+        }
+
+        om.relax_problem()
+        om.benders_capacity = Param(
+            self.names, mutable=True, initialize=0, within=Reals
+        )
+        om.benders_link = Constraint(
+            self.names,
+            rule=lambda m, name: variables[name] == m.benders_capacity[name],
+        )
+        om.receive_duals()
+
+    def solve(self, capacities):
+        """Returns the dispatch costs and their gradient."""
+        om = self.model
+        for name in self.names:
+            om.benders_capacity[name] = capacities[name]
+        results = om.solve(solver=self.solver, solve_kwargs=self.solve_kwargs)
+        termination = results.solver.termination_condition
+        if termination != TerminationCondition.optimal:
+            raise ValueError(
+                "Subproblem ended with {0}. The subproblems must be feasible "
+                "for all capacities.".format(termination)
+            )
+        dispatch_costs = value(om.objective) - sum(
+            self.costs[name] * capacities[name] for name in self.names
+        )
+        gradient = {
+            name: om.dual[om.benders_link[name]] - self.costs[name]
+            for name in self.names
+        }
+        return dispatch_costs, gradient
+
+
+def _worker(connection, build, blocks, solver, solve_kwargs, limits):
+    """Builds the subproblems of some blocks and solves them on request."""
+    try:
+        subproblems = [
+            _Subproblem(build, block, solver, solve_kwargs, limits)
+            for block in blocks
+        ]
+        connection.send([s.info for s in subproblems])
+        while True:
+            capacities = connection.recv()
+            if capacities is None:
+                break
+            connection.send([s.solve(capacities) for s in subproblems])
+    except Exception as e:
+        connection.send(e)
+    finally:
+        connection.close()
+
+
+class BendersDecomposition(object):
+    """Solves an investment model by Benders decomposition.
+
+    Parameters
+    ----------
+    build : callable
+        `build(block)` returns the energy system of one block. It must be a
+        module level function so it can be sent to the worker processes.
+    blocks : list
+        Descriptions of the blocks passed to `build`, e.g. (start, stop)
+        pairs of time steps or scenario names.
+    solver : str
+        Default: 'cbc'.
+    solve_kwargs : dict, optional
+        Passed to `Model.solve()` of the subproblems.
+    limits : dict, optional
+        Limits added to every block with
+        `solph.constraints.additional_investment_flow_limit`, e.g.
+        {'space': 24}. They end up in the master problem.
+    master_hook : callable, optional
+        Called as `master_hook(master)` to add constraints to the master
+        problem. The investment variables are `master.x[name]`.
+    processes : int, optional
+        Number of worker processes. Default: number of CPUs.
+
+    Attributes
+    ----------
+    capacities : dict
+        Best investments found, keyed by variable names.
+    objective : float
+        Total costs of the best investments.
+    history : list of dict
+        Lower bound, upper bound and gap of every iteration.
+    """
+
+    def __init__(
+        self,
+        build,
+        blocks,
+        solver="cbc",
+        solve_kwargs=None,
+        limits=None,
+        master_hook=None,
+        processes=None,
+    ):
+        self.build = build
+        self.blocks = list(blocks)
+        self.solver = solver
+        self.solve_kwargs = solve_kwargs or {}
+        self.limits = limits or {}
+        self.master_hook = master_hook
+        self.processes = min(
+            processes or multiprocessing.cpu_count(), len(self.blocks)
+        )
+        self.capacities = None
+        self.objective = None
+        self.history = []
+
+    def _start_workers(self):
+        self._connections = []
+        self._workers = []
+        for w in range(self.processes):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker,
+                args=(
+                    child,
+                    self.build,
+                    self.blocks[w :: self.processes],
+                    self.solver,
+                    self.solve_kwargs,
+                    self.limits,
+                ),
+            )
+            process.start()
+            # only the worker holds the child end now, so the parent gets an
+            # EOFError instead of blocking if the worker dies without reply
+            child.close()
+            self._connections.append(parent)
+            self._workers.append(process)
+        return self._receive()
+
+    def _receive(self):
+        """Collects the replies of all workers in the order of the blocks."""
+        try:
+            replies = [connection.recv() for connection in self._connections]
+        except EOFError:
+            raise RuntimeError("A worker process ended without a reply.")
+        for reply in replies:
+            if isinstance(reply, Exception):
+                raise reply
+        ordered = [None] * len(self.blocks)
+        for w, reply in enumerate(replies):
+            ordered[w :: self.processes] = reply
+        return ordered
+
+    def _stop_workers(self):
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._workers:
+            process.join()
+
+    def _master(self, info):
+        variables = info["variables"]
+        for block_info in self._block_infos[1:]:
+            if sorted(block_info["variables"]) != sorted(variables):
+                raise ValueError(
+                    "All blocks must have the same investment variables."
+                )
+
+        master = ConcreteModel()
+        master.x = Var(
+            sorted(variables),
+            within=lambda m, n: Binary if variables[n][1] else Reals,
+            bounds=lambda m, n: variables[n][0],
+        )
+        master.theta = Var(range(len(self.blocks)), within=NonNegativeReals)
+        master.cuts = ConstraintList()
+        master.investment = ConstraintList()
+        for lower, coefficients, upper in info["constraints"]:
+            master.investment.add(
+                (
+                    lower,
+                    sum(c * master.x[n] for n, c in coefficients.items()),
+                    upper,
+                )
+            )
+        master.objective = Objective(
+            expr=sum(c * master.x[n] for n, c in info["costs"].items())
+            + sum(master.theta.values())
+        )
+        if self.master_hook is not None:
+            self.master_hook(master)
+        return master
+
+    def solve(self, gap=1e-4, max_iterations=50):
+        """Iterates until the relative gap is closed.
+
+        The dispatch costs are assumed to be non-negative, which bounds the
+        master problem in the first iteration.
+
+        Returns
+        -------
+        dict
+            Best investments keyed by variable names.
+        """
+        start = time.time()
+        try:
+            self._block_infos = self._start_workers()
+            info = self._block_infos[0]
+            master = self._master(info)
+            opt = SolverFactory(self.solver)
+            upper_bound = float("inf")
+            relative_gap = float("inf")
+
+            for iteration in range(max_iterations):
+                results = opt.solve(master)
+                if (
+                    results.solver.termination_condition
+                    != TerminationCondition.optimal
+                ):
+                    raise ValueError(
+                        "Master problem ended with {0}.".format(
+                            results.solver.termination_condition
+                        )
+                    )
+                lower_bound = value(master.objective)
+                capacities = {n: value(master.x[n]) for n in master.x}
+
+                for connection in self._connections:
+                    connection.send(capacities)
+                solved = self._receive()
+
+                costs = sum(
+                    c * capacities[n] for n, c in info["costs"].items()
+                ) + sum(dispatch_costs for dispatch_costs, _ in solved)
+                if costs < upper_bound:
+                    upper_bound = costs
+                    self.capacities = capacities
+                relative_gap = (upper_bound - lower_bound) / max(
+                    abs(upper_bound), 1e-10
+                )
+                self.history.append(
+                    {
+                        "iteration": iteration,
+                        "lower bound": lower_bound,
+                        "upper bound": upper_bound,
+                        "gap": relative_gap,
+                        "time [s]": time.time() - start,
+                    }
+                )
+                logging.info(
+                    "Benders iteration {0}: lower bound {1:.6g}, upper bound "
+                    "{2:.6g}, gap {3:.4%}".format(
+                        iteration, lower_bound, upper_bound, relative_gap
+                    )
+                )
+                if relative_gap <= gap:
+                    break
+
+                for b, (dispatch_costs, gradient) in enumerate(solved):
+                    master.cuts.add(
+                        master.theta[b]
+                        >= dispatch_costs
+                        + sum(
+                            gradient[n] * (master.x[n] - capacities[n])
+                            for n in capacities
+                        )
+                    )
+            else:
+                logging.warning(
+                    "Benders decomposition stopped after {0} iterations with "
+                    "a gap of {1:.4%}.".format(max_iterations, relative_gap)
+                )
+        finally:
+            self._stop_workers()
+
+        self.objective = upper_bound
+        return self.capacities
+
+    def fix(self, model):
+        """Fixes the investment variables of a model to the best values."""
+        for name, var in investment_variables(model).items():
+            var.fix(self.capacities[name])
+        return model
+
+
+def storage_investment_block(block):
+    """Energy system of variation 1 of the storage investment example for
+    the time steps `start` to `stop`."""
+    start, stop = block
+    filename = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "storage_investment.csv"
+    )
+    data = pd.read_csv(filename, sep=",")[["demand_el", "pv", "wind"]]
+    data.index = pd.date_range("1/1/2012", periods=len(data), freq="H")
+    data = data[start:stop]
+    energysystem = solph.EnergySystem(timeindex=data.index)
+    return storage_investment_system(energysystem, data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=12)
+    parser.add_argument("--steps", type=int, default=8760)
+    parser.add_argument("--gap", type=float, default=1e-4)
+    parser.add_argument("--solver", default="cbc")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    bounds = np.linspace(0, args.steps, args.blocks + 1).astype(int)
+    benders = BendersDecomposition(
+        storage_investment_block,
+        list(zip(bounds[:-1], bounds[1:])),
+        solver=args.solver,
+        processes=args.processes,
+    )
+    capacities = benders.solve(gap=args.gap)
+
+    print(pd.DataFrame(benders.history).set_index("iteration"))
+    print("Total costs: {0:.6g}".format(benders.objective))
+    for name, capacity in sorted(capacities.items()):
+        print("{0}: {1:.6g}".format(name, capacity))
@@ -5,9 +5,10 @@ from tespy.components import (Sink, Source, Turbine, Condenser,
                               Pump, HeatExchangerSimple, CycleCloser)
 from tespy.connections import Connection, Bus, Ref
 from tespy.tools.characteristics import CharLine
-from tespy.tools import document_model
 import numpy as np
 
+from lazy_report import LazyReport
+
 # %% network
 
 fluids = ['water']
@@ -83,11 +84,14 @@ power.set_attr(P=-10e6)
 
 # %% solving
 
+# reports are only rendered on report.render(), unchanged ones are skipped
+report = LazyReport()
+
 # solve the network, print the results to prompt and save
 nw.solve('design')
 nw.print_results()
 nw.save('design')
-document_model(nw, filename='report_design.tex')
+report.document(nw, filename='report_design.tex')
 
 # reset power input
 power.set_attr(P=-9e6)
@@ -97,4 +101,12 @@ power.set_attr(P=-9e6)
 nw.solve('offdesign', design_path='design')
 nw.print_results()
 
-document_model(nw, filename='report_offdesign.tex')
+report.document(nw, filename='report_offdesign.tex')
+
+# part load sweep, only the last state of every report file is rendered
+for P in np.linspace(-9e6, -5e6, 5):
+    power.set_attr(P=P)
+    nw.solve('offdesign', design_path='design')
+    report.document(nw, filename='report_partload.tex')
+
+report.render()
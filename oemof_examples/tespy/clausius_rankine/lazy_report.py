@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""Deferred and incremental model documentation.
+
+:code:`document_model` renders the complete LaTeX report including all
+characteristic line figures on every call. :class:`LazyReport` only takes a
+snapshot of the network (:code:`nw.save`) and a fingerprint of every report
+section when :meth:`LazyReport.document` is called. Reports are rendered on
+:meth:`LazyReport.render`, where the snapshot is loaded and solved again in
+the mode and with the design path of the documented state, as only a solve
+provides the results and specifications :code:`document_model` needs:
+
+- if a filename was documented several times, only the latest state is
+  rendered,
+- reports whose section fingerprints match the last rendered version are
+  skipped,
+- characteristic figures are only plotted if the content hash of the
+  characteristics changed or one of the figure files of the last render is
+  missing. Otherwise the plot methods of the characteristics are disabled
+  while rendering and the existing figure files are referenced.
+
+Required packages: tespy (0.4.x), numpy
+"""
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+
+from tespy.networks import load_network
+from tespy.tools import document_model
+
+
+def _char_data(char):
+    """Return the data points of a characteristic line or map."""
+    return tuple(
+        (attr, repr(np.asarray(getattr(char, attr)).tolist()))
+        for attr in ['x', 'y', 'z', 'z1', 'z2'] if hasattr(char, attr))
+
+
+def _value(obj):
+    """Return a hashable representation of a TESPy data container.
+
+    Example
+    -------
+    >>> from tespy.components import Pump
+    >>> from tespy.tools.characteristics import CharLine
+    >>> pu = Pump('pump')
+    >>> before = _value(pu.eta_s_char)
+    >>> pu.set_attr(eta_s_char={
+    ...     'char_func': CharLine(x=[0, 1, 2], y=[0.5, 0.9, 0.7]),
+    ...     'is_set': True})
+    >>> _value(pu.eta_s_char) != before
+    True
+    >>> from tespy.components import Sink, Source
+    >>> from tespy.connections import Connection
+    >>> c = Connection(Source('source'), 'out1', Sink('sink'), 'in1')
+    >>> before = _value(c.p)
+    >>> c.set_attr(p=10)
+    >>> _value(c.p) != before
+    True
+    """
+    if hasattr(obj, 'char_func'):
+        # component characteristics (dc_cc) and characteristic maps (dc_cm)
+        data = None if obj.char_func is None else _char_data(obj.char_func)
+        return ('char', obj.is_set, repr(getattr(obj, 'param', None)), data)
+    elif hasattr(obj, 'x') and hasattr(obj, 'y'):
+        # characteristic lines of busses
+        return ('char', ) + _char_data(obj)
+    elif hasattr(obj, 'val_set'):
+        # fluid properties and fluid compositions of connections
+        val, val_set = obj.val, obj.val_set
+        if isinstance(val, dict):
+            val, val_set = sorted(val.items()), sorted(val_set.items())
+        ref = None
+        if getattr(obj, 'ref_set', False):
+            ref = (obj.ref.obj.label, obj.ref.factor, obj.ref.delta)
+        return (repr(val), repr(val_set), repr(ref))
+    elif hasattr(obj, 'is_set'):
+        return (repr(getattr(obj, 'val', None)), obj.is_set)
+    return None
+
+
+def _digest(items):
+    return hashlib.sha1(repr(sorted(items)).encode()).hexdigest()
+
+
+def _characteristics(nw):
+    """Return all characteristic lines and maps of components and busses."""
+    chars = []
+    for cp in nw.comps['object']:
+        for obj in vars(cp).values():
+            if getattr(obj, 'char_func', None) is not None:
+                chars += [obj.char_func]
+    for bus in nw.busses.values():
+        chars += [char for char in bus.comps['char'] if char is not None]
+    return chars
+
+
+def _keep_figure(*args, **kwargs):
+    """Replacement of the plot method, the existing figure is kept."""
+
+
+def fingerprint(nw):
+    """Fingerprint every section of the report of a network.
+
+    Returns
+    -------
+    sections : dict
+        Section name (connections, busses, component class names,
+        characteristics) mapped to a hash of its parameters.
+    """
+    sections = {}
+    chars = []
+
+    conns = nw.conns['object'] if 'object' in nw.conns else nw.conns.index
+    items = []
+    for c in conns:
+        for key, obj in vars(c).items():
+            value = _value(obj)
+            if value is not None:
+                items += [(c.label, key, value)]
+    sections['connections'] = _digest(items)
+
+    groups = {}
+    for cp in nw.comps['object']:
+        for key, obj in vars(cp).items():
+            value = _value(obj)
+            if value is None:
+                continue
+            if value[0] == 'char':
+                chars += [(cp.label, key, value)]
+            else:
+                groups.setdefault(cp.__class__.__name__, []).append(
+                    (cp.label, key, value))
+
+    for group, items in groups.items():
+        sections[group] = _digest(items)
+
+    items = []
+    for label, bus in nw.busses.items():
+        items += [(label, repr(bus.P.val), bus.P.is_set)]
+        for cp, data in bus.comps.iterrows():
+            value = _value(data['char'])
+            items += [(label, cp.label, value)]
+            chars += [(label, cp.label, value)]
+    sections['busses'] = _digest(items)
+
+    sections['characteristics'] = _digest(chars)
+
+    return sections
+
+
+class LazyReport():
+    r"""Collect documentation requests and render them on demand.
+
+    Parameters
+    ----------
+    path : str
+        Report directory, same as for :code:`document_model`.
+    """
+
+    def __init__(self, path='report'):
+        self.path = path
+        self.snapshot_path = os.path.join(path, 'snapshots')
+        self.figure_path = os.path.join(path, 'figures')
+        self.manifest_file = os.path.join(path, 'manifest.json')
+        self.pending = {}
+
+        if os.path.isfile(self.manifest_file):
+            with open(self.manifest_file) as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {}
+
+    def document(self, nw, filename='report.tex'):
+        """Record the state of the solved network for the report filename."""
+        sections = fingerprint(nw)
+        snapshot = os.path.join(
+            self.snapshot_path, os.path.splitext(filename)[0])
+        nw.save(snapshot)
+        state = (snapshot, nw.mode, getattr(nw, 'design_path', None))
+        self.pending[filename] = (state, sections)
+
+    def changed_sections(self, filename):
+        """Return the names of the sections changed since the last render."""
+        if filename not in self.pending:
+            return []
+        sections = self.pending[filename][1]
+        rendered = self.manifest.get(filename, {}).get('sections', {})
+        return [s for s, digest in sections.items()
+                if rendered.get(s) != digest]
+
+    def _figure_times(self):
+        """Return the modification time of every file in the figure path."""
+        if not os.path.isdir(self.figure_path):
+            return {}
+        return {
+            f: os.stat(os.path.join(self.figure_path, f)).st_mtime_ns
+            for f in os.listdir(self.figure_path)}
+
+    def render(self):
+        """Render all pending reports that changed since the last render."""
+        for filename, (state, sections) in self.pending.items():
+            changed = self.changed_sections(filename)
+            tex = os.path.join(self.path, filename)
+
+            if not changed and os.path.isfile(tex):
+                logging.info('Report %s is up to date.', filename)
+                continue
+
+            logging.info(
+                'Rendering report %s, changed sections: %s.',
+                filename, ', '.join(changed))
+
+            # a loaded network has neither results nor specifications, the
+            # snapshot holds the solution, so the solve converges at once
+            snapshot, mode, design_path = state
+            nw = load_network(snapshot)
+            nw.set_attr(iterinfo=False)
+            nw.solve(mode, design_path=design_path)
+
+            figures = self.manifest.get(filename, {}).get('figures', [])
+            reuse = (
+                'characteristics' not in changed and len(figures) > 0 and
+                all(os.path.isfile(os.path.join(self.figure_path, f))
+                    for f in figures))
+            if reuse:
+                for char in _characteristics(nw):
+                    char.plot = _keep_figure
+
+            before = self._figure_times()
+            document_model(nw, path=self.path, filename=filename)
+            if not reuse:
+                after = self._figure_times()
+                figures = sorted(
+                    f for f, mtime in after.items() if before.get(f) != mtime)
+
+            self.manifest[filename] = {
+                'sections': sections, 'figures': figures}
+
+        self.pending = {}
+        with open(self.manifest_file, 'w') as f:
+            json.dump(self.manifest, f, indent=4)
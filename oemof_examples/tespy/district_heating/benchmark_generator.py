@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the table based network generator on synthetic trees.
+
+For every grid size a random tree of pipe segments with consumers at the
+leaves is created. Construction, pre-processing (network check) and solve
+time are measured separately. Large grids are only constructed and checked.
+
+Required packages: tespy, numpy, pandas, scipy
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from network_generator import build_network
+from sparse_solver import sparse_newton
+
+# number of pipe segments per grid
+sizes = [10, 30, 100, 300, 1000, 3000, 10000, 30000]
+# largest grid that is solved: TESPy assembles the Jacobian as dense array
+# even with the sparse solver, at about 17 variables per segment it needs
+# (17 * n)² * 8 bytes, i.e. 0.2 GB for 300 segments and 2.3 GB for 1000
+max_solve = 300
+branching = 3
+seed = 1
+
+
+def synthetic_tree(num_segments, branching=3, seed=None):
+    """Create segment and consumer tables of a random tree.
+
+    Every node gets up to branching child segments, every leaf one consumer.
+    Diameters shrink from 0.3 m at the root to 0.04 m at the periphery.
+    """
+    rng = np.random.default_rng(seed)
+
+    parent = np.zeros(num_segments, dtype=int)
+    # node 0 is the root, segment i ends at node i + 1
+    for i in range(1, num_segments):
+        parent[i] = rng.integers(max(1, (i - 1) // branching), i + 1)
+    parent[:branching] = 0
+
+    depth = np.zeros(num_segments + 1, dtype=int)
+    for i, p in enumerate(parent):
+        depth[i + 1] = depth[p] + 1
+
+    nodes = np.array(
+        ['root'] + ['n' + str(i) for i in range(1, num_segments + 1)])
+    segments = pd.DataFrame({
+        'from': nodes[parent],
+        'to': nodes[1:],
+        'L': rng.uniform(10, 200, num_segments).round(),
+        'D': np.maximum(0.3 * 0.75 ** depth[1:], 0.04).round(3)})
+    segments.index = ['s' + str(i) for i in range(num_segments)]
+
+    leaves = np.setdiff1d(np.arange(1, num_segments + 1), parent)
+    consumers = pd.DataFrame({
+        'node': nodes[leaves],
+        'Q': -rng.uniform(5e3, 5e4, len(leaves)).round(-2)})
+    consumers.index = ['c' + str(i) for i in range(len(leaves))]
+
+    return segments, consumers
+
+
+results = pd.DataFrame(
+    columns=['consumers', 'components', 'construction', 'pre-processing',
+             'solve'])
+
+for num_segments in sizes:
+    segments, consumers = synthetic_tree(num_segments, branching, seed)
+
+    start = perf_counter()
+    nw = build_network(segments, consumers, iterinfo=False)
+    results.loc[num_segments, 'construction'] = perf_counter() - start
+
+    start = perf_counter()
+    nw.check_network()
+    results.loc[num_segments, 'pre-processing'] = perf_counter() - start
+
+    if num_segments <= max_solve:
+        start = perf_counter()
+        with sparse_newton():
+            nw.solve('design')
+        results.loc[num_segments, 'solve'] = perf_counter() - start
+
+    results.loc[num_segments, 'consumers'] = len(consumers)
+    results.loc[num_segments, 'components'] = len(nw.comps)
+
+    print(num_segments, 'segments:', results.loc[num_segments].to_dict())
+
+results.index.name = 'segments'
+print(results)
+results.to_csv('benchmark_generator.csv')
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Compare dense and sparse Newton steps for growing district heating grids.
+
+A single heating line with an increasing number of consumers is built from
+the LinConsumClosed subsystem and solved in design mode with the default
+(dense) solver and within the sparse_newton context. Only the linear solve
+of the Newton steps differs, the Jacobian is assembled as dense array in both
+cases, which limits the grid sizes to what fits into memory.
+
+Required packages: tespy, numpy, scipy, pandas
+"""
+from time import perf_counter
+
+import pandas as pd
+
+from tespy.components import Source, Sink, Pipe
+from tespy.connections import Connection, Ref
+from tespy.networks import Network
+
+from sub_consumer import LinConsumClosed as lc
+from sparse_solver import sparse_newton
+
+# number of consumers per grid
+# only the linear solve is sparse, TESPy assembles the Jacobian as dense array
+# in both cases: with about 28 variables per consumer it needs (28 * n)² * 8
+# bytes, i.e. 1.6 GB for 500 consumers and 25 GB for 2000 consumers
+sizes = [20, 50, 100, 200, 500]
+
+dT_feed = 100
+dT_return = 200
+
+
+def build_network(num_consumer):
+    """Build a heating line with num_consumer consumers."""
+    nw = Network(fluids=['water'], T_unit='C', p_unit='bar', h_unit='kJ / kg',
+                 iterinfo=False)
+
+    so = Source('source')
+    si = Sink('sink')
+    pif = Pipe('pipe_feed', ks=7e-5, L=100, D=0.5, Tamb=0)
+    pib = Pipe('pipe_back', ks=7e-5, L=100, D=0.5, Tamb=0)
+
+    sub = lc('line', num_consumer)
+
+    for i in range(num_consumer):
+        sub.comps['consumer_' + str(i)].set_attr(Q=-5e4, pr=0.99)
+        sub.conns['cova_' + str(i)].set_attr(T=52)
+
+    for i in range(num_consumer - 1):
+        j = str(i)
+        for pipe in ['feed_', 'return_']:
+            sub.comps[pipe + j].set_attr(ks=7e-5, L=20, D=0.15, Tamb=0)
+
+        dT_feed_ref = Ref(
+            sub.conns['spfe_' + j], 1,
+            -sub.comps['feed_' + j].L.val / dT_feed)
+        dT_return_ref = Ref(
+            sub.conns['cova_' + str(i + 1)], 1,
+            -sub.comps['return_' + j].L.val / dT_return)
+
+        if i == num_consumer - 2:
+            sub.conns['spco_' + str(i + 1)].set_attr(T=dT_feed_ref)
+        else:
+            sub.conns['fesp_' + str(i + 1)].set_attr(T=dT_feed_ref)
+        sub.conns['reme_' + j].set_attr(T=dT_return_ref)
+
+    so_pif = Connection(so, 'out1', pif, 'in1', T=90, p=15,
+                        fluid={'water': 1})
+    pif_sub = Connection(pif, 'out1', sub.comps['splitter_0'], 'in1',
+                         T=Ref(so_pif, 1, -pif.L.val / dT_feed))
+    sub_pib = Connection(sub.comps['merge_0'], 'out1', pib, 'in1', p=11)
+    pib_si = Connection(pib, 'out1', si, 'in1',
+                        T=Ref(sub_pib, 1, -pib.L.val / dT_return))
+
+    nw.add_conns(so_pif, pif_sub, sub_pib, pib_si)
+    nw.add_subsys(sub)
+
+    return nw
+
+
+results = pd.DataFrame(
+    columns=['variables', 'build', 'dense solve', 'sparse solve',
+             'iterations'])
+
+for num_consumer in sizes:
+    start = perf_counter()
+    nw = build_network(num_consumer)
+    results.loc[num_consumer, 'build'] = perf_counter() - start
+
+    start = perf_counter()
+    nw.solve('design')
+    results.loc[num_consumer, 'dense solve'] = perf_counter() - start
+
+    nw = build_network(num_consumer)
+    start = perf_counter()
+    with sparse_newton():
+        nw.solve('design')
+    results.loc[num_consumer, 'sparse solve'] = perf_counter() - start
+    results.loc[num_consumer, 'variables'] = nw.num_vars
+    results.loc[num_consumer, 'iterations'] = len(nw.res)
+
+    print(num_consumer, 'consumers:', results.loc[num_consumer].to_dict())
+
+results.index.name = 'consumers'
+print(results)
+results.to_csv('benchmark_sparse.csv')
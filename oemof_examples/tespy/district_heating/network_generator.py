@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""Build district heating networks from tables of pipe segments and consumers.
+
+The topology is a tree rooted at the node :code:`root`. Every segment is
+modelled by a feed and a return pipe, every node with more than one branch by
+a splitter, a merge and a valve on every return branch (like the Fork
+subsystem). Consumers are connected to their node by a HeatExchangerSimple.
+The return pressure is specified at the outlet of every merge, therefore the
+root node must have at least two branches.
+
+segments (one row per pipe segment, index: segment id)
+
+=========  ==============================================================
+column     description
+=========  ==============================================================
+from       upstream node id
+to         downstream node id
+L          length in m
+D          diameter in m
+ks         roughness in m (optional, default: 7e-5)
+p_return   pressure at the return merge of node *to* in bar (optional)
+=========  ==============================================================
+
+consumers (one row per consumer, index: consumer id)
+
+=========  ==============================================================
+column     description
+=========  ==============================================================
+node       node id the consumer is connected to
+Q          heat demand in W (negative)
+pr         pressure ratio (optional, default: 0.99)
+T_return   return temperature in °C (optional, default: 52)
+=========  ==============================================================
+
+Required packages: tespy, pandas
+"""
+from collections import deque
+
+import pandas as pd
+
+from tespy.components import (Source, Sink, Splitter, Merge, Pipe, Valve,
+                              HeatExchangerSimple)
+from tespy.connections import Connection, Ref
+from tespy.networks import Network
+
+
+def prepare_tables(segments, consumers, p_feed, p_return, root='root'):
+    """Add default values and derived columns to copies of the tables.
+
+    All parameters are calculated column-wise, the returned tables contain
+    exactly the keyword arguments for the component and connection setup.
+    """
+    segments = segments.copy()
+    consumers = consumers.copy()
+
+    segments['ks'] = segments.get('ks', 7e-5)
+    consumers['pr'] = consumers.get('pr', 0.99)
+    consumers['T_return'] = consumers.get('T_return', 52)
+
+    # depth of every node in the tree
+    depth = pd.Series({root: 0})
+    frontier = [root]
+    parent = segments.set_index('from')['to']
+    while frontier:
+        children = parent[parent.index.isin(frontier)]
+        depth = pd.concat(
+            [depth, pd.Series(depth[children.index].values + 1,
+                              index=children.values)])
+        frontier = list(children.values)
+
+    segments['depth'] = depth.reindex(segments['to']).values
+    if segments['depth'].isna().any():
+        raise ValueError('Segments not connected to "{}".'.format(root))
+
+    # merge pressures rise towards the periphery of the grid (see dhs.py)
+    if 'p_return' not in segments:
+        segments['p_return'] = (
+            p_return + 0.5 * (p_feed - p_return) *
+            segments['depth'] / segments['depth'].max())
+
+    return segments, consumers
+
+
+def build_network(segments, consumers, T_feed=90, p_feed=15, p_return=11,
+                  dT_feed=100, dT_return=200, Tamb=0, root='root', **kwargs):
+    r"""Create a TESPy network from the segment and consumer tables.
+
+    Parameters
+    ----------
+    segments, consumers : pandas.DataFrame
+        Topology and parameters of the grid (see module docstring).
+    T_feed, p_feed : float
+        Feed flow temperature (°C) and pressure (bar) at the root.
+    p_return : float
+        Return flow pressure (bar) at the root.
+    dT_feed, dT_return : float
+        Temperature difference factors of the pipes, the temperature drops by
+        L / dT in every pipe (design value).
+    Tamb : float
+        Ambient temperature of the pipes.
+
+    Other keyword arguments are passed to the Network.
+
+    Returns
+    -------
+    nw : tespy.networks.Network
+    """
+    segments, consumers = prepare_tables(
+        segments, consumers, p_feed, p_return, root)
+
+    kwargs.setdefault('fluids', ['water'])
+    kwargs.setdefault('T_unit', 'C')
+    kwargs.setdefault('p_unit', 'bar')
+    kwargs.setdefault('h_unit', 'kJ / kg')
+    nw = Network(**kwargs)
+
+    # %% components, parameters assigned from the table columns
+
+    pipe_kwargs = segments[['ks', 'L', 'D']].to_dict('records')
+    feed = [Pipe('pipe feed ' + str(s), Tamb=Tamb, offdesign=['kA_char'], **kw)
+            for s, kw in zip(segments.index, pipe_kwargs)]
+    back = [Pipe('pipe back ' + str(s), Tamb=Tamb, offdesign=['kA_char'], **kw)
+            for s, kw in zip(segments.index, pipe_kwargs)]
+
+    consumer_kwargs = consumers[['Q', 'pr']].to_dict('records')
+    cons = [HeatExchangerSimple('consumer ' + str(c), **kw)
+            for c, kw in zip(consumers.index, consumer_kwargs)]
+
+    # branch lists per node: ('segment' | 'consumer', position in table)
+    branches = {}
+    for pos, node in enumerate(segments['from']):
+        branches.setdefault(node, []).append(('segment', pos))
+    for pos, node in enumerate(consumers['node']):
+        branches.setdefault(node, []).append(('consumer', pos))
+
+    # %% connections
+
+    conns = []
+    pipe_inlet = {}
+    pipe_outlet = {}
+
+    def connect(src, dst, **attrs):
+        c = Connection(src[0], src[1], dst[0], dst[1], **attrs)
+        conns.append(c)
+        if isinstance(dst[0], Pipe):
+            pipe_inlet[dst[0]] = c
+        if isinstance(src[0], Pipe):
+            pipe_outlet[src[0]] = c
+        return c
+
+    if len(branches.get(root, [])) < 2:
+        raise ValueError(
+            'The root node "{}" must have at least two branches.'.format(root))
+
+    so = Source('source')
+    si = Sink('sink')
+
+    # (node, feed outlet, return inlet, merge pressure)
+    queue = deque([(root, (so, 'out1'), (si, 'in1'), p_return)])
+    while queue:
+        node, feed_src, return_dst, p_merge = queue.popleft()
+        node_branches = branches.get(node, [])
+        num = len(node_branches)
+
+        if num > 1:
+            sp = Splitter('splitter ' + str(node), num_out=num)
+            me = Merge('merge ' + str(node), num_in=num)
+            if node == root:
+                connect(feed_src, (sp, 'in1'),
+                        T=T_feed, p=p_feed, fluid={'water': 1})
+            else:
+                connect(feed_src, (sp, 'in1'))
+            connect((me, 'out1'), return_dst, p=p_merge)
+
+        for i, (kind, pos) in enumerate(node_branches):
+            if num > 1:
+                src = (sp, 'out' + str(i + 1))
+                va = Valve('valve ' + str(node) + ' ' + str(i))
+                connect((va, 'out1'), (me, 'in' + str(i + 1)))
+                dst = (va, 'in1')
+            else:
+                src, dst = feed_src, return_dst
+
+            if kind == 'consumer':
+                connect(src, (cons[pos], 'in1'))
+                connect((cons[pos], 'out1'), dst,
+                        T=consumers['T_return'].iat[pos])
+            else:
+                connect(src, (feed[pos], 'in1'))
+                connect((back[pos], 'out1'), dst)
+                queue.append((
+                    segments['to'].iat[pos], (feed[pos], 'out1'),
+                    (back[pos], 'in1'), segments['p_return'].iat[pos]))
+
+    nw.add_conns(*conns)
+
+    # %% temperature drop over the pipes (design values)
+
+    for pipes, dT in [(feed, dT_feed), (back, dT_return)]:
+        factors = -segments['L'].values / dT
+        for pipe, factor in zip(pipes, factors):
+            pipe_outlet[pipe].set_attr(
+                T=Ref(pipe_inlet[pipe], 1, factor), design=['T'])
+
+    return nw
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Sparse linear solver for the Newton steps of large TESPy networks.
+
+The Jacobian of a district heating network is extremely sparse: every
+component only couples the variables of its own inlet and outlet connections.
+TESPy solves each Newton step via :code:`np.linalg.inv(jacobian)`, which scales
+with the cube of the number of variables. Inside the :func:`sparse_newton`
+context the inversion is replaced by a sparse LU factorisation (SuperLU) of
+the same matrix, the rest of the algorithm stays untouched.
+
+Only the linear solve is sparse: TESPy still assembles the Jacobian as dense
+array of (number of variables)² floats, and converting it to a sparse matrix
+visits every entry as well. Memory and assembly time therefore still grow
+quadratically with the size of the network, which limits this approach to
+networks whose dense Jacobian fits into memory.
+
+Usage
+-----
+>>> with sparse_newton():  # doctest: +SKIP
+...     nw.solve('design')
+
+Required packages: tespy (0.4.x), numpy, scipy
+"""
+from contextlib import contextmanager
+
+import numpy as np
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import splu
+
+from tespy.networks import network as tespy_network
+
+
+class SparseInverse():
+    """Lazy inverse of a sparse matrix, only supports :code:`dot`."""
+
+    def __init__(self, matrix):
+        try:
+            self.lu = splu(csc_matrix(matrix))
+        except RuntimeError as e:
+            # tespy expects a LinAlgError for linear dependent equations
+            raise np.linalg.LinAlgError(str(e))
+
+    def dot(self, vector):
+        return self.lu.solve(np.asarray(vector, dtype=float))
+
+
+def sparse_inv(matrix):
+    return SparseInverse(matrix)
+
+
+class _Delegate():
+    """Forward all attributes to a module except the overridden ones."""
+
+    def __init__(self, module, **overrides):
+        self._module = module
+        self.__dict__.update(overrides)
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
+def _numpy_proxy():
+    """Return a stand-in for numpy with a sparse :code:`linalg.inv`."""
+    return _Delegate(np, linalg=_Delegate(np.linalg, inv=sparse_inv))
+
+
+@contextmanager
+def sparse_newton():
+    """Solve the Newton steps of all networks with a sparse LU factorisation.
+
+    Note
+    ----
+    The Jacobian is still assembled as dense array by TESPy, only the
+    factorisation is sparse. Memory therefore still grows quadratically with
+    the number of variables.
+
+    The numpy module used by :code:`tespy.networks.network` is replaced for
+    the duration of the context, the context must therefore neither be
+    nested nor be used by several threads at the same time.
+    """
+    original = getattr(tespy_network, 'np', None)
+    if original is not np:
+        raise RuntimeError(
+            'tespy.networks.network does not use numpy as np, the sparse '
+            'solver does not support this version of TESPy.')
+    tespy_network.np = _numpy_proxy()
+    try:
+        yield
+    finally:
+        tespy_network.np = original
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""Surrogate-assisted optimisation of expensive TESPy model evaluations.
+
+Every call of the objective runs a full network solve. The optimiser fits a
+radial basis function (RBF) model of the objective on all feasible points
+evaluated so far and a second RBF model of the feasibility indicator
+(+1 feasible, -1 infeasible). Random candidates are pre-screened with both
+models and only the most promising ones are handed to the network solver.
+
+Required packages: numpy, scipy (>= 1.7)
+"""
+import logging
+
+import numpy as np
+from scipy.interpolate import RBFInterpolator
+from scipy.stats import qmc
+
+
+class SurrogateOptimizer():
+    """Maximise an expensive objective within box bounds.
+
+    Parameters
+    ----------
+    func : callable
+        Expensive objective, returns a float or :code:`np.nan` for infeasible
+        points.
+    bounds : tuple
+        Lower and upper bounds of the decision variables,
+        e.g. :code:`([1, 1], [40, 40])` (same format as pygmo).
+    constraint : callable
+        Cheap inequality constraint :code:`g(x) <= 0`, checked before any
+        surrogate prediction.
+    n_initial : int
+        Number of space filling (latin hypercube) samples evaluated with the
+        expensive function before the first surrogate fit.
+    max_evaluations : int
+        Total budget of expensive function evaluations.
+    n_candidates : int
+        Number of random candidates screened by the surrogates per iteration.
+    n_per_iteration : int
+        Number of candidates passed to the expensive function per iteration.
+    feasibility_threshold : float
+        Candidates with a predicted feasibility indicator below this value are
+        discarded without solving.
+    exploration : float
+        Weight of the distance to the nearest evaluated point in the
+        candidate score (0: pure exploitation).
+    seed : int
+        Seed of the random number generator.
+    """
+
+    def __init__(self, func, bounds, constraint=None, n_initial=20,
+                 max_evaluations=100, n_candidates=2000, n_per_iteration=4,
+                 feasibility_threshold=0, exploration=0.1, seed=None):
+
+        self.func = func
+        self.lower = np.asarray(bounds[0], dtype=float)
+        self.upper = np.asarray(bounds[1], dtype=float)
+        self.constraint = constraint
+        self.n_initial = n_initial
+        self.max_evaluations = max_evaluations
+        self.n_candidates = n_candidates
+        self.n_per_iteration = n_per_iteration
+        self.feasibility_threshold = feasibility_threshold
+        self.exploration = exploration
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.empty((0, len(self.lower)))
+        self.y = np.empty(0)
+        self.skipped = 0
+
+    @property
+    def feasible(self):
+        return ~np.isnan(self.y)
+
+    @property
+    def evaluations(self):
+        return len(self.y)
+
+    @property
+    def champion_x(self):
+        return self.x[self.feasible][np.argmax(self.y[self.feasible])]
+
+    @property
+    def champion_f(self):
+        return np.max(self.y[self.feasible])
+
+    def scale(self, x):
+        return (x - self.lower) / (self.upper - self.lower)
+
+    def satisfies_constraint(self, x):
+        if self.constraint is None:
+            return np.ones(len(x), dtype=bool)
+        return np.array([self.constraint(xi) <= 0 for xi in x])
+
+    def sample(self, n):
+        """Draw n random points satisfying the cheap constraint."""
+        points = np.empty((0, len(self.lower)))
+        while len(points) < n:
+            x = self.rng.uniform(self.lower, self.upper,
+                                 size=(2 * n, len(self.lower)))
+            points = np.vstack([points, x[self.satisfies_constraint(x)]])
+        return points[:n]
+
+    def initial_design(self):
+        sampler = qmc.LatinHypercube(d=len(self.lower), seed=self.rng)
+        x = qmc.scale(sampler.random(4 * self.n_initial),
+                      self.lower, self.upper)
+        x = x[self.satisfies_constraint(x)][:self.n_initial]
+        if len(x) < self.n_initial:
+            x = np.vstack([x, self.sample(self.n_initial - len(x))])
+        return x
+
+    def evaluate(self, x):
+        for xi in x:
+            if self.evaluations >= self.max_evaluations:
+                break
+            self.x = np.vstack([self.x, xi])
+            self.y = np.append(self.y, self.func(xi))
+
+    def fit(self):
+        """Fit the objective and the feasibility surrogates."""
+        xs = self.scale(self.x)
+        label = np.where(self.feasible, 1.0, -1.0)
+        classifier = RBFInterpolator(
+            xs, label, kernel='thin_plate_spline', smoothing=1e-3)
+
+        if self.feasible.sum() > len(self.lower) + 1:
+            regressor = RBFInterpolator(
+                xs[self.feasible], self.y[self.feasible],
+                kernel='thin_plate_spline', smoothing=1e-6)
+        else:
+            regressor = None
+
+        return classifier, regressor
+
+    def propose(self):
+        """Return the most promising candidates for expensive evaluation."""
+        classifier, regressor = self.fit()
+        candidates = self.sample(self.n_candidates)
+        cs = self.scale(candidates)
+
+        keep = classifier(cs) >= self.feasibility_threshold
+        self.skipped += len(candidates) - keep.sum()
+        if not keep.any():
+            # surrogate claims everything infeasible: explore
+            return candidates[:self.n_per_iteration]
+        candidates, cs = candidates[keep], cs[keep]
+
+        # distance to nearest evaluated point, normalised to [0, 1]
+        distance = np.min(np.linalg.norm(
+            cs[:, None, :] - self.scale(self.x)[None, :, :], axis=2), axis=1)
+        distance = distance / (distance.max() or 1)
+
+        if regressor is None:
+            score = distance
+        else:
+            prediction = regressor(cs)
+            spread = np.ptp(self.y[self.feasible]) or 1
+            score = ((prediction - self.champion_f) / spread +
+                     self.exploration * distance)
+
+        # never re-evaluate (almost) identical points
+        score[distance < 1e-6] = -np.inf
+
+        return candidates[np.argsort(score)[::-1][:self.n_per_iteration]]
+
+    def run(self):
+        """Evaluate the initial design and iterate until the budget is spent.
+
+        Returns
+        -------
+        champion_x : numpy.ndarray
+            Best evaluated decision vector.
+        """
+        self.evaluate(self.initial_design())
+        iteration = 0
+
+        while self.evaluations < self.max_evaluations:
+            if self.feasible.sum() == 0:
+                self.evaluate(self.sample(self.n_per_iteration))
+            else:
+                self.evaluate(self.propose())
+
+            iteration += 1
+            logging.info(
+                'Surrogate iteration %s: %s evaluations, champion %s.',
+                iteration, self.evaluations,
+                self.champion_f if self.feasible.any() else np.nan)
+
+        return self.champion_x
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Optimise the extraction pressures with a surrogate-assisted loop.
+
+Same problem as in thermal_efficiency_optimization.py, but instead of
+evolving a population with pygmo only candidates that the surrogate models
+predict to be feasible and promising are solved with TESPy.
+
+Required packages: tespy, numpy, scipy, matplotlib
+"""
+from tespy.tools import logger
+import logging
+
+import matplotlib.pyplot as plt
+
+from power_plant import PowerPlant
+from surrogate import SurrogateOptimizer
+
+logger.define_logging(screen_level=logging.ERROR)
+
+model = PowerPlant()
+
+optimizer = SurrogateOptimizer(
+    model.calculate_efficiency,
+    bounds=([1, 1], [40, 40]),
+    # extraction 2 must be at lower pressure than extraction 1
+    constraint=lambda x: -x[0] + x[1],
+    n_initial=20,
+    max_evaluations=80,
+    n_candidates=2000,
+    n_per_iteration=4,
+    seed=42)
+
+optimizer.run()
+
+print()
+print('Network solves: {}'.format(optimizer.evaluations))
+print('Infeasible solves: {}'.format((~optimizer.feasible).sum()))
+print('Candidates rejected by surrogate: {}'.format(optimizer.skipped))
+print('Efficiency: {} %'.format(round(100 * optimizer.champion_f, 4)))
+print('Extraction 1: {} bar'.format(round(optimizer.champion_x[0], 4)))
+print('Extraction 2: {} bar'.format(round(optimizer.champion_x[1], 4)))
+
+# scatter plot
+feasible = optimizer.feasible
+cm = plt.cm.get_cmap('RdYlBu')
+sc = plt.scatter(optimizer.x[feasible, 1], optimizer.x[feasible, 0],
+                 linewidth=0.25, c=100 * optimizer.y[feasible], cmap=cm,
+                 alpha=0.5, edgecolors='black')
+plt.scatter(optimizer.x[~feasible, 1], optimizer.x[~feasible, 0],
+            marker='.', c='grey', label='infeasible')
+plt.scatter(optimizer.champion_x[1], optimizer.champion_x[0], marker='x',
+            linewidth=1, c='red')
+plt.ylabel('$p_{extraction, 1}$ in bar')
+plt.xlabel('$p_{extraction, 2}$ in bar')
+plt.colorbar(sc, label='Cycle efficiency (%)')
+plt.legend()
+plt.savefig("scatterplot_surrogate.svg")
+plt.show()
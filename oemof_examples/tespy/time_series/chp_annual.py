@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Annual simulation of the backpressure CHP plant (see chp.py).
+
+Load and district heating feed flow temperature follow the ambient
+temperature of a synthetic year. The quantised states (1 % load, 1 K feed
+temperature) repeat often, so only a fraction of the 8760 hours is solved.
+The network is created by chp.py of the clausius_rankine_chp example.
+
+Required packages: tespy, numpy, pandas, matplotlib
+"""
+import os
+import sys
+
+import pandas as pd
+import numpy as np
+
+from simulation import TimeSeriesSimulation
+
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'clausius_rankine_chp'))
+
+from chp import create_network  # noqa: E402
+
+# %% network
+
+nw, fs_in, cw_out, power_bus, heat_bus = create_network()
+
+
+# %% solving
+
+path = 'chp'
+nw.solve('design')
+nw.save(path)
+
+power_bus.set_attr(P=None)
+m_design = fs_in.m.val
+fs_in.set_attr(m=m_design)
+
+# %% boundary conditions: synthetic ambient temperature
+
+index = pd.date_range('1/1/2019', periods=8760, freq='H')
+hour = np.arange(len(index))
+rng = np.random.default_rng(1)
+
+T_amb = (
+    10 - 10 * np.cos(2 * np.pi * (hour - 24 * 20) / 8760) -
+    4 * np.cos(2 * np.pi * (hour - 15) / 24) +
+    rng.normal(0, 1.5, len(index)))
+
+# heating curve and load within the range of the P-Q diagram in chp.py
+boundary_conditions = pd.DataFrame({
+    'load': np.interp(T_amb, [-15, 15], [1.05, 0.6]),
+    'T_feed': np.interp(T_amb, [-15, 15], [120, 70])}, index=index)
+
+# %% time series simulation
+
+simulation = TimeSeriesSimulation(
+    nw, design_path=path,
+    inputs={
+        'load': lambda m: fs_in.set_attr(m=m * m_design),
+        'T_feed': lambda T: cw_out.set_attr(T=T)},
+    outputs={
+        'P': lambda: -power_bus.P.val,
+        'Q': lambda: heat_bus.P.val},
+    resolution={'load': 0.01, 'T_feed': 1})
+
+results = simulation.run(boundary_conditions)
+
+print('network solves:', (~results['cached']).sum(), 'of', len(results))
+print('electricity in MWh:', results['P'].sum() / 1e6)
+print('heat in MWh:', results['Q'].sum() / 1e6)
+
+results.join(boundary_conditions).to_csv('chp_annual.csv')
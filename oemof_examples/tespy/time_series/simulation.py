@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Time series driver for offdesign simulations of TESPy networks.
+
+Every timestep is solved in offdesign mode starting from the solution of the
+previous timestep (TESPy keeps the last solution as starting values). The
+boundary conditions are quantised to a configurable resolution and results
+are memoised on the quantised values: states that occur repeatedly, e.g.
+night-time lows at the same load, are only solved once.
+
+Required packages: tespy, numpy, pandas
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+
+class TimeSeriesSimulation():
+    r"""Solve a network for every row of a DataFrame of boundary conditions.
+
+    Parameters
+    ----------
+    nw : tespy.networks.Network
+        Network, solved and saved in design mode.
+    design_path : str
+        Path to the saved design case.
+    inputs : dict
+        Column name of the boundary conditions mapped to a function setting
+        the value in the network, e.g.
+        :code:`{'T_amb': lambda T: amb_fan.set_attr(T=T)}`.
+    outputs : dict
+        Name of a result column mapped to a function returning the value
+        after a successful solve, e.g. :code:`{'Q': lambda: cd.Q.val}`.
+    resolution : dict
+        Quantisation step per input column, e.g. :code:`{'T_amb': 0.5}`.
+        Columns missing are not quantised (memoisation then only applies to
+        identical values).
+    init_path : str
+        Path to the saved network used as starting values if the warm start
+        from the previous timestep fails, default: design_path.
+    """
+
+    def __init__(self, nw, design_path, inputs, outputs, resolution=None,
+                 init_path=None):
+        self.nw = nw
+        self.design_path = design_path
+        self.inputs = inputs
+        self.outputs = outputs
+        self.resolution = resolution or {}
+        self.init_path = init_path or design_path
+        self.memo = {}
+
+    def quantise(self, df):
+        """Round the boundary conditions to the configured resolution."""
+        df = df[list(self.inputs)].astype(float)
+        for col, step in self.resolution.items():
+            df[col] = (df[col] / step).round() * step
+        return df
+
+    def converged(self):
+        return not self.nw.lin_dep and self.nw.res[-1] < 1e-3
+
+    def solve(self, state):
+        for col, value in zip(self.inputs, state):
+            self.inputs[col](value)
+
+        self.nw.solve('offdesign', design_path=self.design_path)
+        if not self.converged():
+            # warm start failed: restart from the stored initialisation
+            logging.warning(
+                'Warm start failed for %s, restarting from %s.',
+                state, self.init_path)
+            self.nw.solve('offdesign', init_path=self.init_path,
+                          design_path=self.design_path)
+
+        if self.converged():
+            return tuple(func() for func in self.outputs.values())
+        else:
+            return (np.nan,) * len(self.outputs)
+
+    def run(self, boundary_conditions):
+        """Simulate all timesteps.
+
+        Parameters
+        ----------
+        boundary_conditions : pandas.DataFrame
+            One row per timestep, one column per key of :code:`inputs`.
+
+        Returns
+        -------
+        results : pandas.DataFrame
+            Result columns, same index as the boundary conditions. The column
+            :code:`cached` marks timesteps taken from the memo.
+        """
+        states = self.quantise(boundary_conditions)
+        values = []
+        cached = []
+
+        for state in states.itertuples(index=False, name=None):
+            if state in self.memo:
+                cached += [True]
+            else:
+                self.memo[state] = self.solve(state)
+                cached += [False]
+            values += [self.memo[state]]
+
+        results = pd.DataFrame(values, index=boundary_conditions.index,
+                               columns=list(self.outputs))
+        results['cached'] = cached
+
+        logging.info(
+            '%s timesteps simulated with %s network solves.',
+            len(results), len(results) - sum(cached))
+
+        return results
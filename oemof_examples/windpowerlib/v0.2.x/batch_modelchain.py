@@ -0,0 +1,263 @@
+"""
+The ``batch_modelchain`` module shows how to calculate the power output of
+many wind turbines that share one weather data set.
+
+Running one :class:`~.modelchain.ModelChain` per turbine repeats the
+calculation of the wind speed, temperature and density at hub height for
+every turbine. The :class:`BatchModelChain` calculates these quantities once
+per distinct hub height and evaluates the power curves of all turbines of the
+same type in one NumPy call. The result is an array with one row per time step
+and one column per turbine.
+
+Go down to the "run_example()" function to start the example.
+
+SPDX-FileCopyrightText: 2019 oemof developer group <contact@oemof.org>
+SPDX-License-Identifier: MIT
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+from windpowerlib import ModelChain
+from windpowerlib import power_output
+
+import power_curve_tables as pct
+
+
+class BatchModelChain(object):
+    r"""
+    Model chain for a batch of wind turbines sharing one weather data set.
+
+    Parameters
+    ----------
+    wind_turbines : list(:class:`~.wind_turbine.WindTurbine`)
+        Wind turbines to calculate the power output for.
+
+    lookup_table_step : float, optional
+        If given, power curves are evaluated with shared lookup tables on a
+        uniform wind speed grid with this step in m/s and the density
+        correction is applied to all turbines and time steps at once (see
+        power_curve_tables.py). Default: None (exact interpolation).
+
+    Other Parameters
+    ----------------
+    All parameters of :class:`~.modelchain.ModelChain` apart from
+    `power_output_model`, which has to be 'power_curve'.
+
+    Attributes
+    ----------
+    hub_heights : numpy.array
+        Distinct hub heights of the batch.
+    power_output : numpy.array
+        Power output in W with shape (time steps, wind turbines).
+
+    """
+
+    def __init__(
+        self,
+        wind_turbines,
+        wind_speed_model="logarithmic",
+        temperature_model="linear_gradient",
+        density_model="barometric",
+        power_output_model="power_curve",
+        density_correction=False,
+        obstacle_height=0,
+        hellman_exp=None,
+        lookup_table_step=None,
+    ):
+        if power_output_model != "power_curve":
+            raise ValueError(
+                "'{0}' is an invalid value. `power_output_model` must be "
+                "'power_curve' for a BatchModelChain.".format(
+                    power_output_model
+                )
+            )
+
+        self.wind_turbines = list(wind_turbines)
+        self.modelchain_data = {
+            "wind_speed_model": wind_speed_model,
+            "temperature_model": temperature_model,
+            "density_model": density_model,
+            "power_output_model": power_output_model,
+            "density_correction": density_correction,
+            "obstacle_height": obstacle_height,
+            "hellman_exp": hellman_exp,
+        }
+        self.density_correction = density_correction
+        self.lookup_table_step = lookup_table_step
+
+        heights = np.array([t.hub_height for t in self.wind_turbines])
+        self.hub_heights, self.height_index = np.unique(
+            heights, return_inverse=True
+        )
+
+        keys = [pct.power_curve_key(t) for t in self.wind_turbines]
+        self.curve_groups = {}
+        for position, key in enumerate(keys):
+            self.curve_groups.setdefault(key, []).append(position)
+
+        self.power_output = None
+        self.index = None
+
+    def hub_height_quantities(self, weather_df):
+        r"""
+        Calculates wind speed and density once for every distinct hub height.
+
+        The calculation is delegated to the :class:`~.modelchain.ModelChain`
+        of one representative turbine per hub height, so the results are
+        identical to separate model chain runs.
+
+        Returns
+        -------
+        tuple(numpy.array, numpy.array or None)
+            Wind speed in m/s and density in kg/m³ with shape
+            (time steps, distinct hub heights). Density is None if no density
+            correction is applied.
+
+        """
+        wind_speed = np.empty((len(weather_df), len(self.hub_heights)))
+        density = (
+            np.empty_like(wind_speed) if self.density_correction else None
+        )
+
+        for h in range(len(self.hub_heights)):
+            turbine = self.wind_turbines[np.argmax(self.height_index == h)]
+            mc = ModelChain(turbine, **self.modelchain_data)
+            wind_speed[:, h] = mc.wind_speed_hub(weather_df)
+            if self.density_correction:
+                density[:, h] = mc.density_hub(weather_df)
+
+        return wind_speed, density
+
+    def run_model(self, weather_df):
+        r"""
+        Runs the model for all wind turbines.
+
+        Parameters
+        ----------
+        weather_df : :pandas:`pandas.DataFrame<frame>`
+            Weather data in the format of the
+            :class:`~.modelchain.ModelChain`.
+
+        Returns
+        -------
+        :class:`BatchModelChain`
+
+        """
+        wind_speed, density = self.hub_height_quantities(weather_df)
+
+        # hub height quantities of every turbine (time steps x turbines)
+        wind_speed = wind_speed[:, self.height_index]
+        if density is not None:
+            density = density[:, self.height_index]
+
+        if self.lookup_table_step is not None:
+            self.power_output = self.lookup_power_output(wind_speed, density)
+            self.index = weather_df.index
+            return self
+
+        self.power_output = np.empty_like(wind_speed)
+        for positions in self.curve_groups.values():
+            curve = self.wind_turbines[positions[0]].power_curve
+            if self.density_correction:
+                for position in positions:
+                    self.power_output[:, position] = (
+                        power_output.power_curve_density_correction(
+                            wind_speed[:, position],
+                            curve["wind_speed"],
+                            curve["value"],
+                            density[:, position],
+                        )
+                    )
+            else:
+                self.power_output[:, positions] = np.interp(
+                    wind_speed[:, positions],
+                    curve["wind_speed"],
+                    curve["value"],
+                    left=0,
+                    right=0,
+                )
+
+        self.index = weather_df.index
+        logging.debug(
+            "Calculated %s turbines with %s hub heights and %s power curves.",
+            len(self.wind_turbines),
+            len(self.hub_heights),
+            len(self.curve_groups),
+        )
+        return self
+
+    def lookup_power_output(self, wind_speed, density):
+        r"""
+        Evaluates all power curves with the shared lookup tables.
+
+        """
+        groups = list(self.curve_groups.values())
+        step = self.lookup_table_step
+        tables = [
+            pct.get_table(self.wind_turbines[positions[0]], step)
+            for positions in groups
+        ]
+        rows = np.empty(len(self.wind_turbines), dtype=int)
+        for row, positions in enumerate(groups):
+            rows[positions] = row
+
+        if self.density_correction:
+            wind_speed = pct.standard_density_wind_speed(wind_speed, density)
+
+        return pct.lookup(
+            pct.stack_tables(tables),
+            rows,
+            wind_speed,
+            step,
+            np.array([table.v_max for table in tables]),
+        )
+
+    def power_output_frame(self, labels=None):
+        r"""
+        Returns the power output as DataFrame with one column per turbine.
+
+        """
+        return pd.DataFrame(
+            self.power_output, index=self.index, columns=labels
+        )
+
+
+def run_example():
+    r"""
+    Compares the batch model chain to separate ModelChain runs.
+
+    """
+    import modelchain_example as mc_e
+
+    weather = mc_e.get_weather_data("weather.csv")
+    my_turbine, e126, my_turbine2 = mc_e.initialize_wind_turbines()
+
+    # a portfolio of many turbines with few distinct types and hub heights
+    turbines = [my_turbine, e126, my_turbine2] * 100
+
+    batch = BatchModelChain(turbines).run_model(weather)
+    power = batch.power_output_frame()
+
+    # lookup tables with vectorized density correction (see 'e126' in
+    # modelchain_example.py)
+    batch_lookup = BatchModelChain(
+        turbines,
+        density_model="ideal_gas",
+        density_correction=True,
+        lookup_table_step=0.01,
+    ).run_model(weather)
+    print(batch_lookup.power_output_frame().sum(axis=1))
+
+    single = ModelChain(e126).run_model(weather).power_output
+    print(
+        "Maximum deviation from ModelChain (E-126): {} W".format(
+            (power[1] - single.values).abs().max()
+        )
+    )
+    print("Total power output of the portfolio in W:")
+    print(power.sum(axis=1))
+
+
+if __name__ == "__main__":
+    run_example()
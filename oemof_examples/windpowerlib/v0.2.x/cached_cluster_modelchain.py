@@ -0,0 +1,196 @@
+"""
+The ``cached_cluster_modelchain`` module shows how to reuse the aggregated
+power curves of wind farms and wind turbine clusters.
+
+The :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain` aggregates
+(and optionally smoothes) the power curves of all turbines of a farm or
+cluster on every call of `run_model`. The
+:class:`CachedTurbineClusterModelChain` stores the aggregated power curve on
+the farm or cluster object instead. The cache key consists of the turbine
+fleet, the wind farm efficiency and the smoothing settings, so the cached
+curve is only replaced if one of them changes. Use
+:py:func:`precompute_power_curve` to fill the cache explicitly.
+
+Go down to the "run_example()" function to start the example.
+
+SPDX-FileCopyrightText: 2019 oemof developer group <contact@oemof.org>
+SPDX-License-Identifier: MIT
+"""
+import hashlib
+import logging
+
+import pandas as pd
+from windpowerlib import TurbineClusterModelChain
+
+from power_curve_tables import power_curve_key
+
+
+def _efficiency_key(efficiency):
+    if isinstance(efficiency, pd.DataFrame):
+        return hashlib.sha1(
+            pd.util.hash_pandas_object(efficiency).values.tobytes()
+        ).hexdigest()
+    return efficiency
+
+
+def fleet_key(power_plant):
+    r"""
+    Returns a hashable key of the turbine fleet and efficiency of a wind
+    farm or of all wind farms of a wind turbine cluster.
+
+    """
+    if hasattr(power_plant, "wind_farms"):
+        return tuple(fleet_key(farm) for farm in power_plant.wind_farms)
+
+    fleet = tuple(
+        (
+            power_curve_key(row.wind_turbine),
+            repr(row.wind_turbine.hub_height),
+            repr(row.wind_turbine.nominal_power),
+            repr(row.number_of_turbines),
+        )
+        for row in power_plant.wind_turbine_fleet.itertuples()
+    )
+    return fleet, _efficiency_key(power_plant.efficiency)
+
+
+class CachedTurbineClusterModelChain(TurbineClusterModelChain):
+    r"""
+    TurbineClusterModelChain that caches the aggregated power curve on the
+    wind farm or wind turbine cluster.
+
+    Takes the same parameters as the
+    :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain`.
+
+    """
+
+    def power_curve_key(self, weather_df):
+        r"""
+        Returns the cache key of the aggregated power curve.
+
+        The mean roughness length and turbulence intensity of the weather
+        data only enter the key if they are used for smoothing.
+
+        """
+        settings = (
+            self.wake_losses_model
+            if self.wake_losses_model in ("wind_farm_efficiency", None)
+            else None,
+            self.smoothing,
+        )
+        if self.smoothing:
+            settings += (
+                self.block_width,
+                self.standard_deviation_method,
+                self.smoothing_order,
+            )
+            if self.standard_deviation_method == "turbulence_intensity":
+                variables = weather_df.columns.get_level_values(0)
+                for name in ("turbulence_intensity", "roughness_length"):
+                    if name in variables:
+                        settings += (
+                            name,
+                            round(float(weather_df[name].values.mean()), 6),
+                        )
+        return fleet_key(self.power_plant), settings
+
+    def assign_power_curve(self, weather_df):
+        r"""
+        Assigns the cached power curve or calculates and caches it.
+
+        """
+        key = self.power_curve_key(weather_df)
+        cache = self.power_plant.__dict__.setdefault(
+            "_power_curve_cache", {}
+        )
+        if key in cache:
+            logging.debug(
+                "Use cached power curve of %s.", self.power_plant.name
+            )
+            self.power_plant.power_curve = cache[key]
+            return self
+
+        super(CachedTurbineClusterModelChain, self).assign_power_curve(
+            weather_df
+        )
+        cache[key] = self.power_plant.power_curve
+        return self
+
+
+def precompute_power_curve(power_plant, weather_df=None, **modelchain_data):
+    r"""
+    Calculates and caches the aggregated power curve of a farm or cluster.
+
+    Parameters
+    ----------
+    power_plant : :class:`~.wind_farm.WindFarm` or \
+            :class:`~.wind_turbine_cluster.WindTurbineCluster`
+    weather_df : :pandas:`pandas.DataFrame<frame>`, optional
+        Only needed for smoothing with the 'turbulence_intensity' method.
+
+    Other Parameters
+    ----------------
+    Parameters of the
+    :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain`.
+
+    """
+    if weather_df is None:
+        weather_df = pd.DataFrame(
+            columns=pd.MultiIndex.from_tuples(
+                [], names=["variable_name", "height"]
+            )
+        )
+    CachedTurbineClusterModelChain(
+        power_plant, **modelchain_data
+    ).assign_power_curve(weather_df)
+
+
+def clear_power_curve_cache(power_plant):
+    r"""
+    Removes all cached power curves of a farm or cluster.
+
+    """
+    power_plant.__dict__.pop("_power_curve_cache", None)
+
+
+def run_example():
+    r"""
+    Runs the farms of the turbine cluster example against several weather
+    years, the power curves are aggregated only once.
+
+    """
+    import modelchain_example as mc_e
+    from windpowerlib import WindFarm
+
+    logging.getLogger().setLevel(logging.DEBUG)
+
+    weather = mc_e.get_weather_data("weather.csv")
+    my_turbine, e126, dummy_turbine = mc_e.initialize_wind_turbines()
+    example_farm_2 = WindFarm(
+        name="example_farm_2",
+        wind_turbine_fleet=[
+            my_turbine.to_group(6),
+            e126.to_group(total_capacity=12.6e6),
+        ],
+        efficiency=0.9,
+    )
+
+    modelchain_data = {
+        "wake_losses_model": "wind_farm_efficiency",
+        "smoothing": True,
+        "standard_deviation_method": "Staffell_Pfenninger",
+    }
+    precompute_power_curve(example_farm_2, **modelchain_data)
+
+    # the example weather data stands in for several weather years
+    for year in range(3):
+        power_output = (
+            CachedTurbineClusterModelChain(example_farm_2, **modelchain_data)
+            .run_model(weather)
+            .power_output
+        )
+        print(year, power_output.sum())
+
+
+if __name__ == "__main__":
+    run_example()
@@ -0,0 +1,114 @@
+"""
+The ``import_benchmark`` module measures the start-up time of the example
+modules.
+
+Every module is imported in a fresh interpreter several times. The benchmark
+reports the median import time and checks that `matplotlib`, which is only
+needed for the plots, is not imported before it is used.
+
+`requests` is not checked: the examples import it only to download the
+weather data, but the windpowerlib imports it at module level
+(``windpowerlib/data.py``), so it is loaded by every module that imports the
+windpowerlib.
+
+Run it from this directory:
+
+   python import_benchmark.py
+
+For a detailed break-down of a single module use the import profiler of the
+interpreter, e.g.
+
+   python -X importtime -c "import modelchain_example"
+
+SPDX-FileCopyrightText: 2019 oemof developer group <contact@oemof.org>
+SPDX-License-Identifier: MIT
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "weather_cache",
+    "power_curve_tables",
+    "modelchain_example",
+    "turbine_cluster_modelchain_example",
+    "batch_modelchain",
+    "cached_cluster_modelchain",
+    "streaming_cluster_modelchain",
+    "parallel_fleet",
+    "turbine_library",
+    "modelchain_benchmark",
+    "incremental_feedin",
+]
+
+OPTIONAL_DEPENDENCIES = ["matplotlib"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+duration = time.perf_counter() - start
+print(json.dumps({{
+    "duration": duration,
+    "loaded": [m for m in {optional!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_import(module, repeat=5):
+    r"""
+    Measures the import time of a module in fresh interpreters.
+
+    Parameters
+    ----------
+    module : str
+        Name of the module.
+    repeat : int
+        Number of interpreters started. Default: 5.
+
+    Returns
+    -------
+    tuple(float, list)
+        Median import time in s and the optional dependencies loaded by the
+        import.
+
+    """
+    durations = []
+    loaded = set()
+    for _ in range(repeat):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                _PROBE.format(module=module, optional=OPTIONAL_DEPENDENCIES),
+            ],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE,
+            check=True,
+            universal_newlines=True,
+        )
+        probe = json.loads(result.stdout.splitlines()[-1])
+        durations.append(probe["duration"])
+        loaded.update(probe["loaded"])
+    return statistics.median(durations), sorted(loaded)
+
+
+def run_example():
+    r"""
+    Prints the import time of all example modules.
+
+    """
+    print("{:<40}{:>10}  {}".format("module", "time [s]", "optional deps"))
+    for module in MODULES:
+        duration, loaded = measure_import(module)
+        print(
+            "{:<40}{:>10.3f}  {}".format(
+                module, duration, ", ".join(loaded) or "-"
+            )
+        )
+
+
+if __name__ == "__main__":
+    run_example()
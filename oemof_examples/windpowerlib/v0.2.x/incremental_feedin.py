@@ -0,0 +1,342 @@
+"""
+The ``incremental_feedin`` module shows how to update the feed-in of wind
+turbines, wind farms and wind turbine clusters if new weather data is
+appended, without recalculating the complete history.
+
+The :class:`FeedinStore` persists the calculated power output of every power
+plant together with the time stamps it covers. On an update only the weather
+data after the last stored time stamp is calculated and appended to the
+store. The model chain calculations act on single time steps, so the result
+is the same as a calculation on the complete weather data.
+
+Operations on windows of time steps, e.g. a rolling mean of the feed-in, can
+be passed as `postprocess`. For them the last `margin` time steps before the
+new weather data are recalculated as well, so that windows crossing the
+boundary see all the data they need. Only the results of the new time steps
+are stored.
+
+Note that smoothing of the aggregated power curve of farms and clusters with
+the 'turbulence_intensity' method uses the mean roughness length of the
+calculated weather data, i.e. of the new weather data on an update.
+
+Go down to the "run_example()" function to start the example.
+
+SPDX-FileCopyrightText: 2019 oemof developer group <contact@oemof.org>
+SPDX-License-Identifier: MIT
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from windpowerlib import ModelChain
+from windpowerlib import WindTurbine
+
+from cached_cluster_modelchain import CachedTurbineClusterModelChain
+from cached_cluster_modelchain import fleet_key
+from power_curve_tables import power_curve_key
+
+
+def _curve_key(curve):
+    if curve is None:
+        return None
+    return (
+        curve["wind_speed"].values.astype(float).tobytes(),
+        curve["value"].values.astype(float).tobytes(),
+    )
+
+
+def _code_key(code):
+    consts = tuple(
+        _code_key(c) if hasattr(c, "co_code") else repr(c)
+        for c in code.co_consts
+    )
+    return (code.co_code, consts, code.co_names)
+
+
+def _callable_key(func):
+    r"""
+    Returns a key of a function that changes if its behaviour changes.
+
+    The byte code, the constants, the default values and the values of the
+    closure are part of the key, so e.g. lambdas that only differ in a window
+    length get different keys. Global variables used by the function are not.
+    Callables without code (e.g. instances of classes) are identified by
+    their `repr`.
+
+    """
+    if func is None:
+        return None
+    if hasattr(func, "func"):
+        # functools.partial
+        return (
+            _callable_key(func.func),
+            repr(func.args),
+            repr(sorted(func.keywords.items())),
+        )
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return repr(func)
+    closure = tuple(
+        repr(cell.cell_contents) for cell in (func.__closure__ or ())
+    )
+    return (
+        func.__qualname__,
+        _code_key(code),
+        repr(func.__defaults__),
+        closure,
+    )
+
+
+def plant_fingerprint(power_plant, modelchain_data, postprocess=None):
+    r"""
+    Returns a hash of everything that determines the stored power output.
+
+    If the power plant, the model chain parameters or the postprocessing
+    (see :py:func:`_callable_key`) change, the stored power output is
+    recalculated completely.
+
+    """
+    if isinstance(power_plant, WindTurbine):
+        plant = (
+            (
+                power_curve_key(power_plant)
+                if power_plant.power_curve is not None
+                else None
+            ),
+            _curve_key(power_plant.power_coefficient_curve),
+            repr(power_plant.hub_height),
+            repr(power_plant.nominal_power),
+            repr(power_plant.rotor_diameter),
+        )
+    else:
+        plant = fleet_key(power_plant)
+    settings = sorted(
+        (key, repr(value)) for key, value in modelchain_data.items()
+    )
+    function = _callable_key(postprocess)
+    return hashlib.sha1(repr((plant, settings, function)).encode()).hexdigest()
+
+
+class FeedinStore(object):
+    r"""
+    Persistent, append-only store of power output time series.
+
+    Every power plant (label) gets a directory with the power output and the
+    UTC time stamps as raw binary files, which are extended on every update,
+    and a json file with the fingerprint and the covered time range.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the store.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _dir(self, label):
+        return os.path.join(self.path, str(label))
+
+    def _meta(self, label):
+        fn = os.path.join(self._dir(label), "meta.json")
+        if not os.path.isfile(fn):
+            return None
+        with open(fn) as f:
+            return json.load(f)
+
+    def _write_meta(self, label, meta):
+        fn = os.path.join(self._dir(label), "meta.json")
+        with open(fn + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(fn + ".tmp", fn)
+
+    def load(self, label, tz="UTC"):
+        r"""
+        Returns the stored power output of a power plant.
+
+        Parameters
+        ----------
+        label : str
+        tz : str
+            Time zone of the returned index. Default: 'UTC'.
+
+        Returns
+        -------
+        :pandas:`pandas.Series<series>` or None
+            Power output in W, backed by a memory map. None if nothing is
+            stored for the label.
+
+        """
+        meta = self._meta(label)
+        if meta is None or meta["length"] == 0:
+            return None
+        values, index = (
+            np.memmap(
+                os.path.join(self._dir(label), name),
+                dtype=dtype,
+                mode="r",
+                shape=(meta["length"],),
+            )
+            for name, dtype in (("values.bin", float), ("index.bin", "int64"))
+        )
+        return pd.Series(
+            values,
+            index=pd.DatetimeIndex(np.asarray(index), tz="UTC").tz_convert(tz),
+            name=label,
+            copy=False,
+        )
+
+    def _append(self, label, values, index, meta):
+        directory = self._dir(label)
+        for name, array, dtype in (
+            ("values.bin", values, float),
+            ("index.bin", index, "int64"),
+        ):
+            fn = os.path.join(directory, name)
+            # drop rows beyond the length of the meta data, e.g. of an
+            # interrupted update, before appending
+            with open(fn, "ab") as f:
+                f.truncate(meta["length"] * 8)
+                f.write(np.ascontiguousarray(array, dtype=dtype).tobytes())
+        meta["length"] += len(values)
+        if len(index):
+            meta["end"] = int(index[-1])
+        self._write_meta(label, meta)
+
+    def update(
+        self,
+        label,
+        power_plant,
+        weather_df,
+        postprocess=None,
+        margin=0,
+        **modelchain_data
+    ):
+        r"""
+        Calculates the power output of the new weather data and stores it.
+
+        Parameters
+        ----------
+        label : str
+            Unique label of the power plant in the store.
+        power_plant : :class:`~.wind_turbine.WindTurbine`, \
+                :class:`~.wind_farm.WindFarm` or \
+                :class:`~.wind_turbine_cluster.WindTurbineCluster`
+        weather_df : :pandas:`pandas.DataFrame<frame>`
+            Complete weather data with sorted time index, see
+            :py:func:`~modelchain_example.get_weather_data`. Rows after the
+            last stored time stamp are calculated.
+        postprocess : callable, optional
+            Function applied to the power output (pandas.Series) before it
+            is stored, e.g. ``lambda p: p.rolling(24).mean()``.
+        margin : int
+            Number of time steps before the new weather data that are
+            recalculated so `postprocess` gets the data its windows need.
+            Default: 0.
+
+        Other Parameters
+        ----------------
+        Parameters of the model chain (:class:`~.modelchain.ModelChain` or
+        :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain`).
+
+        Returns
+        -------
+        int
+            Number of time steps appended to the store.
+
+        """
+        timestamps = weather_df.index.tz_convert("UTC").values.astype("int64")
+        fingerprint = plant_fingerprint(
+            power_plant, modelchain_data, postprocess
+        )
+        meta = self._meta(label)
+
+        start = 0
+        if meta is not None and meta["fingerprint"] == fingerprint:
+            start = int(np.searchsorted(timestamps, meta["end"], "right"))
+            if start == 0 or timestamps[start - 1] != meta["end"]:
+                logging.debug(
+                    "Stored power output of %s does not match the weather "
+                    "data.",
+                    label,
+                )
+                start, meta = 0, None
+        else:
+            meta = None
+
+        if meta is None:
+            # new or changed power plant: recalculate completely
+            shutil.rmtree(self._dir(label), ignore_errors=True)
+            os.makedirs(self._dir(label))
+            meta = {"fingerprint": fingerprint, "length": 0, "end": None}
+
+        if start == len(weather_df):
+            return 0
+
+        context = min(margin, start)
+        weather = weather_df.iloc[start - context :]
+        if isinstance(power_plant, WindTurbine):
+            mc = ModelChain(power_plant, **modelchain_data)
+        else:
+            mc = CachedTurbineClusterModelChain(power_plant, **modelchain_data)
+        power_output = mc.run_model(weather).power_output
+        if postprocess is not None:
+            power_output = postprocess(power_output)
+
+        logging.debug(
+            "Append %s time steps (%s recalculated) to %s.",
+            len(weather) - context,
+            context,
+            label,
+        )
+        self._append(
+            label,
+            power_output.values[context:],
+            timestamps[start:],
+            meta,
+        )
+        return len(weather) - context
+
+
+def run_example():
+    r"""
+    Stores the feed-in of the example turbines for the first days of the
+    example weather data and appends the following days one by one.
+
+    """
+    import modelchain_example as mc_e
+
+    logging.getLogger().setLevel(logging.DEBUG)
+
+    weather = mc_e.get_weather_data("weather.csv")
+    my_turbine, e126, my_turbine2 = mc_e.initialize_wind_turbines()
+    plants = {"my_turbine": my_turbine, "e126": e126}
+
+    store = FeedinStore("feedin_store")
+
+    def daily_mean(power_output):
+        return power_output.rolling(24, min_periods=1).mean()
+
+    # the weather data grows by one day per update
+    for end in range(24 * 28, 24 * 31 + 1, 24):
+        for label, turbine in plants.items():
+            store.update(label, turbine, weather.iloc[:end])
+            store.update(
+                label + "_daily_mean",
+                turbine,
+                weather.iloc[:end],
+                postprocess=daily_mean,
+                margin=23,
+            )
+
+    print(store.load("e126_daily_mean", tz="Europe/Berlin").tail())
+
+
+if __name__ == "__main__":
+    run_example()
@@ -0,0 +1,344 @@
+"""
+The ``modelchain_benchmark`` module benchmarks the configurations of the
+:class:`~.modelchain.ModelChain`.
+
+Every combination of wind speed model, density model, temperature model and
+power output model (with and without density correction) is run for a number
+of wind turbines over synthetic hourly weather data. For every configuration
+the throughput in turbine-hours per second and the peak memory allocated
+during the calculation are recorded. Configurations in which density and
+temperature are not needed (power curve without density correction) are only
+run once.
+
+The results can be stored as a baseline and later runs can be checked
+against it:
+
+   python modelchain_benchmark.py --steps 8760 --turbines 100 --save
+   python modelchain_benchmark.py --steps 8760 --turbines 100 --check
+
+A check fails (exit code 1) if the throughput of a configuration drops or its
+peak memory rises by more than the tolerance. Baselines are only comparable
+on the same machine.
+
+SPDX-FileCopyrightText: 2019 oemof developer group <contact@oemof.org>
+SPDX-License-Identifier: MIT
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from windpowerlib import ModelChain
+
+from turbine_library import TurbineLibrary
+
+WIND_SPEED_MODELS = [
+    "logarithmic",
+    "hellman",
+    "interpolation_extrapolation",
+    "log_interpolation_extrapolation",
+]
+DENSITY_MODELS = ["barometric", "ideal_gas", "interpolation_extrapolation"]
+TEMPERATURE_MODELS = ["linear_gradient", "interpolation_extrapolation"]
+# power output model and density correction
+POWER_OUTPUT_MODELS = [
+    ("power_curve", False),
+    ("power_curve", True),
+    ("power_coefficient_curve", False),
+]
+
+BASELINE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "modelchain_baseline.json"
+)
+
+
+def synthetic_weather(steps, seed=0):
+    r"""
+    Creates hourly weather data in the format of the example weather data.
+
+    Wind speeds are Weibull distributed at 10 m and follow a power law with
+    some noise at 80 m. Temperature, pressure and density are provided at two
+    heights each, so all models of the ModelChain can be used.
+
+    Parameters
+    ----------
+    steps : int
+        Number of hourly time steps.
+    seed : int
+        Seed of the random number generator. Default: 0.
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<frame>`
+
+    """
+    rng = np.random.RandomState(seed)
+    hours = np.arange(steps)
+
+    wind_speed_10 = 6 * rng.weibull(2, steps)
+    wind_speed_80 = wind_speed_10 * 8 ** (1 / 7) * rng.uniform(0.9, 1.1, steps)
+    temperature_2 = (
+        283 + 8 * np.sin(2 * np.pi * hours / 8760) + rng.normal(0, 2, steps)
+    )
+    temperature_10 = temperature_2 - 0.0065 * 8
+    pressure_0 = 101325 + rng.normal(0, 800, steps)
+    pressure_100 = pressure_0 * (1 - 0.0065 * 100 / 288.15) ** 5.255
+    density_0 = pressure_0 / (287.058 * temperature_2)
+    density_100 = pressure_100 / (287.058 * (temperature_2 - 0.65))
+
+    columns = pd.MultiIndex.from_tuples(
+        [
+            ("wind_speed", 10),
+            ("wind_speed", 80),
+            ("temperature", 2),
+            ("temperature", 10),
+            ("pressure", 0),
+            ("pressure", 100),
+            ("density", 0),
+            ("density", 100),
+            ("roughness_length", 0),
+        ],
+        names=["variable_name", "height"],
+    )
+    values = np.column_stack(
+        [
+            wind_speed_10,
+            wind_speed_80,
+            temperature_2,
+            temperature_10,
+            pressure_0,
+            pressure_100,
+            density_0,
+            density_100,
+            np.full(steps, 0.15),
+        ]
+    )
+    index = pd.date_range(
+        "1/1/2010", periods=steps, freq="H", tz="Europe/Berlin"
+    )
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def benchmark_turbines(number, library=None):
+    r"""
+    Creates wind turbines of all types of the turbine library that provide
+    a power curve and a power coefficient curve, with hub heights between
+    80 m and 160 m.
+
+    """
+    library = library or TurbineLibrary()
+    types = [
+        turbine_type
+        for turbine_type in library.turbine_types
+        if library.curve(turbine_type, "power_curve") is not None
+        and library.curve(turbine_type, "power_coefficient_curve") is not None
+        and library.turbines[turbine_type].get("rotor_diameter")
+    ]
+    return [
+        library.wind_turbine(types[i % len(types)], hub_height=80 + i % 81)
+        for i in range(number)
+    ]
+
+
+def configurations():
+    r"""
+    Returns all distinct ModelChain configurations.
+
+    Returns
+    -------
+    list(dict)
+
+    """
+    configs = []
+    for (
+        wind_speed_model,
+        density_model,
+        temperature_model,
+        (power_output_model, density_correction),
+    ) in itertools.product(
+        WIND_SPEED_MODELS,
+        DENSITY_MODELS,
+        TEMPERATURE_MODELS,
+        POWER_OUTPUT_MODELS,
+    ):
+        if power_output_model == "power_curve" and not density_correction:
+            # density (and therefore temperature) is not calculated
+            density_model, temperature_model = None, None
+        config = {
+            "wind_speed_model": wind_speed_model,
+            "density_model": density_model,
+            "temperature_model": temperature_model,
+            "power_output_model": power_output_model,
+            "density_correction": density_correction,
+        }
+        if config not in configs:
+            configs.append(config)
+    return configs
+
+
+def config_name(config):
+    r"""
+    Returns a short name of a configuration, used as key of the baseline.
+
+    """
+    return "/".join(str(config[key]) for key in sorted(config))
+
+
+def _run(config, turbines, weather):
+    modelchain_data = {
+        key: value for key, value in config.items() if value is not None
+    }
+    for turbine in turbines:
+        ModelChain(turbine, **modelchain_data).run_model(weather)
+
+
+def run_benchmark(steps=8760, turbines=10, repeat=3, seed=0):
+    r"""
+    Runs all configurations.
+
+    Parameters
+    ----------
+    steps : int
+        Number of hourly time steps of the weather data. Default: 8760.
+    turbines : int
+        Number of wind turbines. Default: 10.
+    repeat : int
+        Number of timed runs per configuration, the fastest one is recorded.
+        Default: 3.
+    seed : int
+        Seed of the synthetic weather data. Default: 0.
+
+    Returns
+    -------
+    dict
+        Configuration name mapped to a dict with the throughput in
+        turbine-hours per second ('throughput') and the peak memory in
+        bytes ('peak_memory').
+
+    """
+    weather = synthetic_weather(steps, seed)
+    wind_turbines = benchmark_turbines(turbines)
+
+    results = {}
+    for config in configurations():
+        durations = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _run(config, wind_turbines, weather)
+            durations.append(time.perf_counter() - start)
+
+        # separate run, tracing slows down the calculation
+        tracemalloc.start()
+        _run(config, wind_turbines, weather)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        results[config_name(config)] = {
+            "throughput": turbines * steps / min(durations),
+            "peak_memory": peak,
+        }
+    return results
+
+
+def compare(results, baseline, tolerance=0.2):
+    r"""
+    Compares benchmark results with a baseline.
+
+    Parameters
+    ----------
+    results, baseline : dict
+        Results as returned by :py:func:`run_benchmark`.
+    tolerance : float
+        Accepted relative deviation. Default: 0.2.
+
+    Returns
+    -------
+    list(str)
+        Description of all regressions.
+
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]
+        if result["throughput"] < (1 - tolerance) * reference["throughput"]:
+            regressions.append(
+                "{}: throughput {:.0f} < {:.0f} turbine-hours/s".format(
+                    name, result["throughput"], reference["throughput"]
+                )
+            )
+        if result["peak_memory"] > (1 + tolerance) * reference["peak_memory"]:
+            regressions.append(
+                "{}: peak memory {:.1f} > {:.1f} MB".format(
+                    name,
+                    result["peak_memory"] / 1e6,
+                    reference["peak_memory"] / 1e6,
+                )
+            )
+    return regressions
+
+
+def run_example():
+    r"""
+    Runs the benchmark from the command line.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--steps", type=int, default=8760)
+    parser.add_argument("--turbines", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--save", action="store_true", help="store baseline")
+    group.add_argument("--check", action="store_true", help="check baseline")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.steps, args.turbines, args.repeat)
+
+    print("{:<80}{:>14}{:>10}".format("configuration", "turbine-h/s", "MB"))
+    for name, result in sorted(
+        results.items(), key=lambda item: -item[1]["throughput"]
+    ):
+        print(
+            "{:<80}{:>14.0f}{:>10.1f}".format(
+                name, result["throughput"], result["peak_memory"] / 1e6
+            )
+        )
+
+    setup = {
+        "steps": args.steps,
+        "turbines": args.turbines,
+        "machine": platform.node(),
+        "python": platform.python_version(),
+    }
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"setup": setup, "results": results}, f, indent=2)
+        print("Baseline written to {}".format(args.baseline))
+    elif args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["setup"] != setup:
+            print(
+                "Warning: baseline was recorded with {}".format(
+                    baseline["setup"]
+                )
+            )
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for regression in regressions:
+            print(regression)
+        if regressions:
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    run_example()
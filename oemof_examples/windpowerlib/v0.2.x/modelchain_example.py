@@ -22,14 +22,14 @@ SPDX-License-Identifier: MIT
 """
 import os
 import pandas as pd
-import requests
 import logging
 from windpowerlib import ModelChain, WindTurbine, create_power_curve
 
-try:
-    from matplotlib import pyplot as plt
-except ImportError:
-    plt = None
+from weather_cache import load_weather
+
+# matplotlib is imported on first use in plot_or_print(), so importing this
+# module stays fast (see import_benchmark.py); requests is imported in
+# get_weather_data() as well, but the windpowerlib itself loads it already
 
 
 def get_weather_data(filename="weather.csv", **kwargs):
@@ -52,6 +52,9 @@ def get_weather_data(filename="weather.csv", **kwargs):
     datapath : str, optional
         Path where the weather data file is stored.
         Default: 'windpowerlib/example'.
+    site : optional
+        Name of the site if the file contains several sites stacked along the
+        rows (site in the second column).
 
     Returns
     -------
@@ -72,22 +75,17 @@ def get_weather_data(filename="weather.csv", **kwargs):
     file = os.path.join(kwargs["datapath"], filename)
 
     if not os.path.isfile(file):
+        import requests
+
         logging.debug("Download weather data for example.")
         req = requests.get("https://osf.io/59bqn/download")
         with open(file, "wb") as fout:
             fout.write(req.content)
 
-    # read csv file
-    weather_df = pd.read_csv(
-        file,
-        index_col=0,
-        header=[0, 1],
-        date_parser=lambda idx: pd.to_datetime(idx, utc=True),
-    )
-
-    # change type of index to datetime and set time zone
-    weather_df.index = pd.to_datetime(weather_df.index).tz_convert(
-        "Europe/Berlin"
+    # read csv file once, later calls memory-map the binary cache
+    # see weather_cache.py
+    weather_df = load_weather(
+        file, site=kwargs.get("site"), tz="Europe/Berlin"
     )
 
     return weather_df
@@ -252,6 +250,10 @@ def plot_or_print(my_turbine, e126, my_turbine2):
         WindTurbine object with power coefficient curve from example file.
 
     """
+    try:
+        from matplotlib import pyplot as plt
+    except ImportError:
+        plt = None
 
     # plot or print turbine power output
     if plt:
@@ -0,0 +1,202 @@
+"""
+The ``parallel_fleet`` module shows how to calculate the power output of a
+large fleet of wind turbines and wind farms on a process pool.
+
+The weather data is copied once into shared memory. The worker processes
+attach to it when they start, so the weather data is not pickled per task,
+only the (small) turbine or farm objects are. Every worker writes the power
+output of its sites directly into a preallocated output array, which is
+shared memory as well.
+
+Weather data can either be one DataFrame used for all sites or a
+:class:`~weather_cache.WeatherCache` of a file with stacked sites (see
+``weather_cache.py``).
+
+Go down to the "run_example()" function to start the example.
+
+SPDX-FileCopyrightText: 2019 oemof developer group <contact@oemof.org>
+SPDX-License-Identifier: MIT
+"""
+import logging
+import multiprocessing
+from multiprocessing import shared_memory
+from multiprocessing import util
+
+import numpy as np
+import pandas as pd
+from windpowerlib import ModelChain
+from windpowerlib import TurbineClusterModelChain
+from windpowerlib import WindTurbine
+
+# state of the worker processes, set by _init_worker()
+_worker = {}
+
+
+def _attach(name, shape):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=float, buffer=shm.buf)
+
+
+def _detach():
+    # the arrays export the buffers, they have to be released before closing
+    _worker.pop("weather", None)
+    _worker.pop("output", None)
+    for key in ("weather_shm", "output_shm"):
+        if key in _worker:
+            _worker.pop(key).close()
+
+
+def _init_worker(weather, output, index, columns, modelchain_data):
+    _worker["weather_shm"], _worker["weather"] = _attach(*weather)
+    _worker["output_shm"], _worker["output"] = _attach(*output)
+    _worker["index"] = index
+    _worker["columns"] = columns
+    _worker["modelchain_data"] = modelchain_data
+    # runs when the worker exits after pool.close() and pool.join()
+    util.Finalize(None, _detach, exitpriority=10)
+
+
+def _run_site(task):
+    position, power_plant, site = task
+    values = _worker["weather"]
+    if values.ndim == 3:
+        values = values[site]
+    weather_df = pd.DataFrame(
+        values, index=_worker["index"], columns=_worker["columns"], copy=False
+    )
+
+    if isinstance(power_plant, WindTurbine):
+        mc = ModelChain(power_plant, **_worker["modelchain_data"])
+    else:
+        mc = TurbineClusterModelChain(
+            power_plant, **_worker["modelchain_data"]
+        )
+    _worker["output"][:, position] = mc.run_model(weather_df).power_output
+    return position
+
+
+def run_fleet(
+    fleet, weather, sites=None, processes=None, chunksize=8, **modelchain_data
+):
+    r"""
+    Calculates the power output of all sites of a fleet in parallel.
+
+    Parameters
+    ----------
+    fleet : dict
+        Site label mapped to a :class:`~.wind_turbine.WindTurbine`,
+        :class:`~.wind_farm.WindFarm` or
+        :class:`~.wind_turbine_cluster.WindTurbineCluster`.
+    weather : :pandas:`pandas.DataFrame<frame>` or \
+            :class:`~weather_cache.WeatherCache`
+        Weather data used for all sites or cache with stacked sites.
+    sites : dict, optional
+        Site label mapped to the site name in the weather cache. Default:
+        the site labels.
+    processes : int, optional
+        Number of worker processes. Default: number of CPUs.
+    chunksize : int
+        Number of sites sent to a worker at once. Default: 8.
+
+    Other Parameters
+    ----------------
+    Parameters of the model chains (:class:`~.modelchain.ModelChain` and
+    :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain`).
+
+    Returns
+    -------
+    :pandas:`pandas.DataFrame<frame>`
+        Power output in W with one column per site label.
+
+    """
+    labels = list(fleet)
+
+    if isinstance(weather, pd.DataFrame):
+        site_positions = [None] * len(labels)
+    else:
+        if weather.sites is None:
+            raise ValueError(
+                "The weather cache of {} is not stacked. Pass its DataFrame "
+                "(weather_df()) to use it for all sites.".format(
+                    weather.file
+                )
+            )
+        sites = sites or dict(zip(labels, labels))
+        site_positions = [
+            weather.sites.index(sites[label]) for label in labels
+        ]
+    values = np.asarray(weather.values, dtype=float)
+    index, columns = weather.index, weather.columns
+
+    weather_shm = shared_memory.SharedMemory(
+        create=True, size=max(values.nbytes, 1)
+    )
+    output_shape = (len(index), len(labels))
+    output_shm = shared_memory.SharedMemory(
+        create=True, size=max(8 * len(index) * len(labels), 1)
+    )
+
+    try:
+        shared_weather = np.ndarray(
+            values.shape, dtype=float, buffer=weather_shm.buf
+        )
+        shared_weather[:] = values
+        output = np.ndarray(output_shape, dtype=float, buffer=output_shm.buf)
+
+        tasks = [
+            (position, fleet[label], site)
+            for position, (label, site) in enumerate(
+                zip(labels, site_positions)
+            )
+        ]
+        initargs = (
+            (weather_shm.name, values.shape),
+            (output_shm.name, output_shape),
+            index,
+            columns,
+            modelchain_data,
+        )
+        with multiprocessing.Pool(
+            processes, initializer=_init_worker, initargs=initargs
+        ) as pool:
+            for done, _ in enumerate(
+                pool.imap_unordered(_run_site, tasks, chunksize), 1
+            ):
+                if done % 1000 == 0:
+                    logging.debug("%s of %s sites done.", done, len(tasks))
+            # let the workers exit normally, so they close their handles
+            pool.close()
+            pool.join()
+
+        power_output = pd.DataFrame(
+            output.copy(), index=index, columns=labels
+        )
+    finally:
+        weather_shm.close()
+        weather_shm.unlink()
+        output_shm.close()
+        output_shm.unlink()
+
+    return power_output
+
+
+def run_example():
+    r"""
+    Calculates a fleet of 999 turbines on all CPUs.
+
+    """
+    import modelchain_example as mc_e
+
+    weather = mc_e.get_weather_data("weather.csv")
+    my_turbine, e126, my_turbine2 = mc_e.initialize_wind_turbines()
+
+    fleet = {
+        "site_{}".format(i): turbine
+        for i, turbine in enumerate([my_turbine, e126, my_turbine2] * 333)
+    }
+    power_output = run_fleet(fleet, weather)
+    print(power_output.sum(axis=1))
+
+
+if __name__ == "__main__":
+    run_example()
@@ -0,0 +1,198 @@
+r"""
+The ``power_curve_tables`` module provides power curves compiled to lookup
+tables on a uniform wind speed grid.
+
+A table is built once per turbine type (identical power curve) and grid step
+and shared read-only between all turbines of that type. Looking up a wind
+speed on a uniform grid is an index calculation, so all turbines and time
+steps of a batch are evaluated with a few array operations.
+
+The density correction of the windpowerlib
+(:py:func:`~.power_output.power_curve_density_correction`) scales the wind
+speeds of the power curve with :math:`(\rho_0 / \rho)^{p(v)}`. Instead of
+scaling the power curve for every time step, the wind speed at hub height is
+transformed to the equivalent wind speed at standard density and looked up in
+the same table. Between the points of the power curve this interpolates
+linearly in the standard density wind speed instead of the corrected wind
+speed; the deviation vanishes at the points of the power curve.
+
+SPDX-FileCopyrightText: 2019 oemof developer group <contact@oemof.org>
+SPDX-License-Identifier: MIT
+"""
+import numpy as np
+
+RHO_0 = 1.225  # standard density in kg/m³ used by the windpowerlib
+
+# registry of compiled tables: (power curve key, step) -> PowerCurveTable
+_tables = {}
+
+
+def power_curve_key(wind_turbine):
+    r"""
+    Returns a hashable key identifying the power curve of a wind turbine.
+
+    """
+    curve = wind_turbine.power_curve
+    return (
+        curve["wind_speed"].values.astype(float).tobytes(),
+        curve["value"].values.astype(float).tobytes(),
+    )
+
+
+class PowerCurveTable(object):
+    r"""
+    Power curve sampled on a uniform wind speed grid.
+
+    Parameters
+    ----------
+    wind_speed : array_like
+        Wind speeds of the power curve in m/s.
+    value : array_like
+        Power values of the power curve in W.
+    step : float
+        Grid step in m/s. Default: 0.01.
+
+    Attributes
+    ----------
+    values : numpy.array
+        Read-only power values in W on the grid 0, step, 2 * step, ...,
+        followed by a zero.
+    v_max : float
+        Last wind speed of the power curve. The power output of higher wind
+        speeds is zero (cut-out), see :py:func:`lookup`.
+
+    """
+
+    def __init__(self, wind_speed, value, step=0.01):
+        wind_speed = np.asarray(wind_speed, dtype=float)
+        self.step = step
+        self.v_max = wind_speed.max()
+        grid = np.arange(0, self.v_max + step, step)
+        value = np.asarray(value, dtype=float)
+        # grid points slightly above v_max keep the last value, wind speeds
+        # above v_max are set to zero in lookup()
+        values = np.interp(grid, wind_speed, value, left=0, right=value[-1])
+        self.values = np.append(values, 0)
+        self.values.setflags(write=False)
+
+    def __call__(self, wind_speed):
+        return lookup(
+            self.values[None, :],
+            np.zeros(1, dtype=int),
+            wind_speed,
+            self.step,
+            np.array([self.v_max]),
+        )
+
+
+def get_table(wind_turbine, step=0.01):
+    r"""
+    Returns the shared lookup table of the turbine type of a wind turbine.
+
+    """
+    key = (power_curve_key(wind_turbine), step)
+    if key not in _tables:
+        curve = wind_turbine.power_curve
+        _tables[key] = PowerCurveTable(
+            curve["wind_speed"], curve["value"], step
+        )
+    return _tables[key]
+
+
+def stack_tables(tables):
+    r"""
+    Stacks the values of several tables (same step) into one matrix.
+
+    Returns
+    -------
+    numpy.array
+        Matrix with one row per table, padded with zeros.
+
+    """
+    length = max(len(t.values) for t in tables)
+    matrix = np.zeros((len(tables), length))
+    for row, table in enumerate(tables):
+        matrix[row, : len(table.values)] = table.values
+    return matrix
+
+
+def lookup(matrix, rows, wind_speed, step, v_max):
+    r"""
+    Looks up wind speeds in stacked power curve tables.
+
+    Parameters
+    ----------
+    matrix : numpy.array
+        Stacked tables, see :py:func:`stack_tables`.
+    rows : numpy.array
+        Table row of every column (turbine) of `wind_speed`.
+    wind_speed : numpy.array
+        Wind speed in m/s with shape (time steps, turbines).
+    step : float
+        Grid step in m/s.
+    v_max : numpy.array
+        Last wind speed of the power curve of every table row. Higher wind
+        speeds return zero, as with :py:func:`numpy.interp` and `right=0`.
+
+    Returns
+    -------
+    numpy.array
+        Power output in W, same shape as `wind_speed`.
+
+    """
+    position = np.clip(np.asarray(wind_speed) / step, 0, None)
+    # wind speeds beyond the table map to its trailing zero
+    position = np.minimum(position, matrix.shape[1] - 1)
+    lower = np.minimum(position.astype(int), matrix.shape[1] - 2)
+    fraction = position - lower
+    rows = np.broadcast_to(rows, lower.shape)
+    power = (1 - fraction) * matrix[rows, lower] + fraction * matrix[
+        rows, lower + 1
+    ]
+    wind_speed = np.asarray(wind_speed)
+    power[(wind_speed < 0) | (wind_speed > np.asarray(v_max)[rows])] = 0
+    return power
+
+
+def standard_density_wind_speed(wind_speed, density, iterations=4):
+    r"""
+    Transforms wind speeds to the equivalent wind speed at standard density.
+
+    Inverts :math:`v = u \cdot (\rho_0 / \rho)^{p(u)}` with the exponent
+    :math:`p` of :py:func:`~.power_output.power_curve_density_correction`:
+    1/3 below 7.5 m/s, 2/3 above 12.5 m/s and linear in between.
+
+    Parameters
+    ----------
+    wind_speed, density : numpy.array
+        Wind speed in m/s and density in kg/m³ (same shape).
+
+    Returns
+    -------
+    numpy.array
+
+    """
+    log_c = np.log(RHO_0 / np.asarray(density))
+    v = np.asarray(wind_speed, dtype=float)
+
+    # limits of the transition range in terms of v
+    v_low = 7.5 * np.exp(log_c / 3)
+    v_high = 12.5 * np.exp(2 * log_c / 3)
+
+    u = np.where(
+        v <= v_low, v * np.exp(-log_c / 3), v * np.exp(-2 * log_c / 3)
+    )
+
+    transition = (v > v_low) & (v < v_high)
+    if transition.any():
+        vt = v[transition]
+        lc = np.broadcast_to(log_c, v.shape)[transition]
+        ut = np.clip(vt, 7.5, 12.5)
+        # newton iterations on f(u) = ln(u) + p(u) ln(c) - ln(v)
+        for _ in range(iterations):
+            p = (ut - 7.5) / 15 + 1 / 3
+            f = np.log(ut) + p * lc - np.log(vt)
+            ut = np.clip(ut - f / (1 / ut + lc / 15), 7.5, 12.5)
+        u[transition] = ut
+
+    return u
@@ -0,0 +1,176 @@
+"""
+The ``streaming_cluster_modelchain`` module shows how to calculate the feed-in
+of many wind farms over long weather time series with bounded memory.
+
+The weather data is read in time chunks from the binary weather cache (see
+``weather_cache.py``). Every wind farm of a cluster is calculated with the
+:class:`~.turbine_cluster_modelchain.TurbineClusterModelChain` chunk by chunk
+and the feed-in of all farms and their sum is appended to a csv file after
+each chunk. Memory is therefore bounded by chunk size x number of farms
+instead of the length of the weather time series.
+
+All calculation steps of the model chain act on single time steps, so the
+chunked results are identical to a calculation on the complete time series.
+Only smoothing with the 'turbulence_intensity' method depends on the mean
+roughness length of the weather data, which is then taken per chunk.
+
+The aggregated power curve of every farm is calculated once and reused for
+all chunks (see ``cached_cluster_modelchain.py``).
+
+Go down to the "run_example()" function to start the example.
+
+SPDX-FileCopyrightText: 2019 oemof developer group <contact@oemof.org>
+SPDX-License-Identifier: MIT
+"""
+import logging
+import os
+
+import pandas as pd
+from cached_cluster_modelchain import CachedTurbineClusterModelChain
+from weather_cache import WeatherCache
+
+
+def weather_chunks(cache, chunk_size, site=None):
+    r"""
+    Yields the weather data of a site in chunks of `chunk_size` time steps.
+
+    The chunks are slices of the memory-mapped cache, only the current chunk
+    is loaded into memory.
+
+    Parameters
+    ----------
+    cache : :class:`~weather_cache.WeatherCache`
+    chunk_size : int
+    site : optional
+        Site name for weather files with stacked sites.
+
+    """
+    weather_df = cache.weather_df(site)
+    for start in range(0, len(weather_df), chunk_size):
+        yield weather_df.iloc[start : start + chunk_size]
+
+
+def run_streaming(
+    wind_farms,
+    weather_file,
+    output_file,
+    chunk_size=8760,
+    sites=None,
+    **modelchain_data
+):
+    r"""
+    Calculates the feed-in of wind farms chunk by chunk and writes it to disk.
+
+    Parameters
+    ----------
+    wind_farms : list(:class:`~.wind_farm.WindFarm`) or \
+            :class:`~.wind_turbine_cluster.WindTurbineCluster`
+        Wind farms to calculate. Every farm needs a unique name.
+    weather_file : str
+        Weather csv file, see :py:func:`~weather_cache.load_weather`.
+    output_file : str
+        Csv file the feed-in in W is written to (one column per farm plus a
+        column 'total'). An existing file is overwritten.
+    chunk_size : int
+        Number of time steps per chunk. Default: 8760.
+    sites : dict, optional
+        Site of every farm (by name) for weather files with stacked sites.
+        If None all farms use the same weather data.
+
+    Other Parameters
+    ----------------
+    All parameters of the
+    :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain`.
+
+    Returns
+    -------
+    int
+        Number of time steps written.
+
+    """
+    if hasattr(wind_farms, "wind_farms"):
+        wind_farms = wind_farms.wind_farms
+    names = [farm.name for farm in wind_farms]
+    if len(set(names)) != len(names):
+        raise ValueError("The names of the wind farms must be unique.")
+
+    if sites is None:
+        sites = dict.fromkeys(names)
+
+    # farms sharing a site share the weather chunks
+    groups = {}
+    for farm in wind_farms:
+        groups.setdefault(sites[farm.name], []).append(farm)
+
+    cache = WeatherCache(weather_file, stacked=None not in groups)
+    chunks = {
+        site: weather_chunks(cache, chunk_size, site) for site in groups
+    }
+
+    if os.path.isfile(output_file):
+        os.remove(output_file)
+
+    written = 0
+    while True:
+        feedin = {}
+        for site, farms in groups.items():
+            weather = next(chunks[site], None)
+            if weather is None:
+                break
+            for farm in farms:
+                feedin[farm.name] = (
+                    CachedTurbineClusterModelChain(farm, **modelchain_data)
+                    .run_model(weather)
+                    .power_output
+                )
+        if not feedin:
+            break
+
+        feedin = pd.DataFrame(feedin)[names]
+        feedin["total"] = feedin.sum(axis=1)
+        feedin.to_csv(output_file, mode="a", header=written == 0)
+        written += len(feedin)
+        logging.debug("Wrote %s time steps to %s.", written, output_file)
+
+    return written
+
+
+def run_example():
+    r"""
+    Calculates the feed-in of the farms of the turbine cluster example in
+    monthly chunks.
+
+    """
+    import modelchain_example as mc_e
+    from windpowerlib import WindFarm
+
+    logging.getLogger().setLevel(logging.DEBUG)
+
+    # make sure weather.csv is available (downloads it if necessary)
+    mc_e.get_weather_data("weather.csv")
+    my_turbine, e126, dummy_turbine = mc_e.initialize_wind_turbines()
+
+    wind_farms = [
+        WindFarm(
+            name="farm_{}".format(i),
+            wind_turbine_fleet=[
+                my_turbine.to_group(6),
+                e126.to_group(total_capacity=12.6e6),
+            ],
+            efficiency=0.9,
+        )
+        for i in range(10)
+    ]
+
+    written = run_streaming(
+        wind_farms,
+        os.path.join(os.path.dirname(__file__), "weather.csv"),
+        "cluster_feedin.csv",
+        chunk_size=24 * 31,
+        wake_losses_model="wind_farm_efficiency",
+    )
+    print("{} time steps written to cluster_feedin.csv".format(written))
+
+
+if __name__ == "__main__":
+    run_example()
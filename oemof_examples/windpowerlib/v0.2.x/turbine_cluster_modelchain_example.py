@@ -10,24 +10,15 @@ of wind turbines, are imported and used without further explanations.
 SPDX-FileCopyrightText: 2019 oemof developer group <contact@oemof.org>
 SPDX-License-Identifier: MIT
 """
-import pandas as pd
+import logging
 
-try:
-    from matplotlib import pyplot as plt
-except ImportError:
-    plt = None
+import pandas as pd
 
-from example import modelchain_example as mc_e
+import modelchain_example as mc_e
 from windpowerlib import WindFarm
 from windpowerlib import WindTurbineCluster
 from windpowerlib import TurbineClusterModelChain
 
-# You can use the logging package to get logging messages from the windpowerlib
-# Change the logging level if you want more or less messages
-import logging
-
-logging.getLogger().setLevel(logging.DEBUG)
-
 
 def initialize_wind_farms(my_turbine, e126):
     r"""
@@ -200,6 +191,10 @@ def plot_or_print(example_farm, example_cluster):
         WindTurbineCluster object.
 
     """
+    try:
+        from matplotlib import pyplot as plt
+    except ImportError:
+        plt = None
 
     # plot or print power output
     if plt:
@@ -218,6 +213,10 @@ def run_example():
     Runs the example.
 
     """
+    # You can use the logging package to get logging messages from the
+    # windpowerlib. Change the logging level if you want more or less messages
+    logging.getLogger().setLevel(logging.DEBUG)
+
     weather = mc_e.get_weather_data("weather.csv")
     my_turbine, e126, dummy_turbine = mc_e.initialize_wind_turbines()
     example_farm, example_farm_2 = initialize_wind_farms(my_turbine, e126)
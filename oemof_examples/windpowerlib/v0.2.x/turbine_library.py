@@ -0,0 +1,325 @@
+"""
+The ``turbine_library`` module provides a compiled, memory-mapped version of
+the oedb turbine library that is provided along with the windpowerlib.
+
+A :class:`~.wind_turbine.WindTurbine` initialized with a `turbine_type` reads
+and parses the csv files of the turbine library on every initialization. The
+:class:`TurbineLibrary` parses them only once: all power curves and power
+coefficient curves are stored in one binary array each (NumPy ``.npy`` files)
+together with a json index holding the position of every turbine type in
+these arrays, its nominal power and its rotor diameter. Getting the data of
+a turbine type is then a dictionary lookup. The curves are read-only
+DataFrames backed by the memory-mapped arrays and shared by all turbines of
+the same type, so do not modify them in place.
+
+The index is rebuilt automatically if the csv files change. To rebuild it
+explicitly run:
+
+   python turbine_library.py build [--source DIR] [--index DIR]
+
+Go down to the "run_example()" function to start the example.
+
+SPDX-FileCopyrightText: 2019 oemof developer group <contact@oemof.org>
+SPDX-License-Identifier: MIT
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from windpowerlib import WindTurbine
+
+from weather_cache import file_hash
+
+CURVES = {
+    "power_curve": "power_curves.csv",
+    "power_coefficient_curve": "power_coefficient_curves.csv",
+}
+TURBINE_DATA = "turbine_data.csv"
+
+
+def oedb_path():
+    r"""
+    Returns the directory of the oedb turbine library of the windpowerlib.
+
+    """
+    import windpowerlib
+
+    return os.path.join(os.path.dirname(windpowerlib.__file__), "oedb")
+
+
+def _source_files(source):
+    return [
+        os.path.join(source, name)
+        for name in list(CURVES.values()) + [TURBINE_DATA]
+    ]
+
+
+def _source_hashes(source):
+    return {
+        os.path.basename(fn): file_hash(fn)
+        for fn in _source_files(source)
+        if os.path.isfile(fn)
+    }
+
+
+def _float_or_none(value):
+    return None if pd.isnull(value) else float(value)
+
+
+def build_index(source=None, index_dir=None):
+    r"""
+    Compiles the csv files of a turbine library into a binary index.
+
+    The index is written to a temporary directory first and moved into place
+    afterwards, so concurrent processes never read half-written files.
+
+    Parameters
+    ----------
+    source : str, optional
+        Directory with the files 'power_curves.csv',
+        'power_coefficient_curves.csv' and 'turbine_data.csv' in the format
+        of the oedb turbine library. Default: oedb turbine library of the
+        windpowerlib.
+    index_dir : str, optional
+        Directory of the index. Default: '.turbine_library' next to this
+        module.
+
+    Returns
+    -------
+    str
+        Directory of the index.
+
+    """
+    source = source or oedb_path()
+    index_dir = index_dir or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".turbine_library"
+    )
+    logging.debug("Build turbine library index from %s.", source)
+
+    turbines = {}
+    parent = os.path.dirname(os.path.abspath(index_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent)
+
+    for curve, filename in CURVES.items():
+        fn = os.path.join(source, filename)
+        blocks, position = [], 0
+        if os.path.isfile(fn):
+            df = pd.read_csv(fn, index_col=0)
+            wind_speed = df.columns.astype(float).values
+            for turbine_type, row in zip(df.index, df.values.astype(float)):
+                valid = ~np.isnan(row)
+                block = np.column_stack([wind_speed[valid], row[valid]])
+                blocks.append(block)
+                turbines.setdefault(turbine_type, {})[curve] = [
+                    position,
+                    position + len(block),
+                ]
+                position += len(block)
+        values = np.concatenate(blocks) if blocks else np.empty((0, 2))
+        np.save(os.path.join(tmp, curve + ".npy"), values)
+
+    fn = os.path.join(source, TURBINE_DATA)
+    if os.path.isfile(fn):
+        df = pd.read_csv(fn, index_col=0)
+        for turbine_type, row in df.iterrows():
+            data = turbines.setdefault(turbine_type, {})
+            data["nominal_power"] = _float_or_none(row.get("nominal_power"))
+            data["rotor_diameter"] = _float_or_none(row.get("rotor_diameter"))
+
+    with open(os.path.join(tmp, "index.json"), "w") as f:
+        json.dump(
+            {
+                "source": os.path.abspath(source),
+                "hashes": _source_hashes(source),
+                "turbines": turbines,
+            },
+            f,
+        )
+
+    if os.path.isdir(index_dir):
+        old = tempfile.mkdtemp(dir=parent)
+        os.rename(index_dir, os.path.join(old, "index"))
+        shutil.rmtree(old)
+    try:
+        os.rename(tmp, index_dir)
+    except OSError:
+        # built by another process in the meantime
+        shutil.rmtree(tmp)
+    return index_dir
+
+
+class TurbineLibrary(object):
+    r"""
+    Memory-mapped turbine library with O(1) access by turbine type.
+
+    Parameters
+    ----------
+    source : str, optional
+        Directory of the turbine library csv files, see
+        :py:func:`build_index`. Default: oedb turbine library of the
+        windpowerlib.
+    index_dir : str, optional
+        Directory of the index. Default: '.turbine_library' next to this
+        module.
+    check : bool
+        If True the index is rebuilt if the csv files have changed since
+        it was built. Default: True.
+
+    Examples
+    --------
+    >>> library = TurbineLibrary()
+    >>> e126 = library.wind_turbine("E-126/4200", hub_height=135)
+    >>> e126.nominal_power
+    4200000.0
+
+    """
+
+    def __init__(self, source=None, index_dir=None, check=True):
+        self.source = os.path.abspath(source or oedb_path())
+        self.index_dir = index_dir or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), ".turbine_library"
+        )
+        index_file = os.path.join(self.index_dir, "index.json")
+
+        index = None
+        if os.path.isfile(index_file):
+            with open(index_file) as f:
+                index = json.load(f)
+            if check and (
+                index["source"] != self.source
+                or index["hashes"] != _source_hashes(self.source)
+            ):
+                logging.debug("Turbine library index is outdated.")
+                index = None
+        if index is None:
+            build_index(self.source, self.index_dir)
+            with open(index_file) as f:
+                index = json.load(f)
+
+        self.turbines = index["turbines"]
+        self._values = {
+            curve: np.load(
+                os.path.join(self.index_dir, curve + ".npy"), mmap_mode="r"
+            )
+            for curve in CURVES
+        }
+        # curve DataFrames are created on first access and shared afterwards
+        self._curves = {}
+
+    @property
+    def turbine_types(self):
+        r"""
+        List of all turbine types in the library.
+
+        """
+        return sorted(self.turbines)
+
+    def curve(self, turbine_type, curve="power_curve"):
+        r"""
+        Returns the power curve or power coefficient curve of a turbine type.
+
+        Parameters
+        ----------
+        turbine_type : str
+        curve : str
+            'power_curve' or 'power_coefficient_curve'.
+            Default: 'power_curve'.
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<frame>` or None
+            Read-only curve with the columns 'wind_speed' and 'value' or None
+            if the curve is not provided for the turbine type.
+
+        """
+        key = (turbine_type, curve)
+        if key not in self._curves:
+            position = self.turbines.get(turbine_type, {}).get(curve)
+            if position is None:
+                self._curves[key] = None
+            else:
+                self._curves[key] = pd.DataFrame(
+                    self._values[curve][position[0] : position[1]],
+                    columns=["wind_speed", "value"],
+                    copy=False,
+                )
+        return self._curves[key]
+
+    def wind_turbine(self, turbine_type, hub_height, **kwargs):
+        r"""
+        Initializes a :class:`~.wind_turbine.WindTurbine` of a turbine type.
+
+        Other keyword arguments of the WindTurbine (e.g. `nominal_power`)
+        overwrite the data of the library.
+
+        Raises
+        ------
+        KeyError
+            If the turbine type is not in the library.
+
+        """
+        if turbine_type not in self.turbines:
+            raise KeyError(
+                "Wind converter type {0} not provided. Possible types: "
+                "{1}".format(turbine_type, self.turbine_types)
+            )
+        data = self.turbines[turbine_type]
+        for curve in CURVES:
+            if kwargs.get(curve) is None:
+                kwargs[curve] = self.curve(turbine_type, curve)
+        for name in ("nominal_power", "rotor_diameter"):
+            if kwargs.get(name) is None:
+                kwargs[name] = data.get(name)
+        return WindTurbine(
+            hub_height=hub_height,
+            turbine_type=turbine_type,
+            path=None,
+            **kwargs
+        )
+
+
+def run_example():
+    r"""
+    Compares the initialization of WindTurbine objects from the csv files
+    and from the turbine library index.
+
+    """
+    import timeit
+
+    library = TurbineLibrary()
+    e126 = library.wind_turbine("E-126/4200", hub_height=135)
+    print(e126)
+
+    number = 100
+    csv_time = timeit.timeit(
+        lambda: WindTurbine(turbine_type="E-126/4200", hub_height=135),
+        number=number,
+    )
+    index_time = timeit.timeit(
+        lambda: library.wind_turbine("E-126/4200", hub_height=135),
+        number=number,
+    )
+    print(
+        "Time per WindTurbine: {:.2e} s from csv files, {:.2e} s from "
+        "index".format(csv_time / number, index_time / number)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command")
+    build = subparsers.add_parser("build", help="rebuild the index")
+    build.add_argument("--source", help="directory of the csv files")
+    build.add_argument("--index", help="directory of the index")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(build_index(args.source, args.index))
+    else:
+        run_example()
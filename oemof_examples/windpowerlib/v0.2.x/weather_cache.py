@@ -0,0 +1,198 @@
+"""
+The ``weather_cache`` module provides a fast loader for weather data files
+in the format of the windpowerlib example ``weather.csv``.
+
+The csv file is parsed only once. Values, time index and the
+(variable_name, height) column structure are stored in a binary cache
+(NumPy ``.npy`` files) next to the csv file. The cache is keyed by the hash of
+the file content, later runs memory-map the cached arrays instead of parsing
+the csv file again.
+
+Besides single weather data points the loader accepts reanalysis-style files
+in which the data of many points (sites) is stacked: the first column holds
+the time stamp, the second column the site.
+
+SPDX-FileCopyrightText: 2019 oemof developer group <contact@oemof.org>
+SPDX-License-Identifier: MIT
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+def file_hash(file, chunk_size=2 ** 20):
+    r"""
+    Returns the SHA-1 hash of the content of a file.
+
+    """
+    sha = hashlib.sha1()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def parse_weather_csv(file, stacked=False):
+    r"""
+    Parses a weather csv file with a two-row header.
+
+    The time stamps are converted in one vectorized call instead of one
+    call per row.
+
+    Returns
+    -------
+    tuple(numpy.array, numpy.array, list, list or None)
+        Values with shape (time steps, columns) or (sites, time steps,
+        columns), UTC time stamps as int64 nanoseconds, columns as list of
+        (variable_name, height) tuples and the site names (None if not
+        stacked).
+
+    """
+    index_col = [0, 1] if stacked else 0
+    weather_df = pd.read_csv(file, index_col=index_col, header=[0, 1])
+    columns = [(name, int(height)) for name, height in weather_df.columns]
+
+    if not stacked:
+        index = pd.to_datetime(weather_df.index, utc=True)
+        return (
+            weather_df.values.astype(float),
+            index.values.astype("int64"),
+            columns,
+            None,
+        )
+
+    time = pd.to_datetime(weather_df.index.get_level_values(0), utc=True)
+    sites = weather_df.index.get_level_values(1)
+    weather_df.index = pd.MultiIndex.from_arrays([sites, time])
+    weather_df = weather_df.sort_index()
+
+    # plain python objects for the json meta data
+    site_names = weather_df.index.levels[0].tolist()
+    index = weather_df.loc[site_names[0]].index
+    if len(weather_df) != len(site_names) * len(index):
+        raise ValueError(
+            "All sites in {} must have the same time stamps.".format(file)
+        )
+    values = weather_df.values.astype(float).reshape(
+        len(site_names), len(index), len(columns)
+    )
+    return values, index.values.astype("int64"), columns, site_names
+
+
+class WeatherCache(object):
+    r"""
+    Binary, memory-mapped cache of a weather data file.
+
+    Parameters
+    ----------
+    file : str
+        Path to the weather csv file.
+    stacked : bool
+        If True the file contains several sites stacked along the rows, with
+        the site in the second column. Default: False.
+    cache_dir : str, optional
+        Directory of the cache. Default: '.weather_cache' next to the file.
+    tz : str
+        Time zone of the returned index. Default: 'Europe/Berlin'.
+
+    """
+
+    def __init__(
+        self, file, stacked=False, cache_dir=None, tz="Europe/Berlin"
+    ):
+        self.file = file
+        self.stacked = stacked
+        self.tz = tz
+        if cache_dir is None:
+            cache_dir = os.path.join(
+                os.path.dirname(os.path.abspath(file)), ".weather_cache"
+            )
+        key = file_hash(file) + ("_stacked" if stacked else "")
+        self.path = os.path.join(cache_dir, key)
+
+        if not os.path.isfile(os.path.join(self.path, "meta.json")):
+            self.build(cache_dir)
+
+        with open(os.path.join(self.path, "meta.json")) as f:
+            meta = json.load(f)
+        self.columns = pd.MultiIndex.from_tuples(
+            [tuple(c) for c in meta["columns"]],
+            names=["variable_name", "height"],
+        )
+        self.sites = meta["sites"]
+        self.values = np.load(
+            os.path.join(self.path, "values.npy"), mmap_mode="r"
+        )
+        self.index = pd.DatetimeIndex(
+            np.load(os.path.join(self.path, "index.npy")), tz="UTC"
+        ).tz_convert(tz)
+
+    def build(self, cache_dir):
+        r"""
+        Parses the csv file and writes the cache.
+
+        The cache is written to a temporary directory first and moved into
+        place afterwards, so concurrent processes never read half-written
+        files.
+
+        """
+        logging.debug("Build weather cache for %s.", self.file)
+        values, index, columns, sites = parse_weather_csv(
+            self.file, self.stacked
+        )
+
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=cache_dir)
+        np.save(os.path.join(tmp, "values.npy"), values)
+        np.save(os.path.join(tmp, "index.npy"), index)
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump({"columns": columns, "sites": sites}, f)
+        try:
+            os.rename(tmp, self.path)
+        except OSError:
+            # built by another process in the meantime
+            shutil.rmtree(tmp)
+
+    def weather_df(self, site=None):
+        r"""
+        Returns the weather data (of one site) as DataFrame.
+
+        The DataFrame is backed by the memory-mapped cache, no data is
+        copied.
+
+        Parameters
+        ----------
+        site : optional
+            Name of the site, required for stacked files.
+
+        Returns
+        -------
+        :pandas:`pandas.DataFrame<frame>`
+            Weather data in the format of
+            :py:func:`~modelchain_example.get_weather_data`.
+
+        """
+        if self.sites is None:
+            values = self.values
+        else:
+            values = self.values[self.sites.index(site)]
+        return pd.DataFrame(
+            values, index=self.index, columns=self.columns, copy=False
+        )
+
+
+def load_weather(file, site=None, **kwargs):
+    r"""
+    Loads weather data using the binary cache.
+
+    Keyword arguments are passed to :class:`WeatherCache`.
+
+    """
+    stacked = kwargs.pop("stacked", site is not None)
+    return WeatherCache(file, stacked=stacked, **kwargs).weather_df(site)